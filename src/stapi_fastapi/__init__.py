@@ -1,13 +1,20 @@
 from .models import (
+    ConcurrencyLimit,
+    Deadlines,
+    GeometryLimits,
     Link,
     OpportunityProperties,
     Product,
     Provider,
     ProviderRole,
+    SearchBuckets,
 )
 from .routers import ProductRouter, RootRouter
 
 __all__ = [
+    "ConcurrencyLimit",
+    "Deadlines",
+    "GeometryLimits",
     "Link",
     "OpportunityProperties",
     "Product",
@@ -15,4 +22,5 @@ __all__ = [
     "Provider",
     "ProviderRole",
     "RootRouter",
+    "SearchBuckets",
 ]
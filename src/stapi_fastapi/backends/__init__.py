@@ -3,13 +3,19 @@ from .product_backend import (
     GetOpportunityCollection,
     SearchOpportunities,
     SearchOpportunitiesAsync,
+    StreamOpportunities,
 )
 from .root_backend import (
     GetOpportunitySearchRecord,
     GetOpportunitySearchRecords,
     GetOrder,
     GetOrders,
+    GetOrdersByIds,
     GetOrderStatuses,
+    GetOrderStatusesAfter,
+    GetOrderStatusesByIds,
+    GetOrderVersion,
+    StreamOrders,
 )
 
 __all__ = [
@@ -19,7 +25,13 @@ __all__ = [
     "GetOpportunitySearchRecords",
     "GetOrder",
     "GetOrders",
+    "GetOrdersByIds",
     "GetOrderStatuses",
+    "GetOrderStatusesAfter",
+    "GetOrderStatusesByIds",
+    "GetOrderVersion",
     "SearchOpportunities",
     "SearchOpportunitiesAsync",
+    "StreamOpportunities",
+    "StreamOrders",
 ]
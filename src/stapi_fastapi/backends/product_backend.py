@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Coroutine
+from collections.abc import AsyncIterator, Coroutine
 from typing import Any, Callable
 
 from fastapi import Request
@@ -36,6 +36,7 @@ Returns:
 
     - Should return returns.result.Success[tuple[list[Opportunity], returns.maybe.Some[str]]] if including a pagination token
     - Should return returns.result.Success[tuple[list[Opportunity], returns.maybe.Nothing]] if not including a pagination token
+    - Returning returns.result.Failure[stapi_fastapi.exceptions.PaginationTokenException] will result in a 404 for an unknown pagination token.
     - Returning returns.result.Failure[Exception] will result in a 500.
 
 Note:
@@ -43,6 +44,40 @@ Note:
     returns.result.Failure[stapi_fastapi.exceptions.ConstraintsException] if not valid.
 """
 
+StreamOpportunities = Callable[
+    [ProductRouter, OpportunityPayload, str | None, int, Request],
+    Coroutine[Any, Any, ResultE[tuple[AsyncIterator[Opportunity], Maybe[str]]]],
+]
+"""
+Type alias for an async function that searches for ordering opportunities for the given
+search parameters and yields them as they are found.
+
+When provided instead of `SearchOpportunities`, the opportunities are written to the
+response as the iterator yields them, so clients receive the first opportunity without
+waiting for the whole search to finish.
+
+Args:
+    product_router (ProductRouter): The product router.
+    search (OpportunityPayload): The search parameters.
+    next (str | None): A pagination token.
+    limit (int): The maximum number of opportunities to return in a page.
+    request (Request): FastAPI's Request object.
+
+Returns:
+    A tuple containing an async iterator of opportunities and a pagination token.
+
+    - Should return returns.result.Success[tuple[AsyncIterator[Opportunity], returns.maybe.Some[str]]] if including a pagination token
+    - Should return returns.result.Success[tuple[AsyncIterator[Opportunity], returns.maybe.Nothing]] if not including a pagination token
+    - Returning returns.result.Failure[stapi_fastapi.exceptions.PaginationTokenException] will result in a 404 for an unknown pagination token.
+    - Returning returns.result.Failure[Exception] will result in a 500.
+
+    Exceptions raised by the iterator abort the response after it has started.
+
+Note:
+    Backends must validate search constraints and return
+    returns.result.Failure[stapi_fastapi.exceptions.ConstraintsException] if not valid.
+"""
+
 SearchOpportunitiesAsync = Callable[
     [ProductRouter, OpportunityPayload, Request],
     Coroutine[Any, Any, ResultE[OpportunitySearchRecord]],
@@ -1,4 +1,5 @@
-from collections.abc import Coroutine
+from collections.abc import AsyncIterator, Coroutine
+from datetime import datetime
 from typing import Any, Callable, TypeVar
 
 from fastapi import Request
@@ -31,6 +32,34 @@ Returns:
     - Returning returns.result.Failure[Exception] will result in a 500.
 """
 
+StreamOrders = Callable[
+    [str | None, int, Request],
+    Coroutine[Any, Any, ResultE[tuple[AsyncIterator[Order], Maybe[str]]]],
+]
+"""
+Type alias for an async function that streams existing Orders.
+
+When provided, `GET /orders` writes the orders to the response one by one as the
+iterator yields them instead of buffering the whole page, so large pages and full
+exports are served in constant memory. Unlike with `GetOrders`, the router does not cap
+the `limit`.
+
+Args:
+    next (str | None): A pagination token.
+    limit (int): The maximum number of orders to stream.
+    request (Request): FastAPI's Request object.
+
+Returns:
+    A tuple containing an async iterator of orders and a pagination token.
+
+    - Should return returns.result.Success[tuple[AsyncIterator[Order], returns.maybe.Some[str]]] if including a pagination token
+    - Should return returns.result.Success[tuple[AsyncIterator[Order], returns.maybe.Nothing]] if not including a pagination token
+    - Returning returns.result.Failure[ValueError] will result in a 404 for an unknown pagination token.
+    - Returning returns.result.Failure[Exception] will result in a 500.
+
+    Exceptions raised by the iterator abort the response after it has started.
+"""
+
 GetOrder = Callable[[str, Request], Coroutine[Any, Any, ResultE[Maybe[Order]]]]
 """
 Type alias for an async function that gets details for the order with `order_id`.
@@ -45,6 +74,45 @@ Returns:
     - Returning returns.result.Failure[Exception] will result in a 500.
 """
 
+GetOrdersByIds = Callable[
+    [list[str], Request], Coroutine[Any, Any, ResultE[list[Order]]]
+]
+"""
+Type alias for an async function that gets the orders with the given `order_ids` in
+one round trip, e.g. with a single database query.
+
+When not provided, `GET /orders?ids=...` looks up the orders concurrently with
+`GetOrder`.
+
+Args:
+    order_ids (list[str]): The order IDs, without duplicates.
+    request (Request): FastAPI's Request object.
+
+Returns:
+    - Should return returns.result.Success[list[Order]] with the orders found, in any order. Orders which are not found or to which access is denied are left out.
+    - Returning returns.result.Failure[Exception] will result in a 500.
+"""
+
+GetOrderVersion = Callable[[str, Request], Coroutine[Any, Any, ResultE[Maybe[str]]]]
+"""
+Type alias for an async function that gets a version token for the order with
+`order_id` without retrieving the order itself.
+
+The token must change whenever the order or its statuses change, e.g. the timestamp of
+the latest status. When provided, it is used to build the `ETag` of the order and
+order statuses responses, so conditional requests can be answered with a
+`304 Not Modified` without fetching the order.
+
+Args:
+    order_id (str): The order ID.
+    request (Request): FastAPI's Request object.
+
+Returns:
+    - Should return returns.result.Success[returns.maybe.Some[str]] if the order is found.
+    - Should return returns.result.Success[returns.maybe.Nothing] if the order is not found or if access is denied.
+    - Returning returns.result.Failure[Exception] will result in a 500.
+"""
+
 
 T = TypeVar("T", bound=OrderStatus)
 
@@ -71,6 +139,51 @@ Returns:
     - Returning returns.result.Failure[Exception] will result in a 500.
 """
 
+GetOrderStatusesAfter = Callable[
+    [str, datetime | None, str | None, int, Request],
+    Coroutine[Any, Any, ResultE[Maybe[tuple[list[T], str]]]],
+]
+"""
+Type alias for an async function that gets the statuses of the order with `order_id`
+added after a point in its history, so that clients polling the order only receive
+new statuses.
+
+Args:
+    order_id (str): The order ID.
+    since (datetime | None): Only statuses with a later timestamp are requested.
+    after (str | None): An opaque cursor returned by a previous call. Only statuses
+        added after it are requested. At most one of `since` and `after` is given.
+    limit (int): The maximum number of statuses to return.
+    request (Request): FastAPI's Request object.
+
+Returns:
+    A tuple containing a list of order statuses and a cursor following the last of them.
+
+    - Should return returns.result.Success[returns.maybe.Some[tuple[list[OrderStatus], str]]] if the order is found, with its statuses in chronological order and the cursor to pass as `after` to get the statuses following them. When there are no new statuses, the list is empty and the cursor still marks the current end of the history.
+    - Should return returns.result.Success[returns.maybe.Nothing] if the order is not found or if access is denied.
+    - Returning returns.result.Failure[ValueError] for an invalid cursor will result in a 404.
+    - Returning returns.result.Failure[Exception] will result in a 500.
+"""
+
+GetOrderStatusesByIds = Callable[
+    [list[str], datetime | None, Request],
+    Coroutine[Any, Any, ResultE[dict[str, list[T]]]],
+]
+"""
+Type alias for an async function that gets the statuses of many orders at once, e.g.
+with one indexed query.
+
+Args:
+    order_ids (list[str]): The order IDs, without duplicates.
+    since (datetime | None): Only statuses with a later timestamp are requested. When
+        `None`, only the latest status of each order is requested.
+    request (Request): FastAPI's Request object.
+
+Returns:
+    - Should return returns.result.Success[dict[str, list[OrderStatus]]] mapping the IDs of the orders found to their statuses in chronological order. Orders which are not found or to which access is denied are left out.
+    - Returning returns.result.Failure[Exception] will result in a 500.
+"""
+
 GetOpportunitySearchRecords = Callable[
     [str | None, int, Request],
     Coroutine[Any, Any, ResultE[tuple[list[OpportunitySearchRecord], Maybe[str]]]],
@@ -1,2 +1,3 @@
 TYPE_JSON = "application/json"
 TYPE_GEOJSON = "application/geo+json"
+TYPE_NDJSON = "application/x-ndjson"
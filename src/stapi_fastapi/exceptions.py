@@ -15,3 +15,10 @@ class ConstraintsException(StapiException):
 class NotFoundException(StapiException):
     def __init__(self, detail: Optional[Any] = None) -> None:
         super().__init__(status.HTTP_404_NOT_FOUND, detail)
+
+
+class PaginationTokenException(NotFoundException, ValueError):
+    def __init__(
+        self, detail: Optional[Any] = "Error finding pagination token"
+    ) -> None:
+        super().__init__(detail)
@@ -0,0 +1,12 @@
+from .predicate import Predicate, compile_predicate
+from .sql import GENERIC, POSTGIS, SQLITE, Dialect, to_sql
+
+__all__ = [
+    "Dialect",
+    "GENERIC",
+    "POSTGIS",
+    "Predicate",
+    "SQLITE",
+    "compile_predicate",
+    "to_sql",
+]
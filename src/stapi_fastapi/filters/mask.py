@@ -0,0 +1,291 @@
+from collections.abc import Callable
+from datetime import UTC
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+from pygeofilter import ast, values
+from pygeofilter.backends.evaluator import Evaluator, handle
+
+from stapi_fastapi.filters.predicate import (
+    ARITHMETIC,
+    COMPARISONS,
+    FUNCTIONS,
+    TEMPORAL_RELATIONS,
+    Constant,
+    fold_case,
+    identity,
+    like_pattern,
+    prepared_shape,
+    spatial_relation,
+    to_interval,
+    to_shape,
+)
+from stapi_fastapi.types.filter import CQL2Filter, canonical, parse
+
+if TYPE_CHECKING:
+    from stapi_fastapi.models.opportunity_batch import OpportunityBatch
+
+type Mask = npt.NDArray[np.bool_]
+type BatchPredicate = Callable[[OpportunityBatch], Mask]
+type BatchExpression = Callable[[OpportunityBatch], Any]
+
+
+def compile_mask(filter: CQL2Filter | None) -> BatchPredicate:
+    """
+    Compile a validated cql2-json filter into a function computing the mask of the
+    opportunities of an `OpportunityBatch` matching it with vectorized operations.
+
+    Properties are referenced by their column names, `datetime` refers to the start
+    and end of the opportunities and `geometry` to their geometries. The semantics
+    are those of `compile_predicate`, with missing columns taking the place of
+    missing properties. The compiled masks of the most recently used filters are
+    cached. Raises `ValueError` for operations which are not supported.
+    """
+    if not filter:
+        return match_all
+    return compile_canonical(canonical(filter))
+
+
+@lru_cache(maxsize=1024)
+def compile_canonical(canonical: str) -> BatchPredicate:
+    expression = MaskCompiler().evaluate(fold_case(parse(canonical)))
+
+    def mask(batch: "OpportunityBatch") -> Mask:
+        # constant results, e.g. of comparisons with missing columns, are broadcast
+        return np.array(
+            np.broadcast_to(np.asarray(expression(batch), dtype=np.bool_), len(batch))
+        )
+
+    return mask
+
+
+def match_all(batch: "OpportunityBatch") -> Mask:
+    return np.ones(len(batch), dtype=np.bool_)
+
+
+class MaskCompiler(Evaluator):
+    """
+    Compiles a pygeofilter AST into closures evaluating it against the columns of an
+    `OpportunityBatch`.
+    """
+
+    @handle(ast.Not)
+    def not_(self, node: ast.Not, sub: BatchExpression) -> BatchExpression:
+        return lambda batch: np.logical_not(sub(batch))
+
+    @handle(ast.And)
+    def and_(
+        self, node: ast.And, lhs: BatchExpression, rhs: BatchExpression
+    ) -> BatchExpression:
+        return lambda batch: np.logical_and(lhs(batch), rhs(batch))
+
+    @handle(ast.Or)
+    def or_(
+        self, node: ast.Or, lhs: BatchExpression, rhs: BatchExpression
+    ) -> BatchExpression:
+        return lambda batch: np.logical_or(lhs(batch), rhs(batch))
+
+    @handle(ast.Comparison, subclasses=True)
+    def comparison(
+        self, node: ast.Comparison, lhs: BatchExpression, rhs: BatchExpression
+    ) -> BatchExpression:
+        return relate(COMPARISONS[type(node)], identity, lhs, rhs)
+
+    @handle(ast.Between)
+    def between(
+        self,
+        node: ast.Between,
+        lhs: BatchExpression,
+        low: BatchExpression,
+        high: BatchExpression,
+    ) -> BatchExpression:
+        def between(batch: "OpportunityBatch") -> Any:
+            value = lhs(batch)
+            if value is None:
+                return False
+            try:
+                return ((value >= low(batch)) & (value <= high(batch))) != node.not_
+            except TypeError:
+                return False
+
+        return between
+
+    @handle(ast.Like)
+    def like(self, node: ast.Like, lhs: BatchExpression) -> BatchExpression:
+        pattern = like_pattern(node)
+
+        def like(batch: "OpportunityBatch") -> Any:
+            value = lhs(batch)
+            if value is None:
+                return False
+            matches = np.fromiter(
+                (pattern.fullmatch(str(v)) is not None for v in np.ravel(value)),
+                dtype=np.bool_,
+            )
+            return matches.reshape(np.shape(value)) != node.not_
+
+        return like
+
+    @handle(ast.In)
+    def in_(
+        self, node: ast.In, lhs: BatchExpression, *options: BatchExpression
+    ) -> BatchExpression:
+        constant = all(isinstance(option, Constant) for option in options)
+
+        def in_(batch: "OpportunityBatch") -> Any:
+            value = lhs(batch)
+            if value is None:
+                return False
+            if constant:
+                return (
+                    np.isin(value, [option(batch) for option in options]) != node.not_
+                )
+            matches = [value == option(batch) for option in options]
+            return np.logical_or.reduce(matches) != node.not_
+
+        return in_
+
+    @handle(ast.IsNull)
+    def is_null(self, node: ast.IsNull, lhs: BatchExpression) -> BatchExpression:
+        def is_null(batch: "OpportunityBatch") -> Any:
+            value = lhs(batch)
+            if not isinstance(value, np.ndarray):
+                return (value is None) != node.not_
+            if value.dtype != np.object_:
+                return np.full(len(value), node.not_)
+            nulls = np.fromiter((v is None for v in value), np.bool_, len(value))
+            return nulls != node.not_
+
+        return is_null
+
+    @handle(ast.TemporalPredicate, subclasses=True)
+    def temporal(
+        self, node: ast.TemporalPredicate, lhs: BatchExpression, rhs: BatchExpression
+    ) -> BatchExpression:
+        relation = TEMPORAL_RELATIONS.get(type(node))
+        if relation is None:
+            raise ValueError(f"Unsupported temporal operation {type(node).__name__}")
+        return relate(relation, to_intervals, lhs, rhs)
+
+    @handle(ast.SpatialComparisonPredicate, subclasses=True)
+    def spatial(
+        self,
+        node: ast.SpatialComparisonPredicate,
+        lhs: BatchExpression,
+        rhs: BatchExpression,
+    ) -> BatchExpression:
+        relation = spatial_relation(node)
+        return relate(relation, to_shapes, lhs, prepared_shape(rhs))
+
+    @handle(ast.Attribute)
+    def attribute(self, node: ast.Attribute) -> BatchExpression:
+        match node.name:
+            case "datetime":
+                return lambda batch: (batch.start, batch.end)
+            case "geometry":
+                return lambda batch: batch.geometry
+            case "id":
+                return lambda batch: batch.ids
+            case "product_id":
+                return lambda batch: batch.product_id
+            case name:
+                return lambda batch: batch.columns.get(name)
+
+    @handle(ast.Arithmetic, subclasses=True)
+    def arithmetic(
+        self, node: ast.Arithmetic, lhs: BatchExpression, rhs: BatchExpression
+    ) -> BatchExpression:
+        op = ARITHMETIC[type(node)]
+
+        def arithmetic(batch: "OpportunityBatch") -> Any:
+            a, b = lhs(batch), rhs(batch)
+            if a is None or b is None:
+                return None
+            try:
+                return op(a, b)
+            except TypeError:
+                return None
+
+        return arithmetic
+
+    @handle(ast.Function)
+    def function(
+        self, node: ast.Function, *arguments: BatchExpression
+    ) -> BatchExpression:
+        function = FUNCTIONS.get(node.name)
+        if function is None or len(arguments) != 1:
+            raise ValueError(f"Unsupported function {node.name}")
+        vectorized = np.frompyfunc(function, 1, 1)
+        (argument,) = arguments
+
+        def call(batch: "OpportunityBatch") -> Any:
+            value = argument(batch)
+            return None if value is None else vectorized(value)
+
+        return call
+
+    @handle(values.Geometry, values.Envelope, values.Interval)
+    def literal(self, node: Any, *sub_args: Any) -> Constant:
+        return Constant(node)
+
+    def adopt(self, node: Any, *sub_args: Any) -> Constant:
+        if isinstance(node, ast.Node):
+            raise ValueError(f"Unsupported filter operation {type(node).__name__}")
+        return Constant(node)
+
+
+def relate(
+    relation: Callable[[Any, Any], Any],
+    normalize: Callable[[Any], Any],
+    lhs: BatchExpression,
+    rhs: BatchExpression,
+) -> BatchExpression:
+    if isinstance(rhs, Constant):
+        b = normalize(rhs.value)
+        return lambda batch: related(relation, normalize(lhs(batch)), b)
+    return lambda batch: related(relation, normalize(lhs(batch)), normalize(rhs(batch)))
+
+
+def related(relation: Callable[[Any, Any], Any], a: Any, b: Any) -> Any:
+    if a is None or b is None:
+        return False
+    try:
+        return relation(a, b)
+    except (TypeError, ValueError):
+        # e.g. comparisons of string columns with numbers
+        return False
+
+
+def to_intervals(value: Any) -> Any:
+    """
+    The start and end of datetime intervals as `datetime64[us]` arrays or scalars.
+    """
+    if value is None or isinstance(value, np.ndarray):
+        return None if value is None else (value, value)
+    if isinstance(value, tuple) and isinstance(value[0], np.ndarray):
+        return value
+    interval = to_interval(value)
+    if interval is None:
+        return None
+    return tuple(
+        np.datetime64(instant.astimezone(UTC).replace(tzinfo=None), "us")
+        for instant in interval
+    )
+
+
+def to_shapes(value: Any) -> Any:
+    """
+    The shapely geometries of an array of geometries, converted once for geometries
+    shared by several opportunities.
+    """
+    if not isinstance(value, np.ndarray):
+        return to_shape(value)
+    shapes: dict[int, Any] = {}
+    for geometry in value:
+        if id(geometry) not in shapes:
+            shapes[id(geometry)] = to_shape(geometry)
+    result = np.empty(len(value), dtype=np.object_)
+    result[:] = [shapes[id(geometry)] for geometry in value]
+    return result
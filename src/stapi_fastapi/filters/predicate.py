@@ -0,0 +1,520 @@
+import operator
+import re
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import replace
+from datetime import UTC, date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any
+
+from pygeofilter import ast, values
+from pygeofilter.backends.evaluator import Evaluator, handle
+
+from stapi_fastapi.types.filter import CQL2Filter, canonical, parse
+
+type Predicate = Callable[[Any], bool]
+type Expression = Callable[[Any], Any]
+type BBox = tuple[float, float, float, float]
+type Interval = tuple[datetime, datetime]
+
+# members of features, all other attributes are looked up in their properties
+FEATURE_MEMBERS = {"id", "geometry"}
+
+MIN_DATETIME = datetime.min.replace(tzinfo=UTC)
+MAX_DATETIME = datetime.max.replace(tzinfo=UTC)
+
+COMPARISONS: dict[type[ast.Node], Callable[[Any, Any], Any]] = {
+    ast.Equal: operator.eq,
+    ast.NotEqual: operator.ne,
+    ast.LessThan: operator.lt,
+    ast.LessEqual: operator.le,
+    ast.GreaterThan: operator.gt,
+    ast.GreaterEqual: operator.ge,
+}
+
+ARITHMETIC: dict[type[ast.Node], Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mul: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+FUNCTIONS: dict[str, Callable[[Any], Any]] = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "casei": str.casefold,
+}
+
+# The relations combine comparisons with `&` and `|` so they apply element-wise to
+# NumPy arrays as well as to single values.
+TEMPORAL_RELATIONS: dict[type[ast.Node], Callable[[Any, Any], Any]] = {
+    ast.TimeAfter: lambda a, b: a[0] > b[1],
+    ast.TimeBefore: lambda a, b: a[1] < b[0],
+    ast.TimeBegins: lambda a, b: (a[0] == b[0]) & (a[1] < b[1]),
+    ast.TimeBegunBy: lambda a, b: (a[0] == b[0]) & (a[1] > b[1]),
+    ast.TimeContains: lambda a, b: (a[0] < b[0]) & (a[1] > b[1]),
+    ast.TimeDisjoint: lambda a, b: (a[1] < b[0]) | (a[0] > b[1]),
+    ast.TimeDuring: lambda a, b: (a[0] > b[0]) & (a[1] < b[1]),
+    ast.TimeEndedBy: lambda a, b: (a[1] == b[1]) & (a[0] < b[0]),
+    ast.TimeEnds: lambda a, b: (a[1] == b[1]) & (a[0] > b[0]),
+    ast.TimeEquals: lambda a, b: (a[0] == b[0]) & (a[1] == b[1]),
+    ast.TimeMeets: lambda a, b: a[1] == b[0],
+    ast.TimeMetBy: lambda a, b: a[0] == b[1],
+    # pygeofilter parses both t_overlaps and t_intersects to `TimeOverlaps`
+    ast.TimeOverlaps: lambda a, b: (a[0] <= b[1]) & (a[1] >= b[0]),
+    ast.TimeOverlappedBy: lambda a, b: (b[0] < a[0]) & (a[0] < b[1]) & (b[1] < a[1]),
+}
+
+# Relations between the bounding boxes of geometries, which are only exact for points
+# and axis-aligned boxes, e.g. to find candidates before testing geometries exactly.
+BBOX_RELATIONS: dict[type[ast.Node], Callable[[Any, Any], Any]] = {
+    ast.GeometryIntersects: lambda a, b: (
+        (a[0] <= b[2]) & (a[2] >= b[0]) & (a[1] <= b[3]) & (a[3] >= b[1])
+    ),
+    ast.GeometryDisjoint: lambda a, b: (
+        (a[0] > b[2]) | (a[2] < b[0]) | (a[1] > b[3]) | (a[3] < b[1])
+    ),
+    ast.GeometryWithin: lambda a, b: (
+        (a[0] >= b[0]) & (a[1] >= b[1]) & (a[2] <= b[2]) & (a[3] <= b[3])
+    ),
+    ast.GeometryContains: lambda a, b: (
+        (a[0] <= b[0]) & (a[1] <= b[1]) & (a[2] >= b[2]) & (a[3] >= b[3])
+    ),
+    ast.GeometryEquals: lambda a, b: (
+        (a[0] == b[0]) & (a[1] == b[1]) & (a[2] == b[2]) & (a[3] == b[3])
+    ),
+}
+
+# The shapely functions, which apply element-wise to arrays of geometries as well, and
+# the SQL/MM functions evaluating spatial relations exactly.
+SPATIAL_RELATIONS: dict[type[ast.Node], str] = {
+    ast.GeometryIntersects: "intersects",
+    ast.GeometryDisjoint: "disjoint",
+    ast.GeometryWithin: "within",
+    ast.GeometryContains: "contains",
+    ast.GeometryEquals: "equals",
+}
+
+
+class Constant:
+    """
+    A literal of a filter, which compilers fold into the closures using it.
+    """
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __call__(self, record: Any) -> Any:
+        return self.value
+
+
+def compile_predicate(filter: CQL2Filter | None) -> Predicate:
+    """
+    Compile a validated cql2-json filter into a predicate telling whether a record
+    matches it.
+
+    Records are `Opportunity` or `Order` features, or their properties given as models
+    or mappings. Properties are referenced by name, with dotted names for nested
+    properties like `off_nadir.minimum`, while `id` and `geometry` refer to the
+    members of features. Temporal operators accept `DatetimeInterval` tuples,
+    datetimes and ISO 8601 strings; spatial operators test GeoJSON geometries exactly
+    and require shapely. Comparisons with missing properties, or with values of types
+    they cannot be compared with, never match.
+
+    The predicates of the most recently used filters are cached, so compiling the
+    filter of each search is cheap. Raises `ValueError` for operations which are not
+    supported.
+    """
+    if not filter:
+        return match_all
+    return compile_canonical(canonical(filter))
+
+
+@lru_cache(maxsize=1024)
+def compile_canonical(canonical: str) -> Predicate:
+    return PredicateCompiler().evaluate(fold_case(parse(canonical)))
+
+
+def match_all(record: Any) -> bool:
+    return True
+
+
+class PredicateCompiler(Evaluator):
+    """
+    Compiles a pygeofilter AST into closures evaluating it against a record.
+    """
+
+    @handle(ast.Not)
+    def not_(self, node: ast.Not, sub: Predicate) -> Predicate:
+        return lambda record: not sub(record)
+
+    @handle(ast.And)
+    def and_(self, node: ast.And, lhs: Predicate, rhs: Predicate) -> Predicate:
+        return lambda record: bool(lhs(record)) and bool(rhs(record))
+
+    @handle(ast.Or)
+    def or_(self, node: ast.Or, lhs: Predicate, rhs: Predicate) -> Predicate:
+        return lambda record: bool(lhs(record)) or bool(rhs(record))
+
+    @handle(ast.Comparison, subclasses=True)
+    def comparison(
+        self, node: ast.Comparison, lhs: Expression, rhs: Expression
+    ) -> Predicate:
+        return self.relate(COMPARISONS[type(node)], identity, lhs, rhs)
+
+    @handle(ast.Between)
+    def between(
+        self, node: ast.Between, lhs: Expression, low: Expression, high: Expression
+    ) -> Predicate:
+        def between(record: Any) -> bool:
+            value = lhs(record)
+            if value is None:
+                return False
+            try:
+                return (low(record) <= value <= high(record)) != node.not_
+            except TypeError:
+                return False
+
+        return between
+
+    @handle(ast.Like)
+    def like(self, node: ast.Like, lhs: Expression) -> Predicate:
+        pattern = like_pattern(node)
+
+        def like(record: Any) -> bool:
+            value = lhs(record)
+            if value is None:
+                return False
+            return (pattern.fullmatch(str(value)) is not None) != node.not_
+
+        return like
+
+    @handle(ast.In)
+    def in_(self, node: ast.In, lhs: Expression, *options: Expression) -> Predicate:
+        if all(isinstance(option, Constant) for option in options):
+            values = [option(None) for option in options]
+
+            def in_constants(record: Any) -> bool:
+                value = lhs(record)
+                return value is not None and (value in values) != node.not_
+
+            return in_constants
+
+        def in_(record: Any) -> bool:
+            value = lhs(record)
+            if value is None:
+                return False
+            return any(value == option(record) for option in options) != node.not_
+
+        return in_
+
+    @handle(ast.IsNull)
+    def is_null(self, node: ast.IsNull, lhs: Expression) -> Predicate:
+        return lambda record: (lhs(record) is None) != node.not_
+
+    @handle(ast.TemporalPredicate, subclasses=True)
+    def temporal(
+        self, node: ast.TemporalPredicate, lhs: Expression, rhs: Expression
+    ) -> Predicate:
+        relation = TEMPORAL_RELATIONS.get(type(node))
+        if relation is None:
+            raise ValueError(f"Unsupported temporal operation {type(node).__name__}")
+        return self.relate(relation, to_interval, lhs, rhs)
+
+    @handle(ast.SpatialComparisonPredicate, subclasses=True)
+    def spatial(
+        self, node: ast.SpatialComparisonPredicate, lhs: Expression, rhs: Expression
+    ) -> Predicate:
+        relation = spatial_relation(node)
+        return self.relate(relation, to_shape, lhs, prepared_shape(rhs))
+
+    @handle(ast.Attribute)
+    def attribute(self, node: ast.Attribute) -> Expression:
+        head, *path = node.name.split(".")
+        in_properties = head not in FEATURE_MEMBERS
+
+        def attribute(record: Any) -> Any:
+            if in_properties:
+                record = lookup(record, "properties", record)
+            value = lookup(record, head)
+            for name in path:
+                value = lookup(value, name)
+            return value
+
+        return attribute
+
+    @handle(ast.Arithmetic, subclasses=True)
+    def arithmetic(
+        self, node: ast.Arithmetic, lhs: Expression, rhs: Expression
+    ) -> Expression:
+        op = ARITHMETIC[type(node)]
+
+        def arithmetic(record: Any) -> Any:
+            a, b = lhs(record), rhs(record)
+            if a is None or b is None:
+                return None
+            try:
+                return op(a, b)
+            except TypeError:
+                return None
+
+        return arithmetic
+
+    @handle(ast.Function)
+    def function(self, node: ast.Function, *arguments: Expression) -> Expression:
+        function = FUNCTIONS.get(node.name)
+        if function is None or len(arguments) != 1:
+            raise ValueError(f"Unsupported function {node.name}")
+        (argument,) = arguments
+
+        def call(record: Any) -> Any:
+            value = argument(record)
+            return None if value is None else function(value)
+
+        return call
+
+    @handle(values.Geometry, values.Envelope, values.Interval)
+    def literal(self, node: Any, *sub_args: Any) -> Constant:
+        return Constant(node)
+
+    def adopt(self, node: Any, *sub_args: Any) -> Constant:
+        if isinstance(node, ast.Node):
+            raise ValueError(f"Unsupported filter operation {type(node).__name__}")
+        return Constant(node)
+
+    def relate(
+        self,
+        relation: Callable[[Any, Any], Any],
+        normalize: Callable[[Any], Any],
+        lhs: Expression,
+        rhs: Expression,
+    ) -> Predicate:
+        """
+        Predicate applying `relation` to the normalized, non-null values of `lhs` and
+        `rhs`. Constant values are normalized once.
+        """
+        if isinstance(rhs, Constant):
+            b = normalize(rhs.value)
+            return lambda record: related(relation, normalize(lhs(record)), b)
+
+        return lambda record: related(
+            relation, normalize(lhs(record)), normalize(rhs(record))
+        )
+
+
+def related(relation: Callable[[Any, Any], Any], a: Any, b: Any) -> bool:
+    """
+    Whether `relation` holds between `a` and `b`, which it never does if either is
+    null or they cannot be compared.
+    """
+    if a is None or b is None:
+        return False
+    try:
+        return bool(relation(a, b))
+    except (TypeError, ValueError):
+        return False
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+def lookup(value: Any, name: str, default: Any = None) -> Any:
+    if isinstance(value, Mapping):
+        return value.get(name, default)
+    return getattr(value, name, default)
+
+
+def fold_case(node: Any) -> Any:
+    """
+    `node` with the string literals compared with `casei` expressions, or wrapped in
+    `casei`, case folded, so that e.g. `casei(platform) = 'Foo'` matches `FOO` rather
+    than nothing.
+    """
+    match node:
+        case ast.Not():
+            return ast.Not(fold_case(node.sub_node))
+        case ast.And() | ast.Or():
+            return replace(node, lhs=fold_case(node.lhs), rhs=fold_case(node.rhs))
+        case ast.Comparison():
+            return replace(
+                node,
+                lhs=case_folded(node.lhs, node.rhs),
+                rhs=case_folded(node.rhs, node.lhs),
+            )
+        case ast.In():
+            options = [case_folded(option, node.lhs) for option in node.sub_nodes]
+            return replace(node, sub_nodes=options)
+        case ast.Like():
+            pattern = case_folded(node.pattern, node.lhs)
+            if not isinstance(pattern, str):
+                raise ValueError("Like patterns must be strings")
+            return replace(node, pattern=pattern)
+    return node
+
+
+def case_folded(value: Any, other: Any) -> Any:
+    """
+    `value` case folded if it is a string literal compared with the `casei`
+    expression `other`, or `casei` of a string literal.
+    """
+    if is_casei(value) and isinstance(value.arguments[0], str):
+        return value.arguments[0].casefold()
+    if is_casei(other) and isinstance(value, str):
+        return value.casefold()
+    return value
+
+
+def is_casei(node: Any) -> bool:
+    return (
+        isinstance(node, ast.Function)
+        and node.name == "casei"
+        and len(node.arguments) == 1
+    )
+
+
+def like_pattern(node: ast.Like) -> re.Pattern[str]:
+    parts = []
+    escaped = False
+    for char in node.pattern:
+        if escaped or char not in (node.escapechar, node.wildcard, node.singlechar):
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == node.escapechar:
+            escaped = True
+        else:
+            parts.append(".*" if char == node.wildcard else ".")
+    return re.compile("".join(parts), re.DOTALL | (re.IGNORECASE if node.nocase else 0))
+
+
+def to_interval(value: Any) -> Interval | None:
+    """
+    The start and end of a datetime interval, instant or ISO 8601 string of either.
+    Open ends extend to the minimum and maximum datetimes. `None` for malformed
+    strings, which relate to nothing.
+    """
+    try:
+        match value:
+            case None:
+                return None
+            case values.Interval(start=start, end=end):
+                return interval_bounds(start, end)
+            case (start, end):
+                return (
+                    to_datetime(start, MIN_DATETIME),
+                    to_datetime(end, MAX_DATETIME),
+                )
+            case str() if "/" in value:
+                start, end = value.split("/", 1)
+                return (
+                    to_datetime(start, MIN_DATETIME),
+                    to_datetime(end, MAX_DATETIME),
+                )
+            case _:
+                instant = to_datetime(value, None)
+                return (instant, instant)
+    except ValueError:
+        return None
+
+
+def interval_bounds(start: Any, end: Any) -> Interval:
+    # either end of a literal interval may be a duration relative to the other
+    if isinstance(start, timedelta):
+        end = to_datetime(end, MAX_DATETIME)
+        return (end - start, end)
+    start = to_datetime(start, MIN_DATETIME)
+    if isinstance(end, timedelta):
+        return (start, start + end)
+    return (start, to_datetime(end, MAX_DATETIME))
+
+
+def to_datetime(value: Any, default: Any) -> Any:
+    if value is None or value == "..":
+        return default
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time(), UTC)
+    return value
+
+
+def spatial_relation(node: ast.SpatialComparisonPredicate) -> Callable[[Any, Any], Any]:
+    """
+    The shapely function evaluating a spatial operation. Raises `ValueError` if the
+    operation is not supported or shapely, an optional dependency, is not installed.
+    """
+    name = SPATIAL_RELATIONS.get(type(node))
+    if name is None:
+        raise ValueError(f"Unsupported spatial operation {type(node).__name__}")
+    try:
+        import shapely
+    except ImportError as e:
+        raise ValueError(
+            f"Unsupported spatial operation {type(node).__name__}, shapely is required"
+        ) from e
+    return getattr(shapely, name)
+
+
+def to_shape(geometry: Any) -> Any:
+    """
+    The shapely geometry of a GeoJSON geometry, given as a model or mapping.
+    """
+    import shapely
+    from shapely.geometry import shape
+
+    if geometry is None or isinstance(geometry, shapely.Geometry):
+        return geometry
+    if isinstance(geometry, values.Envelope):
+        return shapely.box(geometry.x1, geometry.y1, geometry.x2, geometry.y2)
+    if isinstance(geometry, values.Geometry):
+        geometry = geometry.geometry
+    return shape(geometry)
+
+
+def prepared_shape(constant: Any) -> Any:
+    """
+    The shapely geometry of a constant, prepared for the many tests against it.
+    """
+    import shapely
+
+    if not isinstance(constant, Constant):
+        return constant
+    geometry = to_shape(constant.value)
+    if geometry is not None:
+        shapely.prepare(geometry)
+    return Constant(geometry)
+
+
+def to_bbox(geometry: Any) -> BBox | None:
+    """
+    The bounding box of a GeoJSON geometry, given as a model or mapping.
+    """
+    if geometry is None:
+        return None
+    if isinstance(geometry, values.Envelope):
+        return (geometry.x1, geometry.y1, geometry.x2, geometry.y2)
+    if isinstance(geometry, values.Geometry):
+        geometry = geometry.geometry
+    xs, ys = [], []
+    for position in positions(geometry):
+        xs.append(position[0])
+        ys.append(position[1])
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def positions(geometry: Any) -> Iterator[Any]:
+    geometries = lookup(geometry, "geometries")
+    if geometries is not None:
+        for member in geometries:
+            yield from positions(member)
+    else:
+        yield from flatten(lookup(geometry, "coordinates", ()))
+
+
+def flatten(coordinates: Any) -> Iterator[Any]:
+    if coordinates and isinstance(coordinates[0], int | float):
+        yield coordinates
+        return
+    for member in coordinates:
+        yield from flatten(member)
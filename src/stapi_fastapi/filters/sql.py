@@ -0,0 +1,322 @@
+import json
+from collections.abc import Callable, Mapping, Sequence
+from datetime import UTC, date, datetime
+from typing import Any, NamedTuple
+
+from pygeofilter import ast, values
+from pygeofilter.backends.evaluator import Evaluator, handle
+
+from stapi_fastapi.filters.predicate import (
+    SPATIAL_RELATIONS,
+    TEMPORAL_RELATIONS,
+    fold_case,
+    to_datetime,
+    to_interval,
+)
+from stapi_fastapi.types.filter import CQL2Filter
+
+# A column expression, or the start and end columns of datetime intervals.
+type Column = str | tuple[str, str]
+
+# marks bind values in fragments until placeholders are rendered
+PARAMETER = "\x00"
+
+COMPARISONS: dict[type[ast.Node], str] = {
+    ast.Equal: "=",
+    ast.NotEqual: "<>",
+    ast.LessThan: "<",
+    ast.LessEqual: "<=",
+    ast.GreaterThan: ">",
+    ast.GreaterEqual: ">=",
+}
+
+ARITHMETIC: dict[type[ast.Node], str] = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mul: "*",
+    ast.Div: "/",
+}
+
+FUNCTIONS: dict[str, str] = {
+    "lower": "LOWER",
+    "upper": "UPPER",
+    "casei": "LOWER",
+}
+
+
+class Dialect(NamedTuple):
+    """
+    The placeholder for bind values, formatted with their 1-based position, e.g.
+    `"?"`, `"%s"` or `"${}"`, and the conversion of datetimes to bind values.
+
+    Spatial operators are only supported by dialects with `geometry`, the SQL
+    converting a GeoJSON bind value in place of `{}` to a geometry, e.g.
+    `"ST_GeomFromGeoJSON({})"`. They are translated to the SQL/MM functions
+    `ST_Intersects`, `ST_Disjoint`, `ST_Within`, `ST_Contains` and `ST_Equals`.
+    """
+
+    placeholder: str
+    datetime: Callable[[datetime], Any]
+    geometry: str | None = None
+
+
+# SQLite has no datetime type, datetimes are compared as UTC ISO 8601 strings
+SQLITE = Dialect(
+    placeholder="?", datetime=lambda value: value.astimezone(UTC).isoformat()
+)
+GENERIC = Dialect(placeholder="%s", datetime=lambda value: value)
+POSTGIS = Dialect(
+    placeholder="%s", datetime=lambda value: value, geometry="ST_GeomFromGeoJSON({})"
+)
+
+
+class SQL:
+    """
+    A fragment of SQL with the values bound to its parameters. Comparison and `&` and
+    `|` operators combine fragments, so the relations used to evaluate filters in
+    Python build SQL as well.
+    """
+
+    __hash__ = None  # type: ignore
+
+    def __init__(self, sql: str, params: Sequence[Any] = ()) -> None:
+        self.sql = sql
+        self.params = list(params)
+
+    @classmethod
+    def param(cls, value: Any) -> "SQL":
+        return cls(PARAMETER, [value])
+
+    @classmethod
+    def join(cls, separator: str, fragments: Sequence["SQL"]) -> "SQL":
+        return cls(
+            separator.join(fragment.sql for fragment in fragments),
+            [param for fragment in fragments for param in fragment.params],
+        )
+
+    def __repr__(self) -> str:
+        return f"SQL({self.sql!r}, {self.params!r})"
+
+    def binary(self, op: str, other: "SQL") -> "SQL":
+        return SQL(f"{self.sql} {op} {other.sql}", self.params + other.params)
+
+    def __eq__(self, other: Any) -> "SQL":  # type: ignore[override]
+        return self.binary("=", other)
+
+    def __ne__(self, other: Any) -> "SQL":  # type: ignore[override]
+        return self.binary("<>", other)
+
+    def __lt__(self, other: "SQL") -> "SQL":
+        return self.binary("<", other)
+
+    def __le__(self, other: "SQL") -> "SQL":
+        return self.binary("<=", other)
+
+    def __gt__(self, other: "SQL") -> "SQL":
+        return self.binary(">", other)
+
+    def __ge__(self, other: "SQL") -> "SQL":
+        return self.binary(">=", other)
+
+    def __and__(self, other: "SQL") -> "SQL":
+        return SQL(f"({self.sql} AND {other.sql})", self.params + other.params)
+
+    def __or__(self, other: "SQL") -> "SQL":
+        return SQL(f"({self.sql} OR {other.sql})", self.params + other.params)
+
+
+def to_sql(
+    filter: CQL2Filter | None,
+    columns: Mapping[str, Column] | None = None,
+    dialect: Dialect = SQLITE,
+) -> tuple[str, list[Any]]:
+    """
+    Translate a validated cql2-json filter into a parameterized SQL condition for the
+    `WHERE` clause of a query and the values bound to its parameters.
+
+    `columns` maps the properties referenced in the filter to column expressions, and
+    must map `datetime` to start and end columns for temporal operators. Without it,
+    properties are used as quoted column names. Spatial operators compare geometry
+    columns exactly with the spatial functions of the dialect. The semantics of `LIKE`
+    regarding case follow the database, while string literals compared with `casei`
+    are case folded like it.
+
+    Raises `ValueError` for operations which are not supported, including spatial
+    operators with dialects without spatial functions, and for properties missing from
+    `columns`.
+    """
+    if not filter:
+        return "1 = 1", []
+    condition = SQLTranslator(columns, dialect).evaluate(fold_case(filter.ast))
+    parts = condition.sql.split(PARAMETER)
+    sql = parts[0]
+    for index, part in enumerate(parts[1:], start=1):
+        sql += dialect.placeholder.format(index) + part
+    return sql, condition.params
+
+
+class SQLTranslator(Evaluator):
+    """
+    Translates a pygeofilter AST into SQL fragments.
+    """
+
+    def __init__(self, columns: Mapping[str, Column] | None, dialect: Dialect) -> None:
+        self.columns = columns
+        self.dialect = dialect
+
+    @handle(ast.Not)
+    def not_(self, node: ast.Not, sub: SQL) -> SQL:
+        return SQL(f"NOT ({sub.sql})", sub.params)
+
+    @handle(ast.And)
+    def and_(self, node: ast.And, lhs: SQL, rhs: SQL) -> SQL:
+        return lhs & rhs
+
+    @handle(ast.Or)
+    def or_(self, node: ast.Or, lhs: SQL, rhs: SQL) -> SQL:
+        return lhs | rhs
+
+    @handle(ast.Comparison, subclasses=True)
+    def comparison(self, node: ast.Comparison, lhs: SQL, rhs: SQL) -> SQL:
+        return lhs.binary(COMPARISONS[type(node)], rhs)
+
+    @handle(ast.Between)
+    def between(self, node: ast.Between, lhs: SQL, low: SQL, high: SQL) -> SQL:
+        op = "NOT BETWEEN" if node.not_ else "BETWEEN"
+        return SQL(
+            f"{lhs.sql} {op} {low.sql} AND {high.sql}",
+            lhs.params + low.params + high.params,
+        )
+
+    @handle(ast.Like)
+    def like(self, node: ast.Like, lhs: SQL) -> SQL:
+        op = "NOT LIKE" if node.not_ else "LIKE"
+        pattern = like_sql_pattern(node)
+        if node.nocase:
+            lhs = SQL(f"LOWER({lhs.sql})", lhs.params)
+            pattern = pattern.lower()
+        return SQL(f"{lhs.sql} {op} {PARAMETER} ESCAPE '\\'", [*lhs.params, pattern])
+
+    @handle(ast.In)
+    def in_(self, node: ast.In, lhs: SQL, *options: SQL) -> SQL:
+        op = "NOT IN" if node.not_ else "IN"
+        options_sql = SQL.join(", ", options)
+        return SQL(
+            f"{lhs.sql} {op} ({options_sql.sql})", lhs.params + options_sql.params
+        )
+
+    @handle(ast.IsNull)
+    def is_null(self, node: ast.IsNull, lhs: SQL) -> SQL:
+        return SQL(f"{lhs.sql} IS {'NOT ' if node.not_ else ''}NULL", lhs.params)
+
+    @handle(ast.TemporalPredicate, subclasses=True)
+    def temporal(self, node: ast.TemporalPredicate, lhs: Any, rhs: Any) -> SQL:
+        relation = TEMPORAL_RELATIONS.get(type(node))
+        if relation is None:
+            raise ValueError(f"Unsupported temporal operation {type(node).__name__}")
+        return relation(self.interval(lhs), self.interval(rhs))
+
+    @handle(ast.SpatialComparisonPredicate, subclasses=True)
+    def spatial(self, node: ast.SpatialComparisonPredicate, lhs: Any, rhs: Any) -> SQL:
+        name = SPATIAL_RELATIONS.get(type(node))
+        if name is None:
+            raise ValueError(f"Unsupported spatial operation {type(node).__name__}")
+        a, b = self.geometry(lhs), self.geometry(rhs)
+        return SQL(f"ST_{name.capitalize()}({a.sql}, {b.sql})", a.params + b.params)
+
+    @handle(ast.Attribute)
+    def attribute(self, node: ast.Attribute) -> SQL | tuple[SQL, ...]:
+        if self.columns is None:
+            return SQL(quote(node.name))
+        column = self.columns.get(node.name)
+        if column is None:
+            raise ValueError(f"Unknown property {node.name}")
+        if isinstance(column, tuple):
+            return tuple(SQL(name) for name in column)
+        return SQL(column)
+
+    @handle(ast.Arithmetic, subclasses=True)
+    def arithmetic(self, node: ast.Arithmetic, lhs: SQL, rhs: SQL) -> SQL:
+        return SQL(
+            f"({lhs.sql} {ARITHMETIC[type(node)]} {rhs.sql})", lhs.params + rhs.params
+        )
+
+    @handle(ast.Function)
+    def function(self, node: ast.Function, *arguments: SQL) -> SQL:
+        function = FUNCTIONS.get(node.name)
+        if function is None or len(arguments) != 1:
+            raise ValueError(f"Unsupported function {node.name}")
+        (argument,) = arguments
+        return SQL(f"{function}({argument.sql})", argument.params)
+
+    @handle(values.Geometry, values.Envelope, values.Interval)
+    def literal(self, node: Any, *sub_args: Any) -> Any:
+        # normalized by the temporal and spatial operators using them
+        return node
+
+    def adopt(self, node: Any, *sub_args: Any) -> SQL:
+        if isinstance(node, ast.Node):
+            raise ValueError(f"Unsupported filter operation {type(node).__name__}")
+        if isinstance(node, date):
+            return SQL.param(self.dialect.datetime(to_datetime(node, None)))
+        return SQL.param(node)
+
+    def interval(self, value: Any) -> tuple[SQL, SQL]:
+        if isinstance(value, SQL):
+            return (value, value)
+        if isinstance(value, tuple):
+            if len(value) != 2:
+                raise ValueError("Temporal operators require start and end columns")
+            return value
+        if isinstance(value, values.Interval):
+            start, end = to_interval(value)  # type: ignore[misc]
+            return (
+                SQL.param(self.dialect.datetime(start)),
+                SQL.param(self.dialect.datetime(end)),
+            )
+        raise ValueError("Temporal operators require datetimes")
+
+    def geometry(self, value: Any) -> SQL:
+        if self.dialect.geometry is None:
+            raise ValueError(
+                "Spatial operators require a dialect with spatial functions"
+            )
+        if isinstance(value, SQL):
+            return value
+        if isinstance(value, values.Geometry | values.Envelope):
+            return SQL(
+                self.dialect.geometry.format(PARAMETER),
+                [json.dumps(to_geojson(value))],
+            )
+        raise ValueError("Spatial operators require a geometry column")
+
+
+def to_geojson(value: values.Geometry | values.Envelope) -> dict[str, Any]:
+    if isinstance(value, values.Geometry):
+        return value.geometry
+    x1, y1, x2, y2 = value.x1, value.y1, value.x2, value.y2
+    return {
+        "type": "Polygon",
+        "coordinates": [[[x1, y1], [x2, y1], [x2, y2], [x1, y2], [x1, y1]]],
+    }
+
+
+def like_sql_pattern(node: ast.Like) -> str:
+    """
+    The pattern of a like operation with `%` and `_` wildcards, escaped by `\\`.
+    """
+    parts = []
+    escaped = False
+    for char in node.pattern:
+        if escaped or char not in (node.escapechar, node.wildcard, node.singlechar):
+            parts.append(f"\\{char}" if char in "%_\\" else char)
+            escaped = False
+        elif char == node.escapechar:
+            escaped = True
+        else:
+            parts.append("%" if char == node.wildcard else "_")
+    return "".join(parts)
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
@@ -1,11 +1,19 @@
+from .concurrency_limit import ConcurrencyLimit
+from .deadlines import Deadlines
+from .geometry_limits import GeometryLimits
 from .opportunity import OpportunityProperties
 from .product import Product, Provider, ProviderRole
+from .search_buckets import SearchBuckets
 from .shared import Link
 
 __all__ = [
+    "ConcurrencyLimit",
+    "Deadlines",
+    "GeometryLimits",
     "Link",
     "OpportunityProperties",
     "Product",
     "Provider",
     "ProviderRole",
+    "SearchBuckets",
 ]
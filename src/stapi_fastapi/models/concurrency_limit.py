@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+
+class ConcurrencyLimit(BaseModel):
+    """
+    A limit on the number of backend calls awaited at once, for the root backend or a
+    product. Calls beyond `max_concurrency` wait in a queue of at most `max_queue`
+    calls for up to `queue_timeout` seconds. Requests which find the queue full or time
+    out waiting are answered with `503 Service Unavailable` and a `Retry-After` of
+    `retry_after` seconds.
+    """
+
+    max_concurrency: int = Field(gt=0)
+    max_queue: int = Field(default=100, ge=0)
+    queue_timeout: float = Field(default=10.0, gt=0)
+    retry_after: int = Field(default=1, ge=0)
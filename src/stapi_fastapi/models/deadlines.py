@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field, PositiveFloat
+
+
+class Deadlines(BaseModel):
+    """
+    Time limits, in seconds, on the backend calls made to serve a request. Limits are
+    looked up by operation, the route names in `stapi_fastapi.routers.route_names`
+    such as `search-opportunities` or `get-order`, falling back to `default`.
+
+    Backend calls still running when the deadline of their request expires are
+    cancelled, and the request is answered with `504 Gateway Timeout`.
+    """
+
+    default: PositiveFloat | None = None
+    operations: dict[str, PositiveFloat] = Field(default_factory=dict)
+
+    def get(self, operation: str) -> float | None:
+        return self.operations.get(operation, self.default)
@@ -0,0 +1,201 @@
+from collections.abc import Sequence
+from typing import Any
+
+from geojson_pydantic.geometries import (
+    Geometry,
+    GeometryCollection,
+    LineString,
+    MultiLineString,
+    MultiPolygon,
+    Polygon,
+)
+from pydantic import BaseModel, Field, TypeAdapter
+
+type Positions = Sequence[Sequence[float]]
+
+geometry_adapter: TypeAdapter[Geometry] = TypeAdapter(Geometry)
+
+
+class GeometryLimits(BaseModel):
+    """
+    Limits on the complexity of the geometries of opportunity searches and orders for
+    a product. Requests exceeding them are rejected before they reach the backend.
+
+    With a `simplify_tolerance`, geometries with more than `max_vertices` vertices,
+    or all geometries if there is no such limit, are first simplified so no vertex
+    moves further than the tolerance, given in the units of the coordinates. The
+    simplified geometry is passed to the backend and echoed in links. Geometries with
+    more than `max_input_vertices` vertices are rejected without being simplified, to
+    bound the work a request can cause.
+
+    Geometries are simplified with shapely, preserving their topology, when it is
+    installed with the `geo` extra, and with the Douglas-Peucker algorithm otherwise.
+    """
+
+    max_vertices: int | None = Field(default=None, gt=0)
+    max_rings: int | None = Field(default=None, gt=0)
+    max_bytes: int | None = Field(default=None, gt=0)
+    simplify_tolerance: float | None = Field(default=None, gt=0)
+    max_input_vertices: int = Field(default=10_000, gt=0)
+
+    def apply(self, geometry: Geometry) -> Geometry:
+        """
+        The geometry to use for a request, simplified if configured. Raises a
+        `ValueError` if it exceeds the limits.
+        """
+        vertices = count_vertices(geometry)
+        if vertices > self.max_input_vertices:
+            raise ValueError(
+                f"Geometry has {vertices} vertices, at most "
+                f"{self.max_input_vertices} are accepted"
+            )
+        if self.simplify_tolerance is not None and (
+            self.max_vertices is None or vertices > self.max_vertices
+        ):
+            geometry = simplify(geometry, self.simplify_tolerance)
+            vertices = count_vertices(geometry)
+        if self.max_vertices is not None and vertices > self.max_vertices:
+            raise ValueError(
+                f"Geometry has {vertices} vertices, at most {self.max_vertices} "
+                "are allowed"
+            )
+        rings = count_rings(geometry)
+        if self.max_rings is not None and rings > self.max_rings:
+            raise ValueError(
+                f"Geometry has {rings} rings, at most {self.max_rings} are allowed"
+            )
+        return geometry
+
+
+def count_vertices(geometry: Geometry) -> int:
+    if isinstance(geometry, GeometryCollection):
+        return sum(count_vertices(member) for member in geometry.geometries)
+    return count_positions(geometry.coordinates)
+
+
+def count_positions(coordinates: Any) -> int:
+    if not coordinates or isinstance(coordinates[0], int | float):
+        return 1 if coordinates else 0
+    return sum(count_positions(member) for member in coordinates)
+
+
+def count_rings(geometry: Geometry) -> int:
+    match geometry:
+        case GeometryCollection(geometries=members):
+            return sum(count_rings(member) for member in members)
+        case Polygon(coordinates=rings):
+            return len(rings)
+        case MultiPolygon(coordinates=polygons):
+            return sum(len(rings) for rings in polygons)
+        case _:
+            return 0
+
+
+def simplify(geometry: Geometry, tolerance: float) -> Geometry:
+    """
+    Simplify a geometry with shapely, preserving its topology, or with
+    `douglas_peucker` if shapely is not installed.
+    """
+    try:
+        import shapely
+    except ModuleNotFoundError:
+        return douglas_peucker(geometry, tolerance)
+    simplified = shapely.simplify(
+        shapely.geometry.shape(geometry), tolerance, preserve_topology=True
+    )
+    return geometry_adapter.validate_python(shapely.geometry.mapping(simplified))
+
+
+def douglas_peucker(geometry: Geometry, tolerance: float) -> Geometry:
+    """
+    Simplify the lines and polygon rings of a geometry. Rings keep at least four
+    positions; holes which would collapse are removed. The topology is not preserved,
+    so simplified polygons may intersect themselves.
+    """
+    coordinates: Any
+    match geometry:
+        case GeometryCollection(geometries=members):
+            return geometry.model_copy(
+                update={"geometries": [douglas_peucker(m, tolerance) for m in members]}
+            )
+        case LineString(coordinates=line):
+            coordinates = simplify_line(line, tolerance)
+        case MultiLineString(coordinates=lines):
+            coordinates = [simplify_line(line, tolerance) for line in lines]
+        case Polygon(coordinates=rings):
+            coordinates = simplify_polygon(rings, tolerance)
+        case MultiPolygon(coordinates=polygons):
+            coordinates = [simplify_polygon(rings, tolerance) for rings in polygons]
+        case _:
+            return geometry
+    return geometry_adapter.validate_python(
+        {"type": geometry.type, "coordinates": coordinates}
+    )
+
+
+def simplify_polygon(rings: Sequence[Positions], tolerance: float) -> list[Positions]:
+    exterior, *holes = rings
+    simplified = simplify_line(exterior, tolerance)
+    polygon = [simplified if len(simplified) >= 4 else exterior]
+    for hole in holes:
+        simplified = simplify_line(hole, tolerance)
+        if len(simplified) >= 4:
+            polygon.append(simplified)
+    return polygon
+
+
+def simplify_line(positions: Positions, tolerance: float) -> Positions:
+    """
+    Simplify a line with the Douglas-Peucker algorithm, after dropping positions
+    closer than the tolerance to the previous one to reduce its work.
+    """
+    if len(positions) < 3:
+        return positions
+    squared_tolerance = tolerance * tolerance
+    reduced = [positions[0]]
+    for position in positions[1:-1]:
+        if squared_distance(position, reduced[-1]) > squared_tolerance:
+            reduced.append(position)
+    reduced.append(positions[-1])
+
+    keep = [False] * len(reduced)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(reduced) - 1)]
+    while stack:
+        start, end = stack.pop()
+        index, distance = farthest(reduced, start, end)
+        if distance > squared_tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [position for position, kept in zip(reduced, keep) if kept]
+
+
+def farthest(positions: Positions, start: int, end: int) -> tuple[int, float]:
+    """
+    The index of the position between `start` and `end` farthest from the segment
+    joining them, and its squared distance.
+    """
+    farthest_index, farthest_distance = start, 0.0
+    for index in range(start + 1, end):
+        distance = squared_segment_distance(
+            positions[index], positions[start], positions[end]
+        )
+        if distance > farthest_distance:
+            farthest_index, farthest_distance = index, distance
+    return farthest_index, farthest_distance
+
+
+def squared_distance(a: Sequence[float], b: Sequence[float]) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def squared_segment_distance(
+    position: Sequence[float], a: Sequence[float], b: Sequence[float]
+) -> float:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return squared_distance(position, a)
+    t = ((position[0] - a[0]) * dx + (position[1] - a[1]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return squared_distance(position, (a[0] + t * dx, a[1] + t * dy))
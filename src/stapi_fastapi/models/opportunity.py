@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Any, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
 from geojson_pydantic import Feature, FeatureCollection
 from geojson_pydantic.geometries import Geometry
@@ -9,6 +9,11 @@ from stapi_fastapi.models.shared import Link
 from stapi_fastapi.types.datetime_interval import DatetimeInterval
 from stapi_fastapi.types.filter import CQL2Filter
 
+if TYPE_CHECKING:
+    from stapi_fastapi.models.opportunity_batch import (
+        OpportunityBatch as OpportunityBatch,
+    )
+
 
 # Copied and modified from https://github.com/stac-utils/stac-pydantic/blob/main/stac_pydantic/item.py#L11
 class OpportunityProperties(BaseModel):
@@ -81,3 +86,16 @@ class OpportunitySearchRecords(BaseModel):
 class Prefer(StrEnum):
     respond_async = "respond-async"
     wait = "wait"
+
+
+def __getattr__(name: str) -> Any:
+    # `OpportunityBatch` requires the optional numpy dependency
+    if name == "OpportunityBatch":
+        try:
+            from stapi_fastapi.models.opportunity_batch import OpportunityBatch
+        except ModuleNotFoundError as e:
+            raise ImportError(
+                "numpy is required for `OpportunityBatch`, install the `numpy` extra"
+            ) from e
+        return OpportunityBatch
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,195 @@
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any, Self
+
+import numpy as np
+import numpy.typing as npt
+from geojson_pydantic.geometries import Geometry
+from pydantic import BaseModel
+from returns.maybe import Maybe, Nothing, Some
+
+from stapi_fastapi.exceptions import PaginationTokenException
+from stapi_fastapi.filters.mask import compile_mask
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityProperties
+from stapi_fastapi.types.filter import CQL2Filter
+
+type Index = slice | npt.NDArray[np.bool_] | npt.NDArray[np.intp]
+type Datetimes = npt.NDArray[np.datetime64] | Sequence[datetime]
+
+
+class OpportunityBatch:
+    """
+    Columnar batch of opportunities with one NumPy array per attribute.
+
+    Backends producing many candidates per search can filter, sort and page them with
+    vectorized operations, and build and validate `Opportunity` features only for the
+    page that is returned. Nested properties are given as dotted column names, e.g.
+    the values of the column `off_nadir.minimum` become
+    `{"off_nadir": {"minimum": ...}}` in the properties of the opportunities.
+
+    The start and end datetimes are stored as UTC `datetime64[us]` arrays. Geometries
+    are either shared by all opportunities or given per opportunity.
+    """
+
+    def __init__(
+        self,
+        product_id: str,
+        start: Datetimes,
+        end: Datetimes,
+        geometry: Geometry | Sequence[Geometry],
+        columns: Mapping[str, npt.ArrayLike] | None = None,
+        ids: npt.ArrayLike | None = None,
+    ) -> None:
+        self.product_id = product_id
+        self.start = to_datetime64(start)
+        self.end = to_datetime64(end)
+        self.geometry = to_object_array(geometry, len(self.start))
+        self.columns = {
+            name: np.asarray(values) for name, values in (columns or {}).items()
+        }
+        self.ids = None if ids is None else np.asarray(ids)
+
+        arrays = {"end": self.end, "geometry": self.geometry, **self.columns}
+        if self.ids is not None:
+            arrays["ids"] = self.ids
+        for name, values in arrays.items():
+            if len(values) != len(self.start):
+                raise ValueError(
+                    f"'{name}' has {len(values)} values, expected {len(self.start)}"
+                )
+        if np.any(self.end < self.start):
+            raise ValueError("end before start")
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, name: str) -> npt.NDArray[Any]:
+        """
+        The column `name`, or the `start` or `end` datetimes.
+        """
+        if name == "start":
+            return self.start
+        if name == "end":
+            return self.end
+        return self.columns[name]
+
+    def take(self, index: Index) -> Self:
+        """
+        The opportunities selected by a slice, boolean mask or array of indices.
+        """
+        batch = object.__new__(type(self))
+        batch.product_id = self.product_id
+        batch.start = self.start[index]
+        batch.end = self.end[index]
+        batch.geometry = self.geometry[index]
+        batch.columns = {name: values[index] for name, values in self.columns.items()}
+        batch.ids = None if self.ids is None else self.ids[index]
+        return batch
+
+    def filter(self, mask: npt.ArrayLike) -> Self:
+        """
+        The opportunities for which `mask` is true.
+        """
+        return self.take(np.asarray(mask, dtype=np.bool_))
+
+    def overlapping(self, interval: tuple[datetime, datetime]) -> npt.NDArray[np.bool_]:
+        """
+        Mask of the opportunities overlapping the datetime `interval`.
+        """
+        start, end = to_datetime64(interval)
+        return (self.start <= end) & (self.end >= start)
+
+    def matching(self, filter: CQL2Filter | None) -> npt.NDArray[np.bool_]:
+        """
+        Mask of the opportunities matching the cql2-json `filter`, see `compile_mask`.
+        """
+        return compile_mask(filter)(self)
+
+    def sort(self, by: str, descending: bool = False) -> Self:
+        """
+        The opportunities stably sorted by the column `by`.
+        """
+        values = self[by]
+        if not descending:
+            return self.take(np.argsort(values, kind="stable"))
+        # sort the reversed values so ties keep their order once reversed again
+        order = np.argsort(values[::-1], kind="stable")
+        return self.take((len(values) - 1 - order)[::-1])
+
+    def page(self, next: str | None, limit: int) -> tuple[Self, Maybe[str]]:
+        """
+        The page of at most `limit` opportunities starting at the offset given by the
+        pagination token `next`, and the pagination token of the following page.
+        Raises `PaginationTokenException` for tokens that are not an offset into the
+        batch.
+        """
+        start = 0
+        if next:
+            start = int(next) if next.isdecimal() else -1
+            if not 0 <= start < len(self):
+                raise PaginationTokenException(f"Invalid pagination token {next!r}")
+        end = start + limit
+        page = self.take(slice(start, end))
+        if end > 0 and end < len(self):
+            return page, Some(str(end))
+        return page, Nothing
+
+    def to_opportunities(
+        self, properties: type[OpportunityProperties] = OpportunityProperties
+    ) -> list[Opportunity]:
+        """
+        Build and validate an `Opportunity` feature with `properties` for each
+        opportunity in the batch.
+        """
+        starts = from_datetime64(self.start)
+        ends = from_datetime64(self.end)
+        columns = {name: values.tolist() for name, values in self.columns.items()}
+        ids = [None] * len(self) if self.ids is None else self.ids.tolist()
+
+        opportunities: list[Opportunity] = []
+        for i, geometry in enumerate(self.geometry):
+            values: dict[str, Any] = {
+                "datetime": (starts[i], ends[i]),
+                "product_id": self.product_id,
+            }
+            for name, column in columns.items():
+                set_path(values, name, column[i])
+            opportunities.append(
+                Opportunity(
+                    id=ids[i],
+                    geometry=geometry,
+                    properties=properties.model_validate(values),
+                )
+            )
+        return opportunities
+
+
+def to_datetime64(values: Datetimes) -> npt.NDArray[np.datetime64]:
+    if isinstance(values, np.ndarray):
+        return values.astype("datetime64[us]")
+    datetimes = []
+    for value in values:
+        if value.tzinfo is None:
+            raise ValueError("timezone aware datetimes required")
+        datetimes.append(value.astimezone(UTC).replace(tzinfo=None))
+    return np.array(datetimes, dtype="datetime64[us]")
+
+
+def from_datetime64(values: npt.NDArray[np.datetime64]) -> list[datetime]:
+    return [value.replace(tzinfo=UTC) for value in values.astype(datetime).tolist()]
+
+
+def to_object_array(
+    values: BaseModel | Sequence[BaseModel], size: int
+) -> npt.NDArray[np.object_]:
+    # built element-wise, since NumPy would iterate over the fields of models
+    if isinstance(values, BaseModel):
+        return np.fromiter((values for _ in range(size)), dtype=np.object_, count=size)
+    return np.fromiter(values, dtype=np.object_, count=len(values))
+
+
+def set_path(values: dict[str, Any], path: str, value: Any) -> None:
+    *parents, name = path.split(".")
+    for parent in parents:
+        values = values.setdefault(parent, {})
+    values[name] = value
@@ -9,8 +9,10 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    SerializerFunctionWrapHandler,
     StrictStr,
     field_validator,
+    model_serializer,
 )
 
 from stapi_fastapi.models.opportunity import OpportunityProperties
@@ -55,8 +57,41 @@ class OrderStatus(BaseModel):
 
 
 class OrderStatuses[T: OrderStatus](BaseModel):
+    """
+    A page of the statuses of an order. When requested with `since` or `after`,
+    `after` is the cursor to pass on the next poll to only receive newer statuses.
+    """
+
     statuses: list[T]
     links: list[Link] = Field(default_factory=list)
+    after: str | None = None
+
+    # only responses to polls with `since` or `after` carry the `after` cursor. The
+    # return type is left out so the serialization schema remains the model's own.
+    @model_serializer(mode="wrap", when_used="json")
+    def serialize(self, handler: SerializerFunctionWrapHandler):
+        data = handler(self)
+        if data.get("after") is None:
+            data.pop("after", None)
+        return data
+
+
+class OrderIds(BaseModel):
+    ids: list[str]
+
+
+class OrderStatusesRequest(OrderIds):
+    since: AwareDatetime | None = None
+
+
+class OrderStatusesByIds[T: OrderStatus](BaseModel):
+    """
+    The statuses of many orders, by order ID. `next_since` is the timestamp of the
+    latest status included, to be passed as `since` when polling for newer statuses.
+    """
+
+    statuses: dict[str, list[T]]
+    next_since: AwareDatetime | None = None
 
 
 class OrderSearchParameters(BaseModel):
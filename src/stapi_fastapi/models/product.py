@@ -5,8 +5,12 @@ from typing import TYPE_CHECKING, Literal, Optional, Self
 
 from pydantic import AnyHttpUrl, BaseModel, Field
 
+from stapi_fastapi.models.concurrency_limit import ConcurrencyLimit
+from stapi_fastapi.models.deadlines import Deadlines
+from stapi_fastapi.models.geometry_limits import GeometryLimits
 from stapi_fastapi.models.opportunity import OpportunityProperties
 from stapi_fastapi.models.order import OrderParameters
+from stapi_fastapi.models.search_buckets import SearchBuckets
 from stapi_fastapi.models.shared import Link
 
 if TYPE_CHECKING:
@@ -15,6 +19,7 @@ if TYPE_CHECKING:
         GetOpportunityCollection,
         SearchOpportunities,
         SearchOpportunitiesAsync,
+        StreamOpportunities,
     )
 
 
@@ -58,7 +63,13 @@ class Product(BaseModel):
     _create_order: CreateOrder
     _search_opportunities: SearchOpportunities | None
     _search_opportunities_async: SearchOpportunitiesAsync | None
+    _stream_opportunities: StreamOpportunities | None
     _get_opportunity_collection: GetOpportunityCollection | None
+    _geometry_limits: GeometryLimits | None
+    _concurrency_limit: ConcurrencyLimit | None
+    _deadlines: Deadlines | None
+    _search_cache_ttl: float | None
+    _search_buckets: SearchBuckets | None
 
     def __init__(
         self,
@@ -70,6 +81,12 @@ class Product(BaseModel):
         search_opportunities: SearchOpportunities | None = None,
         search_opportunities_async: SearchOpportunitiesAsync | None = None,
         get_opportunity_collection: GetOpportunityCollection | None = None,
+        stream_opportunities: StreamOpportunities | None = None,
+        geometry_limits: GeometryLimits | None = None,
+        concurrency_limit: ConcurrencyLimit | None = None,
+        deadlines: Deadlines | None = None,
+        search_cache_ttl: float | None = None,
+        search_buckets: SearchBuckets | None = None,
         **kwargs,
     ) -> None:
         super().__init__(*args, **kwargs)
@@ -80,6 +97,12 @@ class Product(BaseModel):
                 "arguments must be provided if either is provided"
             )
 
+        if search_opportunities and stream_opportunities:
+            raise ValueError(
+                "Only one of the `search_opportunities` and `stream_opportunities` "
+                "arguments may be provided"
+            )
+
         self._constraints = constraints
         self._opportunity_properties = opportunity_properties
         self._order_parameters = order_parameters
@@ -87,6 +110,12 @@ class Product(BaseModel):
         self._search_opportunities = search_opportunities
         self._search_opportunities_async = search_opportunities_async
         self._get_opportunity_collection = get_opportunity_collection
+        self._stream_opportunities = stream_opportunities
+        self._geometry_limits = geometry_limits
+        self._concurrency_limit = concurrency_limit
+        self._deadlines = deadlines
+        self._search_cache_ttl = search_cache_ttl
+        self._search_buckets = search_buckets
 
     @property
     def create_order(self) -> CreateOrder:
@@ -98,6 +127,12 @@ class Product(BaseModel):
             raise AttributeError("This product does not support opportunity search")
         return self._search_opportunities
 
+    @property
+    def stream_opportunities(self) -> StreamOpportunities:
+        if not self._stream_opportunities:
+            raise AttributeError("This product does not support opportunity streaming")
+        return self._stream_opportunities
+
     @property
     def search_opportunities_async(self) -> SearchOpportunitiesAsync:
         if not self._search_opportunities_async:
@@ -126,9 +161,36 @@ class Product(BaseModel):
     def order_parameters(self) -> type[OrderParameters]:
         return self._order_parameters
 
+    @property
+    def geometry_limits(self) -> GeometryLimits | None:
+        return self._geometry_limits
+
+    @property
+    def concurrency_limit(self) -> ConcurrencyLimit | None:
+        return self._concurrency_limit
+
+    @property
+    def deadlines(self) -> Deadlines | None:
+        return self._deadlines
+
+    @property
+    def search_cache_ttl(self) -> float | None:
+        return self._search_cache_ttl
+
+    @property
+    def search_buckets(self) -> SearchBuckets | None:
+        return self._search_buckets
+
     @property
     def supports_opportunity_search(self) -> bool:
-        return self._search_opportunities is not None
+        return (
+            self._search_opportunities is not None
+            or self._stream_opportunities is not None
+        )
+
+    @property
+    def supports_opportunity_streaming(self) -> bool:
+        return self._stream_opportunities is not None
 
     @property
     def supports_async_opportunity_search(self) -> bool:
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+
+class SearchBuckets(BaseModel):
+    """
+    Caching of a product's opportunity search results per grid cell and time bucket,
+    so that searches overlapping earlier ones only query the backend for the cells
+    and buckets not searched yet.
+
+    Cells are `cell_size` degrees squares of longitude and latitude, and buckets span
+    `time_bucket` seconds. The backend is searched for each uncached cell and bucket
+    with the cell as geometry, the bucket as datetime and a limit of `cell_limit`.
+    Results are kept for `ttl` seconds in the root router's search cache.
+
+    Results are matched to a search by their datetime and geometry, and kept in the
+    order the backend found them in, cell by cell. Combined results are paged from the
+    cached cells. Searches covering more than `max_cells` cells and buckets, those for
+    which a cell has more than `cell_limit` results, and all searches when shapely is
+    not installed, are passed to the backend as is.
+    """
+
+    ttl: float = Field(gt=0)
+    cell_size: float = Field(default=1.0, gt=0)
+    time_bucket: float = Field(default=24 * 60 * 60, gt=0)
+    max_cells: int = Field(default=64, gt=0)
+    cell_limit: int = Field(default=1000, gt=0)
@@ -1,7 +1,50 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
 
 from stapi_fastapi.constants import TYPE_GEOJSON
 
 
 class GeoJSONResponse(JSONResponse):
     media_type = TYPE_GEOJSON
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response that serializes pydantic models straight to bytes with
+    pydantic-core, instead of encoding them to a dict and then with `json`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, by_alias=True)
+
+
+class GeoJSONModelResponse(ModelJSONResponse):
+    media_type = TYPE_GEOJSON
+
+
+async def feature_collection_chunks(
+    collection: BaseModel, features: AsyncIterator[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Serialize `collection` with `features` streamed into its empty `features` array
+    one by one.
+    """
+    head, tail = to_json(collection, by_alias=True).split(b'"features":[]', 1)
+    yield head + b'"features":['
+    separator = b""
+    async for feature in features:
+        yield separator + to_json(feature, by_alias=True)
+        separator = b","
+    yield b"]" + tail
+
+
+async def ndjson_chunks(features: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    """
+    Serialize `features` as newline delimited JSON, one feature per line.
+    """
+    async for feature in features:
+        yield to_json(feature, by_alias=True) + b"\n"
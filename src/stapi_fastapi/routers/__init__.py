@@ -1,7 +1,9 @@
+from .product_dispatch_router import ProductDispatchRouter
 from .product_router import ProductRouter
 from .root_router import RootRouter
 
 __all__ = [
+    "ProductDispatchRouter",
     "ProductRouter",
     "RootRouter",
 ]
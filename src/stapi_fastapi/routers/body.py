@@ -0,0 +1,130 @@
+from collections.abc import Callable, Coroutine
+from functools import cache
+from typing import Annotated, Any
+
+from fastapi import Body, HTTPException, Request, Response, status
+from fastapi._compat import ModelField
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+
+
+def validate_body[T: BaseModel](model: type[T], payload: Any) -> T:
+    """
+    Validate a request body parsed from JSON against `model`, reporting errors like
+    FastAPI does for body parameters.
+    """
+    try:
+        return model.model_validate(payload)
+    except ValidationError as e:
+        raise request_validation_error(e) from None
+
+
+def validate_json_body[T: BaseModel](model: type[T], body: bytes) -> T:
+    """
+    Validate the raw JSON bytes of a request body against `model` in a single pass
+    with pydantic-core, instead of parsing them into Python objects first.
+    """
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise request_validation_error(e) from None
+
+
+def request_validation_error(e: ValidationError) -> RequestValidationError:
+    return RequestValidationError(
+        [
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ]
+    )
+
+
+@cache
+def documented_body_field(body: Any) -> ModelField | None:
+    """
+    The body field FastAPI derives for a `body` parameter, so its schema is published
+    under the OpenAPI components like any other request body.
+    """
+
+    async def endpoint(payload: Any) -> None:
+        pass
+
+    endpoint.__annotations__["payload"] = Annotated[body, Body()]
+    return APIRoute("/", endpoint, methods=["POST"]).body_field
+
+
+class LimitedBodyRequest(Request):
+    """
+    A request whose body is read up to `max_bytes` bytes, answering larger bodies with
+    `413` before any of it is parsed, whether or not their size is declared.
+    """
+
+    def __init__(self, request: Request, max_bytes: int) -> None:
+        super().__init__(request.scope, request.receive)
+        self.max_bytes = max_bytes
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            size = self.headers.get("Content-Length", "")
+            if size.isdigit() and int(size) > self.max_bytes:
+                raise self.too_large()
+            chunks: list[bytes] = []
+            read = 0
+            async for chunk in self.stream():
+                read += len(chunk)
+                if read > self.max_bytes:
+                    raise self.too_large()
+                chunks.append(chunk)
+            self._body = b"".join(chunks)
+        return self._body
+
+    def too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds the limit of {self.max_bytes} bytes",
+        )
+
+
+def body_route(
+    max_bytes: Callable[[Request], int | None],
+    documented_body: Callable[[], Any] | None = None,
+) -> type[APIRoute]:
+    """
+    A route class limiting request bodies to `max_bytes(request)` bytes, if not None.
+
+    With `documented_body`, it also documents the request body it returns, for
+    endpoints that read and validate the raw request body themselves. It is called
+    when the OpenAPI document is generated, so it may depend on routes added later.
+    """
+
+    class BodyRoute(APIRoute):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            # the request handler built above keeps the endpoint's own (empty) body
+            self.documented = documented_body is not None
+
+        @property  # type: ignore[override]
+        def body_field(self) -> ModelField | None:
+            if self.__dict__.get("documented") and documented_body is not None:
+                return documented_body_field(documented_body())
+            return self.__dict__.get("_body_field")
+
+        @body_field.setter
+        def body_field(self, value: ModelField | None) -> None:
+            self.__dict__["_body_field"] = value
+
+        def get_route_handler(
+            self,
+        ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+            handler = super().get_route_handler()
+
+            async def route_handler(request: Request) -> Response:
+                limit = max_bytes(request)
+                if limit is not None:
+                    request = LimitedBodyRequest(request, limit)
+                return await handler(request)
+
+            return route_handler
+
+    return BodyRoute
@@ -0,0 +1,180 @@
+import asyncio
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Coroutine, Iterator
+from typing import Any, NamedTuple
+
+from fastapi import HTTPException, status
+from returns.maybe import Maybe
+from returns.result import ResultE, Success
+
+from stapi_fastapi.models.concurrency_limit import ConcurrencyLimit
+
+
+class ConcurrencyMetrics(NamedTuple):
+    """
+    A snapshot of the state of a `ConcurrencyLimiter`. Wait times are in seconds and
+    only cover calls which had to queue.
+    """
+
+    active: int
+    queued: int
+    admitted: int
+    rejected: int
+    timed_out: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds the backend calls awaited at once according to a `ConcurrencyLimit`, so a
+    slow backend sheds load instead of piling up coroutines on the event loop.
+
+    Waiting calls are admitted in arrival order.
+    """
+
+    def __init__(self, limit: ConcurrencyLimit) -> None:
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit.max_concurrency)
+        self._active = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    async def run[T](self, call: Coroutine[Any, Any, T]) -> T:
+        """
+        Await the backend `call` once a slot is free. The call is closed without
+        running if it is shed.
+        """
+        try:
+            await self.acquire()
+        except BaseException:
+            call.close()
+            raise
+        try:
+            return await call
+        finally:
+            self.release()
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked():
+            await self.wait()
+        else:
+            await self._semaphore.acquire()
+        self._active += 1
+        self._admitted += 1
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    async def wait(self) -> None:
+        if self._queued >= self.limit.max_queue:
+            self._rejected += 1
+            raise self.unavailable("Too many requests are waiting for the backend")
+        self._queued += 1
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.limit.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self._timed_out += 1
+            raise self.unavailable("Timed out waiting for the backend") from None
+        finally:
+            self._queued -= 1
+            waited = time.perf_counter() - start
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+
+    def unavailable(self, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(self.limit.retry_after)},
+        )
+
+    def metrics(self) -> ConcurrencyMetrics:
+        return ConcurrencyMetrics(
+            active=self._active,
+            queued=self._queued,
+            admitted=self._admitted,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+            wait_time_total=self._wait_time_total,
+            wait_time_max=self._wait_time_max,
+        )
+
+
+async def limited[T](
+    limiter: ConcurrencyLimiter | None, call: Coroutine[Any, Any, T]
+) -> T:
+    """
+    Await the backend `call`, within the limits of `limiter` if there is one.
+    """
+    if limiter is None:
+        return await call
+    return await limiter.run(call)
+
+
+async def limited_stream[T](
+    limiter: ConcurrencyLimiter | None,
+    call: Coroutine[Any, Any, ResultE[tuple[AsyncIterator[T], Maybe[str]]]],
+) -> ResultE[tuple[AsyncIterator[T], Maybe[str]]]:
+    """
+    Await the backend streaming `call`, within the limits of `limiter` if there is
+    one. The slot is held until the stream is exhausted or closed.
+    """
+    if limiter is None:
+        return await call
+    try:
+        await limiter.acquire()
+    except BaseException:
+        call.close()
+        raise
+    try:
+        result = await call
+    except BaseException:
+        limiter.release()
+        raise
+    match result:
+        case Success((items, maybe_pagination_token)):
+            return Success((holding(limiter, items), maybe_pagination_token))
+    limiter.release()
+    return result
+
+
+def holding[T](
+    limiter: ConcurrencyLimiter, items: AsyncIterator[T]
+) -> AsyncIterator[T]:
+    """
+    Iterate `items`, releasing a slot of `limiter` once they are exhausted or closed,
+    or once the iterator is garbage collected if it is never iterated.
+    """
+
+    async def iterate() -> AsyncIterator[T]:
+        try:
+            async for item in items:
+                yield item
+        finally:
+            release()
+
+    stream = iterate()
+    release = weakref.finalize(stream, limiter.release)
+    return stream
+
+
+async def gather_cancelling[T](calls: Iterator[Awaitable[T]]) -> list[T]:
+    """
+    Await the calls concurrently, cancelling those still running if one fails.
+    """
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
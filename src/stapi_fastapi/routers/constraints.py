@@ -0,0 +1,133 @@
+from collections.abc import Iterator
+from functools import cache
+from types import UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_json
+from pygeofilter import ast, values
+
+from stapi_fastapi.exceptions import ConstraintsException
+from stapi_fastapi.types.filter import CQL2Filter
+
+# predicates whose literals are values of the property they are compared with
+VALUE_PREDICATES = (ast.Comparison, ast.Between, ast.In)
+NON_SCALARS = (ast.Node, values.Geometry, values.Envelope, values.Interval)
+
+
+class ConstraintsValidator:
+    """
+    Checks the values a cql2-json filter compares properties with against the types
+    of the fields of a product's constraints model, with a `TypeAdapter` per field
+    built once. Fields of nested models are named by their dotted path, as in
+    `off_nadir.minimum`.
+
+    Only the types are checked, strictly as for JSON input, not constraints such as
+    `le=45`, since values outside the allowed range are valid bounds, as in
+    `off_nadir < 50`. Properties which are not fields of the model are only rejected
+    if the model, or the nested model they would belong to, forbids extra fields.
+    """
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.adapters: dict[str, TypeAdapter[Any]] = {}
+        # the paths of the models forbidding extra fields, "" for the root model
+        self.forbidding: set[str] = set()
+        self.add_fields(model, "", (model,))
+
+    def add_fields(
+        self, model: type[BaseModel], path: str, models: tuple[type[BaseModel], ...]
+    ) -> None:
+        if model.model_config.get("extra") == "forbid":
+            self.forbidding.add(path)
+        for name, field in model.model_fields.items():
+            field_path = f"{path}.{field.alias or name}".lstrip(".")
+            self.adapters[field_path] = TypeAdapter(field.annotation)
+            nested = nested_model(field.annotation)
+            # recursive models are only walked once
+            if nested is not None and nested not in models:
+                self.add_fields(nested, field_path, (*models, nested))
+
+    def unknown(self, name: str) -> bool:
+        """
+        Whether the property `name` is rejected as not being a field of the model.
+        """
+        path = name.rpartition(".")[0]
+        while path and path not in self.adapters:
+            path = path.rpartition(".")[0]
+        return path in self.forbidding
+
+    def validate(self, filter: CQL2Filter | None) -> None:
+        """
+        Raise a `ConstraintsException` listing the errors if `filter` violates the
+        constraints.
+        """
+        if not filter or filter.ast is None:
+            return
+        errors: list[dict[str, Any]] = []
+        for name, literals in compared_values(filter.ast):
+            adapter = self.adapters.get(name)
+            if adapter is None:
+                if self.unknown(name):
+                    errors.append(
+                        {
+                            "type": "extra_forbidden",
+                            "loc": ["filter", name],
+                            "msg": "Unknown property",
+                        }
+                    )
+                continue
+            for literal in literals:
+                try:
+                    adapter.validate_json(to_json(literal), strict=True)
+                except ValidationError as e:
+                    errors.extend(
+                        {**error, "loc": ["filter", name, *error["loc"]]}
+                        for error in e.errors(
+                            include_url=False,
+                            include_context=False,
+                            include_input=False,
+                        )
+                    )
+        if errors:
+            raise ConstraintsException(errors)
+
+
+@cache
+def constraints_validator(model: type[BaseModel]) -> ConstraintsValidator:
+    """
+    The validator of the constraints model, shared by all products using it.
+    """
+    return ConstraintsValidator(model)
+
+
+def nested_model(annotation: Any) -> type[BaseModel] | None:
+    """
+    The model of a field annotated with one, possibly optional.
+    """
+    union = get_origin(annotation) in (Union, UnionType)
+    models = [
+        candidate
+        for candidate in (get_args(annotation) if union else (annotation,))
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel)
+    ]
+    return models[0] if len(models) == 1 else None
+
+
+def compared_values(node: Any) -> Iterator[tuple[str, list[Any]]]:
+    """
+    The properties compared with literal values in a filter, and those values.
+    """
+    if not isinstance(node, ast.Node):
+        return
+    sub_nodes = node.get_sub_nodes()
+    if isinstance(node, VALUE_PREDICATES):
+        attributes = [sub for sub in sub_nodes if isinstance(sub, ast.Attribute)]
+        literals = [sub for sub in sub_nodes if is_scalar_literal(sub)]
+        if len(attributes) == 1 and literals:
+            yield attributes[0].name, literals
+    for sub in sub_nodes:
+        yield from compared_values(sub)
+
+
+def is_scalar_literal(value: Any) -> bool:
+    return not isinstance(value, NON_SCALARS) and value is not None
@@ -0,0 +1,95 @@
+import asyncio
+from collections.abc import AsyncIterator, Coroutine
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+from returns.maybe import Maybe
+from returns.result import ResultE, Success
+
+
+def operation(request: Request) -> str:
+    """
+    The operation served by the request: the route name without the router and
+    product prefixes, e.g. `search-opportunities`.
+    """
+    route = request.scope.get("route")
+    name = getattr(route, "name", None) or ""
+    return name.rsplit(":", 1)[-1]
+
+
+def remaining_time(request: Request) -> float | None:
+    """
+    The seconds left before the deadline of the request, or `None` if it has none.
+    Backends can use this to bound their own calls to downstream services.
+    """
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is None:
+        return None
+    return max(deadline - asyncio.get_running_loop().time(), 0.0)
+
+
+async def with_deadline[T](
+    request: Request, timeout: float | None, call: Coroutine[Any, Any, T]
+) -> T:
+    """
+    Await the backend `call`, cancelling it at the deadline of the request. The
+    deadline is set `timeout` seconds after the first backend call of the request and
+    shared by any later calls.
+    """
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is None:
+        if timeout is None:
+            return await call
+        deadline = asyncio.get_running_loop().time() + timeout
+        request.state.deadline = deadline
+
+    timeout_context = asyncio.timeout_at(deadline)
+    try:
+        async with timeout_context:
+            return await call
+    except TimeoutError:
+        if not timeout_context.expired():
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="The backend did not respond in time",
+        ) from None
+
+
+async def with_stream_deadline[T](
+    request: Request,
+    timeout: float | None,
+    call: Coroutine[Any, Any, ResultE[tuple[AsyncIterator[T], Maybe[str]]]],
+) -> ResultE[tuple[AsyncIterator[T], Maybe[str]]]:
+    """
+    Await the backend streaming `call` like `with_deadline`, also cancelling the
+    iteration of the stream at the deadline of the request.
+    """
+    result = await with_deadline(request, timeout, call)
+    match result:
+        case Success((items, maybe_pagination_token)):
+            return Success((until_deadline(request, items), maybe_pagination_token))
+    return result
+
+
+def until_deadline[T](request: Request, items: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Iterate `items`, cancelling the iteration at the deadline of the request if it
+    has one. The response is streaming by then, so it is aborted with a
+    `TimeoutError`.
+    """
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is None:
+        return items
+
+    async def iterate() -> AsyncIterator[T]:
+        while True:
+            # the timeout only covers awaiting the next item, not the consumer
+            async with asyncio.timeout_at(deadline):
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+
+    return iterate()
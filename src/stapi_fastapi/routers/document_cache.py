@@ -0,0 +1,65 @@
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+from stapi_fastapi.constants import TYPE_JSON
+from stapi_fastapi.routers.etag import etag_matches, make_etag, not_modified
+
+
+class DocumentCache:
+    """
+    Cache of fully serialized response bodies for documents that only change when
+    products are added, such as the landing page, conformance and product documents.
+
+    Documents contain absolute links, so entries are keyed by the base URL of the
+    request (scheme, host and root path) in addition to the document key. The number
+    of entries is bounded by `maxsize`; the oldest entry is evicted first.
+
+    Every document is served with a strong `ETag` computed from its bytes, and
+    requests with a matching `If-None-Match` header are answered with a
+    `304 Not Modified`.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._documents: dict[Hashable, tuple[bytes, str]] = {}
+        # sync endpoints are run in a threadpool
+        self._lock = Lock()
+
+    def response(
+        self,
+        request: Request,
+        key: Hashable,
+        build: Callable[[], Any],
+        media_type: str = TYPE_JSON,
+    ) -> Response:
+        """
+        Return the cached document for `key`, serializing the value returned by
+        `build` on a miss.
+        """
+        cache_key = (str(request.base_url), key)
+        document = self._documents.get(cache_key)
+        if document is None:
+            content = to_json(build(), by_alias=True)
+            document = (content, make_etag(content))
+            self.put(cache_key, document)
+
+        content, etag = document
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return Response(content=content, media_type=media_type, headers={"ETag": etag})
+
+    def put(self, cache_key: Hashable, document: tuple[bytes, str]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if len(self._documents) >= self.maxsize:
+                del self._documents[next(iter(self._documents))]
+            self._documents[cache_key] = document
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
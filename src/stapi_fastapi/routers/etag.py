@@ -0,0 +1,52 @@
+from hashlib import blake2b
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: str | bytes) -> str:
+    """
+    Build a strong entity tag from the parts that identify a representation.
+    """
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the `If-None-Match` header of `request` matches `etag`, using the weak
+    comparison required for `If-None-Match`.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def check_not_modified(
+    request: Request, response: Response, version: str | None
+) -> Response | None:
+    """
+    Set the `ETag` for `version` of the resource at the request URL on `response`,
+    and return a `304 Not Modified` response if the client already has it.
+
+    Does nothing if no `version` is known.
+    """
+    if version is None:
+        return None
+
+    etag = make_etag(str(request.url), version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return None
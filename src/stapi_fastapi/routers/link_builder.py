@@ -0,0 +1,48 @@
+from typing import Any
+
+from fastapi import Request
+from fastapi.datastructures import URL
+from starlette.datastructures import URLPath
+from starlette.routing import Route, replace_params
+
+
+class LinkBuilder:
+    """
+    Builds absolute URLs for named routes from an index of route names to path
+    templates, instead of walking every registered route like `Request.url_for` does.
+
+    The index is built from the routes of the application serving the request the
+    first time it is needed, and is rebuilt whenever that set of routes changes.
+    Names that are not in the index, such as routes of mounted sub-applications, are
+    resolved with `Request.url_for`.
+    """
+
+    def __init__(self) -> None:
+        # (router, number of routes, index) swapped as one value so that requests
+        # handled in the threadpool never see a partially updated index
+        self._state: tuple[Any, int, dict[str, Route]] = (None, 0, {})
+
+    def url_for(self, request: Request, name: str, /, **path_params: Any) -> URL:
+        route = self.index(request).get(name)
+        if route is None or route.param_convertors.keys() != path_params.keys():
+            return request.url_for(name, **path_params)
+
+        path, _ = replace_params(route.path_format, route.param_convertors, path_params)
+        return URLPath(path=path, protocol="http").make_absolute_url(
+            base_url=request.base_url
+        )
+
+    def index(self, request: Request) -> dict[str, Route]:
+        router = request.scope.get("router") or request.scope.get("app")
+        routes = getattr(router, "routes", [])
+
+        indexed_router, route_count, index = self._state
+        if router is not indexed_router or len(routes) != route_count:
+            index = {}
+            for route in routes:
+                # like `Router.url_path_for`, the first route with a name wins
+                if isinstance(route, Route):
+                    index.setdefault(route.name, route)
+            self._state = (router, len(routes), index)
+
+        return index
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Union
+
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+
+from stapi_fastapi.constants import TYPE_JSON
+from stapi_fastapi.exceptions import NotFoundException
+from stapi_fastapi.models.opportunity import (
+    OpportunityCollection,
+    OpportunityPayload,
+    OpportunitySearchRecord,
+    Prefer,
+)
+from stapi_fastapi.models.order import Order, OrderPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.responses import GeoJSONResponse
+from stapi_fastapi.routers.body import (
+    body_route,
+    validate_body,
+    validate_json_body,
+)
+from stapi_fastapi.routers.product_router import ProductRouter, get_prefer
+from stapi_fastapi.routers.route_names import (
+    CREATE_ORDER,
+    GET_CONSTRAINTS,
+    GET_OPPORTUNITY_COLLECTION,
+    GET_ORDER_PARAMETERS,
+    GET_PRODUCT,
+    SEARCH_OPPORTUNITIES,
+)
+from stapi_fastapi.types.json_schema_model import JsonSchemaModel
+
+if TYPE_CHECKING:
+    from stapi_fastapi.routers import RootRouter
+
+
+class ProductDispatchRouter(APIRouter):
+    """
+    Serves every product of a `RootRouter` from a single set of parameterized
+    `/products/{product_id}/...` routes.
+
+    The product is resolved with a dict lookup on the root router's product routers,
+    so neither routing nor adding a product gets slower as the catalog grows. Request
+    and response bodies are still validated against the models of the product.
+    """
+
+    def __init__(self, root_router: RootRouter, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.root_router = root_router
+
+        self.add_api_route(
+            path="",
+            endpoint=self.get_product,
+            name=f"{self.root_router.name}:{GET_PRODUCT}",
+            methods=["GET"],
+            response_model=Product,
+            summary="Retrieve a product",
+            tags=["Products"],
+        )
+
+        self.add_api_route(
+            path="/constraints",
+            endpoint=self.get_product_constraints,
+            name=f"{self.root_router.name}:{GET_CONSTRAINTS}",
+            methods=["GET"],
+            response_model=JsonSchemaModel,
+            summary="Get constraints for a product",
+            tags=["Products"],
+        )
+
+        self.add_api_route(
+            path="/order-parameters",
+            endpoint=self.get_product_order_parameters,
+            name=f"{self.root_router.name}:{GET_ORDER_PARAMETERS}",
+            methods=["GET"],
+            response_model=JsonSchemaModel,
+            summary="Get order parameters for a product",
+            tags=["Products"],
+        )
+
+        raw_body_validation = self.root_router.raw_body_validation
+
+        self.add_api_route(
+            path="/orders",
+            endpoint=(
+                self.create_order_from_json
+                if raw_body_validation
+                else self.create_order
+            ),
+            name=f"{self.root_router.name}:{CREATE_ORDER}",
+            methods=["POST"],
+            response_class=GeoJSONResponse,
+            response_model=Order,
+            status_code=status.HTTP_201_CREATED,
+            summary="Create an order for a product",
+            tags=["Products"],
+            route_class_override=body_route(self.max_body_bytes, self.order_payloads),
+        )
+
+        self.add_api_route(
+            path="/opportunities",
+            endpoint=(
+                self.search_opportunities_from_json
+                if raw_body_validation
+                else self.search_opportunities
+            ),
+            name=f"{self.root_router.name}:{SEARCH_OPPORTUNITIES}",
+            methods=["POST"],
+            response_class=GeoJSONResponse,
+            # the response is validated against the product's own model instead
+            response_model=None,
+            responses={
+                200: {"model": OpportunityCollection},
+                201: {
+                    "model": OpportunitySearchRecord,
+                    "content": {TYPE_JSON: {}},
+                },
+            },
+            summary="Search Opportunities for a product",
+            tags=["Products"],
+            route_class_override=body_route(
+                self.max_body_bytes,
+                (lambda: OpportunityPayload) if raw_body_validation else None,
+            ),
+        )
+
+        if self.root_router.supports_async_opportunity_search:
+            self.add_api_route(
+                path="/opportunities/{opportunity_collection_id}",
+                endpoint=self.get_opportunity_collection,
+                name=f"{self.root_router.name}:{GET_OPPORTUNITY_COLLECTION}",
+                methods=["GET"],
+                response_class=GeoJSONResponse,
+                response_model=OpportunityCollection,
+                summary="Get an Opportunity Collection by ID",
+                tags=["Products"],
+            )
+
+    def order_payloads(self) -> Any:
+        """
+        The documented request body of orders, the union of the products' order
+        payload models.
+        """
+        models = {
+            product_router.order_payload_model: None
+            for product_router in self.root_router.product_routers.values()
+        }
+        return Union[tuple(models)] if models else OrderPayload
+
+    def max_body_bytes(self, request: Request) -> int | None:
+        """
+        The body size limit of the product the request is for, if it exists.
+        """
+        product_id = request.path_params.get("product_id")
+        product_router = self.root_router.product_routers.get(product_id or "")
+        return None if product_router is None else product_router.max_body_bytes
+
+    def product_router(self, product_id: str) -> ProductRouter:
+        try:
+            return self.root_router.product_routers[product_id]
+        except KeyError:
+            raise NotFoundException() from None
+
+    def get_product(self, product_id: str, request: Request) -> Response:
+        return self.product_router(product_id).get_product(request)
+
+    def get_product_constraints(self, product_id: str, request: Request) -> Response:
+        """
+        Return supported constraints of a specific product
+        """
+        return self.product_router(product_id).get_product_constraints(request)
+
+    def get_product_order_parameters(
+        self, product_id: str, request: Request
+    ) -> Response:
+        """
+        Return supported order parameters of a specific product
+        """
+        return self.product_router(product_id).get_product_order_parameters(request)
+
+    async def create_order(
+        self,
+        product_id: str,
+        request: Request,
+        response: Response,
+        payload: dict[str, Any] = Body(...),
+    ) -> Order | Response:
+        """
+        Create a new order.
+        """
+        product_router = self.product_router(product_id)
+        return await product_router.create_order(
+            validate_body(product_router.order_payload_model, payload),
+            request,
+            response,
+        )
+
+    async def create_order_from_json(
+        self, product_id: str, request: Request, response: Response
+    ) -> Order | Response:
+        """
+        Create a new order.
+        """
+        return await self.product_router(product_id).create_order_from_json(
+            request, response
+        )
+
+    async def search_opportunities(
+        self,
+        product_id: str,
+        search: OpportunityPayload,
+        request: Request,
+        response: Response,
+        prefer: Prefer | None = Depends(get_prefer),
+    ) -> OpportunityCollection | Response:
+        """
+        Explore the opportunities available for a particular set of constraints
+        """
+        product_router = self.product_router(product_id)
+        if not (
+            product_router.product.supports_opportunity_search
+            or self.root_router.supports_async_opportunity_search
+        ):
+            raise NotFoundException("Opportunity search not supported")
+
+        # the collection is already built against the product's opportunity model
+        return await product_router.search_opportunities(
+            search, request, response, prefer
+        )
+
+    async def search_opportunities_from_json(
+        self,
+        product_id: str,
+        request: Request,
+        response: Response,
+        prefer: Prefer | None = Depends(get_prefer),
+    ) -> OpportunityCollection | Response:
+        """
+        Explore the opportunities available for a particular set of constraints
+        """
+        search = validate_json_body(OpportunityPayload, await request.body())
+        return await self.search_opportunities(
+            product_id, search, request, response, prefer
+        )
+
+    async def get_opportunity_collection(
+        self, product_id: str, opportunity_collection_id: str, request: Request
+    ) -> OpportunityCollection | Response:
+        """
+        Fetch an opportunity collection generated by an asynchronous opportunity search.
+        """
+        return await self.product_router(product_id).get_opportunity_collection(
+            opportunity_collection_id, request
+        )
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import traceback
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterator, Callable, Coroutine, Hashable
+from typing import TYPE_CHECKING, Any
 
 from fastapi import (
     APIRouter,
@@ -13,14 +14,23 @@ from fastapi import (
     Response,
     status,
 )
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import URL
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from geojson_pydantic.geometries import Geometry
+from pydantic import BaseModel, TypeAdapter
 from returns.maybe import Maybe, Some
-from returns.result import Failure, Success
+from returns.result import Failure, ResultE, Success
 
 from stapi_fastapi.constants import TYPE_JSON
-from stapi_fastapi.exceptions import ConstraintsException, NotFoundException
+from stapi_fastapi.exceptions import (
+    ConstraintsException,
+    NotFoundException,
+    PaginationTokenException,
+)
 from stapi_fastapi.models.opportunity import (
+    Opportunity,
     OpportunityCollection,
     OpportunityPayload,
     OpportunitySearchRecord,
@@ -30,6 +40,18 @@ from stapi_fastapi.models.order import Order, OrderPayload
 from stapi_fastapi.models.product import Product
 from stapi_fastapi.models.shared import Link
 from stapi_fastapi.responses import GeoJSONResponse
+from stapi_fastapi.routers.body import body_route, validate_json_body
+from stapi_fastapi.routers.concurrency_limiter import (
+    ConcurrencyLimiter,
+    limited_stream,
+)
+from stapi_fastapi.routers.constraints import constraints_validator
+from stapi_fastapi.routers.deadline import (
+    operation,
+    with_deadline,
+    with_stream_deadline,
+)
+from stapi_fastapi.routers.etag import etag_matches, not_modified
 from stapi_fastapi.routers.route_names import (
     CREATE_ORDER,
     GET_CONSTRAINTS,
@@ -38,7 +60,16 @@ from stapi_fastapi.routers.route_names import (
     GET_PRODUCT,
     SEARCH_OPPORTUNITIES,
 )
-from stapi_fastapi.types.json_schema_model import JsonSchemaModel
+from stapi_fastapi.routers.search_buckets import BucketedSearch
+from stapi_fastapi.routers.search_cache import (
+    SearchCacheStats,
+    search_cache_key,
+    search_page_adapter,
+)
+from stapi_fastapi.routers.single_flight import caller_key
+from stapi_fastapi.routers.trusted import build_model
+from stapi_fastapi.types.filter import canonical
+from stapi_fastapi.types.json_schema_model import JsonSchemaModel, schema_registry
 
 if TYPE_CHECKING:
     from stapi_fastapi.routers import RootRouter
@@ -59,11 +90,43 @@ def get_prefer(prefer: str | None = Header(None)) -> str | None:
     return Prefer(prefer)
 
 
+def json_schema_response(request: Request, model: type[BaseModel]) -> Response:
+    """
+    Serve the pre-serialized JSON schema of `model` from the schema registry, using
+    the registered schema id as its `ETag`.
+    """
+    registered = schema_registry.get(model)
+    etag = f'"{registered.id}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=registered.json, media_type=TYPE_JSON, headers={"ETag": etag}
+    )
+
+
+def search_error(e: Exception) -> HTTPException:
+    """
+    The error response of an opportunity search the backend failed.
+    """
+    match e:
+        case ConstraintsException() | PaginationTokenException():
+            return e
+    logger.error(
+        "An error occurred while searching opportunities: %s",
+        traceback.format_exception(e),
+    )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="Error searching opportunities",
+    )
+
+
 class ProductRouter(APIRouter):
     def __init__(
         self,
         product: Product,
         root_router: RootRouter,
+        trusted_backend: bool | None = None,
         *args,
         **kwargs,
     ) -> None:
@@ -80,12 +143,63 @@ class ProductRouter(APIRouter):
 
         self.product = product
         self.root_router = root_router
+        # Defaults to the setting of the root router.
+        self.trusted_backend = (
+            root_router.trusted_backend if trusted_backend is None else trusted_backend
+        )
+
+        self.opportunity_collection_model = OpportunityCollection[
+            Geometry,
+            self.product.opportunity_properties,  # type: ignore
+        ]
+        self.order_payload_model = OrderPayload[
+            self.product.order_parameters  # type: ignore
+        ]
+        self.search_cache_stats = SearchCacheStats()
+        self._bucketed_search: BucketedSearch | None = None
+        self.constraints_validator = constraints_validator(self.product.constraints)
+        self.concurrency_limiter = (
+            ConcurrencyLimiter(product.concurrency_limit)
+            if product.concurrency_limit
+            else None
+        )
+
+        # When the root router dispatches products from a single set of
+        # parameterized routes, this router only serves as the per-product
+        # handler and must not register routes of its own.
+        if not root_router.product_dispatch:
+            self.add_product_routes()
+
+    @property
+    def search_page_adapter(self) -> TypeAdapter[tuple[list[Opportunity], str | None]]:
+        return search_page_adapter(self.product.opportunity_properties)
+
+    @property
+    def bucketed_search(self) -> BucketedSearch | None:
+        """
+        The bucketed search of the product, built on first use, if its searches are
+        bucketed and the root router has a search cache.
+        """
+        cache, buckets = self.root_router.search_cache, self.product.search_buckets
+        if cache is None or buckets is None:
+            return None
+        if self._bucketed_search is None:
+            self._bucketed_search = BucketedSearch(
+                self.product.id,
+                buckets,
+                cache,
+                self.search_page_adapter,
+                self.search_cache_stats,
+            )
+        return self._bucketed_search
 
+    def add_product_routes(self) -> None:
         self.add_api_route(
             path="",
             endpoint=self.get_product,
             name=f"{self.root_router.name}:{self.product.id}:{GET_PRODUCT}",
             methods=["GET"],
+            response_model=Product,
             summary="Retrieve this product",
             tags=["Products"],
         )
@@ -95,6 +209,7 @@ class ProductRouter(APIRouter):
             endpoint=self.get_product_constraints,
             name=f"{self.root_router.name}:{self.product.id}:{GET_CONSTRAINTS}",
             methods=["GET"],
+            response_model=JsonSchemaModel,
             summary="Get constraints for the product",
             tags=["Products"],
         )
@@ -104,6 +219,7 @@ class ProductRouter(APIRouter):
             endpoint=self.get_product_order_parameters,
             name=f"{self.root_router.name}:{self.product.id}:{GET_ORDER_PARAMETERS}",
             methods=["GET"],
+            response_model=JsonSchemaModel,
             summary="Get order parameters for the product",
             tags=["Products"],
         )
@@ -119,39 +235,43 @@ class ProductRouter(APIRouter):
             payload: OrderPayload,
             request: Request,
             response: Response,
-        ) -> Order:
+        ) -> Order | Response:
             return await self.create_order(payload, request, response)
 
-        _create_order.__annotations__["payload"] = OrderPayload[
-            self.product.order_parameters  # type: ignore
-        ]
+        _create_order.__annotations__["payload"] = self.order_payload_model
 
         self.add_api_route(
             path="/orders",
-            endpoint=_create_order,
+            endpoint=(
+                self.create_order_from_json
+                if self.root_router.raw_body_validation
+                else _create_order
+            ),
             name=f"{self.root_router.name}:{self.product.id}:{CREATE_ORDER}",
             methods=["POST"],
             response_class=GeoJSONResponse,
+            response_model=Order,
             status_code=status.HTTP_201_CREATED,
             summary="Create an order for the product",
             tags=["Products"],
+            route_class_override=self.body_route(lambda: self.order_payload_model),
         )
 
         if (
-            product.supports_opportunity_search
-            or root_router.supports_async_opportunity_search
+            self.product.supports_opportunity_search
+            or self.root_router.supports_async_opportunity_search
         ):
             self.add_api_route(
                 path="/opportunities",
-                endpoint=self.search_opportunities,
+                endpoint=(
+                    self.search_opportunities_from_json
+                    if self.root_router.raw_body_validation
+                    else self.search_opportunities
+                ),
                 name=f"{self.root_router.name}:{self.product.id}:{SEARCH_OPPORTUNITIES}",
                 methods=["POST"],
                 response_class=GeoJSONResponse,
-                # unknown why mypy can't see the constraints property on Product, ignoring
-                response_model=OpportunityCollection[
-                    Geometry,
-                    self.product.opportunity_properties,  # type: ignore
-                ],
+                response_model=self.opportunity_collection_model,
                 responses={
                     201: {
                         "model": OpportunitySearchRecord,
@@ -160,53 +280,88 @@ class ProductRouter(APIRouter):
                 },
                 summary="Search Opportunities for the product",
                 tags=["Products"],
+                route_class_override=self.body_route(lambda: OpportunityPayload),
             )
 
-        if root_router.supports_async_opportunity_search:
+        if self.root_router.supports_async_opportunity_search:
             self.add_api_route(
                 path="/opportunities/{opportunity_collection_id}",
                 endpoint=self.get_opportunity_collection,
                 name=f"{self.root_router.name}:{self.product.id}:{GET_OPPORTUNITY_COLLECTION}",
                 methods=["GET"],
                 response_class=GeoJSONResponse,
+                response_model=OpportunityCollection,
                 summary="Get an Opportunity Collection by ID",
                 tags=["Products"],
             )
 
-    def get_product(self, request: Request) -> Product:
+    def body_route(self, body: Callable[[], Any]) -> type[APIRoute]:
+        """
+        The route class of routes taking a request body, which limits its size to the
+        product's `max_bytes` and documents the request body FastAPI cannot derive
+        from the signature of routes validating the raw JSON body.
+        """
+        raw_body_validation = self.root_router.raw_body_validation
+        max_bytes = self.max_body_bytes
+        if max_bytes is None and not raw_body_validation:
+            return self.route_class
+        return body_route(
+            lambda request: max_bytes, body if raw_body_validation else None
+        )
+
+    @property
+    def max_body_bytes(self) -> int | None:
+        limits = self.product.geometry_limits
+        return None if limits is None else limits.max_bytes
+
+    def url_for(self, request: Request, name: str, **path_params: str) -> URL:
+        """
+        Build the URL for one of this product's routes by its route name constant.
+        """
+        if self.root_router.product_dispatch:
+            return self.root_router.url_for(
+                request,
+                f"{self.root_router.name}:{name}",
+                product_id=self.product.id,
+                **path_params,
+            )
+        return self.root_router.url_for(
+            request, f"{self.root_router.name}:{self.product.id}:{name}", **path_params
+        )
+
+    def get_product(self, request: Request) -> Response:
+        return self.root_router.document_cache.response(
+            request,
+            (self.product.id, GET_PRODUCT),
+            lambda: self.build_product(request),
+        )
+
+    def build_product(self, request: Request) -> Product:
         links = [
             Link(
                 href=str(
-                    request.url_for(
-                        f"{self.root_router.name}:{self.product.id}:{GET_PRODUCT}",
-                    ),
+                    self.url_for(request, GET_PRODUCT),
                 ),
                 rel="self",
                 type=TYPE_JSON,
             ),
             Link(
                 href=str(
-                    request.url_for(
-                        f"{self.root_router.name}:{self.product.id}:{GET_CONSTRAINTS}",
-                    ),
+                    self.url_for(request, GET_CONSTRAINTS),
                 ),
                 rel="constraints",
                 type=TYPE_JSON,
             ),
             Link(
                 href=str(
-                    request.url_for(
-                        f"{self.root_router.name}:{self.product.id}:{GET_ORDER_PARAMETERS}",
-                    ),
+                    self.url_for(request, GET_ORDER_PARAMETERS),
                 ),
                 rel="order-parameters",
                 type=TYPE_JSON,
             ),
             Link(
                 href=str(
-                    request.url_for(
-                        f"{self.root_router.name}:{self.product.id}:{CREATE_ORDER}",
-                    ),
+                    self.url_for(request, CREATE_ORDER),
                 ),
                 rel="create-order",
                 type=TYPE_JSON,
@@ -221,9 +376,7 @@ class ProductRouter(APIRouter):
             links.append(
                 Link(
                     href=str(
-                        request.url_for(
-                            f"{self.root_router.name}:{self.product.id}:{SEARCH_OPPORTUNITIES}",
-                        ),
+                        self.url_for(request, SEARCH_OPPORTUNITIES),
                     ),
                     rel="opportunities",
                     type=TYPE_JSON,
@@ -242,6 +395,10 @@ class ProductRouter(APIRouter):
         """
         Explore the opportunities available for a particular set of constraints
         """
+        search = await self.apply_geometry_limits(search)
+        if self.root_router.validate_constraints:
+            self.constraints_validator.validate(search.filter)
+
         # sync
         if not self.root_router.supports_async_opportunity_search or (
             prefer is Prefer.wait and self.product.supports_opportunity_search
@@ -263,20 +420,132 @@ class ProductRouter(APIRouter):
 
         raise AssertionError("Expected code to be unreachable")
 
+    async def search_opportunities_from_json(
+        self,
+        request: Request,
+        response: Response,
+        prefer: Prefer | None = Depends(get_prefer),
+    ) -> OpportunityCollection | Response:
+        """
+        Explore the opportunities available for a particular set of constraints
+        """
+        search = validate_json_body(OpportunityPayload, await request.body())
+        return await self.search_opportunities(search, request, response, prefer)
+
     async def search_opportunities_sync(
         self,
         search: OpportunityPayload,
         request: Request,
         response: Response,
         prefer: Prefer | None,
-    ) -> OpportunityCollection:
+    ) -> OpportunityCollection | Response:
+        if self.product.supports_opportunity_streaming:
+            return await self.stream_opportunities(search, request, response, prefer)
+
+        links: list[Link] = []
+        match await self.search_opportunities_cached(search, request):
+            case Success((features, maybe_pagination_token)):
+                links.append(self.order_link(request, search))
+                match maybe_pagination_token:
+                    case Some(x):
+                        links.append(self.pagination_link(request, search, x))
+                    case Maybe.empty:
+                        pass
+            case Failure(e):
+                raise search_error(e)
+            case x:
+                raise AssertionError(f"Expected code to be unreachable {x}")
+
+        if prefer is Prefer.wait and self.root_router.supports_async_opportunity_search:
+            response.headers["Preference-Applied"] = "wait"
+
+        return self.root_router.geojson_response(
+            build_model(
+                self.opportunity_collection_model,
+                self.trusted_backend,
+                features=features,
+                links=links,
+            ),
+            response,
+            trusted=self.trusted_backend,
+        )
+
+    async def search_opportunities_cached(
+        self, search: OpportunityPayload, request: Request
+    ) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+        """
+        Search the backend, or the search cache if the product's searches are cached.
+        """
+        cache, ttl = self.root_router.search_cache, self.product.search_cache_ttl
+        if cache is not None and ttl is not None:
+            key = search_cache_key(self.product.id, search, caller_key(request))
+            if (cached := await cache.get(key)) is not None:
+                self.search_cache_stats.hits += 1
+                features, next = self.search_page_adapter.validate_json(cached)
+                return Success((features, Maybe.from_optional(next)))
+            self.search_cache_stats.misses += 1
+
+        result = await self.search_backend(search, request)
+        match result:
+            case Success((features, maybe_next)) if cache is not None and ttl:
+                page = (features, maybe_next.value_or(None))
+                await cache.set(key, self.search_page_adapter.dump_json(page), ttl)
+        return result
+
+    async def search_backend(
+        self, search: OpportunityPayload, request: Request
+    ) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+        """
+        Search the backend, per grid cell and time bucket if the product's searches
+        are bucketed.
+        """
+        if self.bucketed_search is not None:
+            result = await self.bucketed_search.search(
+                search,
+                caller_key(request),
+                lambda cell_search: self.call_backend(
+                    request,
+                    self.product.search_opportunities(
+                        self, cell_search, None, cell_search.limit, request
+                    ),
+                    key=(SEARCH_OPPORTUNITIES, canonical(cell_search.body())),
+                ),
+            )
+            if result is not None:
+                return result
+
+        return await self.call_backend(
+            request,
+            self.product.search_opportunities(
+                self,
+                search,
+                search.next,
+                search.limit,
+                request,
+            ),
+            key=(SEARCH_OPPORTUNITIES, canonical(search.body())),
+        )
+
+    async def stream_opportunities(
+        self,
+        search: OpportunityPayload,
+        request: Request,
+        response: Response,
+        prefer: Prefer | None,
+    ) -> StreamingResponse:
+        """
+        Stream the opportunities to the client as the backend finds them.
+        """
         links: list[Link] = []
-        match await self.product.search_opportunities(
-            self,
-            search,
-            search.next,
-            search.limit,
+        match await self.stream_backend(
             request,
+            self.product.stream_opportunities(
+                self,
+                search,
+                search.next,
+                search.limit,
+                request,
+            ),
         ):
             case Success((features, maybe_pagination_token)):
                 links.append(self.order_link(request, search))
@@ -285,24 +554,20 @@ class ProductRouter(APIRouter):
                         links.append(self.pagination_link(request, search, x))
                     case Maybe.empty:
                         pass
-            case Failure(e) if isinstance(e, ConstraintsException):
-                raise e
             case Failure(e):
-                logger.error(
-                    "An error occurred while searching opportunities: %s",
-                    traceback.format_exception(e),
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Error searching opportunities",
-                )
+                raise search_error(e)
             case x:
                 raise AssertionError(f"Expected code to be unreachable {x}")
 
         if prefer is Prefer.wait and self.root_router.supports_async_opportunity_search:
             response.headers["Preference-Applied"] = "wait"
 
-        return OpportunityCollection(features=features, links=links)
+        return self.root_router.stream_features(
+            request,
+            OpportunityCollection.model_construct(features=[], links=links),
+            features,
+            response.headers,
+        )
 
     async def search_opportunities_async(
         self,
@@ -310,7 +575,10 @@ class ProductRouter(APIRouter):
         request: Request,
         prefer: Prefer | None,
     ) -> JSONResponse:
-        match await self.product.search_opportunities_async(self, search, request):
+        match await self.call_backend(
+            request,
+            self.product.search_opportunities_async(self, search, request),
+        ):
             case Success(search_record):
                 search_record.links.append(
                     self.root_router.opportunity_search_record_self_link(
@@ -344,34 +612,46 @@ class ProductRouter(APIRouter):
             case x:
                 raise AssertionError(f"Expected code to be unreachable: {x}")
 
-    def get_product_constraints(self) -> JsonSchemaModel:
+    def get_product_constraints(self, request: Request) -> Response:
         """
         Return supported constraints of a specific product
         """
-        return self.product.constraints
+        return json_schema_response(request, self.product.constraints)
 
-    def get_product_order_parameters(self) -> JsonSchemaModel:
+    def get_product_order_parameters(self, request: Request) -> Response:
         """
         Return supported constraints of a specific product
         """
-        return self.product.order_parameters
+        return json_schema_response(request, self.product.order_parameters)
 
     async def create_order(
         self, payload: OrderPayload, request: Request, response: Response
-    ) -> Order:
+    ) -> Order | Response:
         """
         Create a new order.
         """
-        match await self.product.create_order(
-            self,
-            payload,
+        payload = await self.apply_geometry_limits(payload)
+        if self.root_router.validate_constraints:
+            self.constraints_validator.validate(payload.filter)
+
+        match await self.call_backend(
             request,
+            self.product.create_order(
+                self,
+                payload,
+                request,
+            ),
         ):
             case Success(order):
                 order.links.extend(self.root_router.order_links(order, request))
                 location = str(self.root_router.generate_order_href(request, order.id))
                 response.headers["Location"] = location
-                return order
+                return self.root_router.geojson_response(
+                    order,
+                    response,
+                    status.HTTP_201_CREATED,
+                    trusted=self.trusted_backend,
+                )
             case Failure(e) if isinstance(e, ConstraintsException):
                 raise e
             case Failure(e):
@@ -386,12 +666,90 @@ class ProductRouter(APIRouter):
             case x:
                 raise AssertionError(f"Expected code to be unreachable {x}")
 
+    async def create_order_from_json(
+        self, request: Request, response: Response
+    ) -> Order | Response:
+        """
+        Create a new order.
+        """
+        payload = validate_json_body(self.order_payload_model, await request.body())
+        return await self.create_order(payload, request, response)
+
+    async def apply_geometry_limits[T: (OpportunityPayload, OrderPayload)](
+        self, payload: T
+    ) -> T:
+        """
+        Check the payload against the product's geometry limits, returning it with
+        the simplified geometry if the product simplifies geometries. Simplification
+        runs in the thread pool, off the event loop.
+        """
+        limits = self.product.geometry_limits
+        if limits is None:
+            return payload
+        try:
+            if limits.simplify_tolerance is None:
+                geometry = limits.apply(payload.geometry)
+            else:
+                geometry = await run_in_threadpool(limits.apply, payload.geometry)
+        except ValueError as e:
+            raise ConstraintsException(
+                [
+                    {
+                        "type": "geometry_too_complex",
+                        "loc": ["body", "geometry"],
+                        "msg": str(e),
+                    }
+                ]
+            ) from None
+        if geometry is payload.geometry:
+            return payload
+        return payload.model_copy(update={"geometry": geometry})
+
+    async def call_backend[T](
+        self,
+        request: Request,
+        call: Coroutine[Any, Any, T],
+        key: Hashable | None = None,
+    ) -> T:
+        """
+        Await a backend call within the product's concurrency limit and the deadline
+        of the request, taken from the product's deadlines or else the root router's.
+        Calls with a `key` are coalesced with identical concurrent calls for the
+        product when the root router coalesces requests.
+        """
+        deadlines = self.product.deadlines or self.root_router.deadlines
+        timeout = deadlines.get(operation(request)) if deadlines else None
+        return await with_deadline(
+            request,
+            timeout,
+            self.root_router.coalesced(
+                request,
+                call,
+                self.concurrency_limiter,
+                None if key is None else (self.product.id, key),
+            ),
+        )
+
+    async def stream_backend[T](
+        self,
+        request: Request,
+        call: Coroutine[Any, Any, ResultE[tuple[AsyncIterator[T], Maybe[str]]]],
+    ) -> ResultE[tuple[AsyncIterator[T], Maybe[str]]]:
+        """
+        Await a backend streaming call like `call_backend`, holding its slot of the
+        product's concurrency limit until the stream is exhausted or closed. The
+        iteration of the stream is cancelled at the deadline of the request.
+        """
+        deadlines = self.product.deadlines or self.root_router.deadlines
+        timeout = deadlines.get(operation(request)) if deadlines else None
+        return await with_stream_deadline(
+            request, timeout, limited_stream(self.concurrency_limiter, call)
+        )
+
     def order_link(self, request: Request, opp_req: OpportunityPayload):
         return Link(
             href=str(
-                request.url_for(
-                    f"{self.root_router.name}:{self.product.id}:{CREATE_ORDER}",
-                ),
+                self.url_for(request, CREATE_ORDER),
             ),
             rel="create-order",
             type=TYPE_JSON,
@@ -414,21 +772,25 @@ class ProductRouter(APIRouter):
 
     async def get_opportunity_collection(
         self, opportunity_collection_id: str, request: Request
-    ) -> OpportunityCollection:
+    ) -> OpportunityCollection | Response:
         """
         Fetch an opportunity collection generated by an asynchronous opportunity search.
         """
-        match await self.product.get_opportunity_collection(
-            self,
-            opportunity_collection_id,
+        match await self.call_backend(
             request,
+            self.product.get_opportunity_collection(
+                self,
+                opportunity_collection_id,
+                request,
+            ),
         ):
             case Success(Some(opportunity_collection)):
                 opportunity_collection.links.append(
                     Link(
                         href=str(
-                            request.url_for(
-                                f"{self.root_router.name}:{self.product.id}:{GET_OPPORTUNITY_COLLECTION}",
+                            self.url_for(
+                                request,
+                                GET_OPPORTUNITY_COLLECTION,
                                 opportunity_collection_id=opportunity_collection_id,
                             ),
                         ),
@@ -436,7 +798,9 @@ class ProductRouter(APIRouter):
                         type=TYPE_JSON,
                     ),
                 )
-                return opportunity_collection
+                return self.root_router.geojson_response(
+                    opportunity_collection, trusted=self.trusted_backend
+                )
             case Success(Maybe.empty):
                 raise NotFoundException("Opportunity Collection not found")
             case Failure(e):
@@ -1,25 +1,38 @@
+import asyncio
 import logging
 import traceback
+from collections.abc import AsyncIterator, Coroutine, Hashable, Mapping
+from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from fastapi.datastructures import URL
+from fastapi.responses import StreamingResponse
+from pydantic import AwareDatetime, BaseModel
 from returns.maybe import Maybe, Some
-from returns.result import Failure, Success
+from returns.result import Failure, ResultE, Success
 
 from stapi_fastapi.backends.root_backend import (
     GetOpportunitySearchRecord,
     GetOpportunitySearchRecords,
     GetOrder,
     GetOrders,
+    GetOrdersByIds,
     GetOrderStatuses,
+    GetOrderStatusesAfter,
+    GetOrderStatusesByIds,
+    GetOrderVersion,
+    StreamOrders,
 )
-from stapi_fastapi.constants import TYPE_GEOJSON, TYPE_JSON
+from stapi_fastapi.constants import TYPE_GEOJSON, TYPE_JSON, TYPE_NDJSON
 from stapi_fastapi.exceptions import NotFoundException
+from stapi_fastapi.models.concurrency_limit import ConcurrencyLimit
 from stapi_fastapi.models.conformance import (
     ASYNC_OPPORTUNITIES,
     CORE,
     Conformance,
 )
+from stapi_fastapi.models.deadlines import Deadlines
 from stapi_fastapi.models.opportunity import (
     OpportunitySearchRecord,
     OpportunitySearchRecords,
@@ -27,12 +40,36 @@ from stapi_fastapi.models.opportunity import (
 from stapi_fastapi.models.order import (
     Order,
     OrderCollection,
+    OrderIds,
     OrderStatuses,
+    OrderStatusesByIds,
+    OrderStatusesRequest,
 )
 from stapi_fastapi.models.product import Product, ProductsCollection
 from stapi_fastapi.models.root import RootResponse
 from stapi_fastapi.models.shared import Link
-from stapi_fastapi.responses import GeoJSONResponse
+from stapi_fastapi.responses import (
+    GeoJSONModelResponse,
+    GeoJSONResponse,
+    ModelJSONResponse,
+    feature_collection_chunks,
+    ndjson_chunks,
+)
+from stapi_fastapi.routers.concurrency_limiter import (
+    ConcurrencyLimiter,
+    gather_cancelling,
+    limited,
+    limited_stream,
+)
+from stapi_fastapi.routers.deadline import (
+    operation,
+    with_deadline,
+    with_stream_deadline,
+)
+from stapi_fastapi.routers.document_cache import DocumentCache
+from stapi_fastapi.routers.etag import check_not_modified
+from stapi_fastapi.routers.link_builder import LinkBuilder
+from stapi_fastapi.routers.product_dispatch_router import ProductDispatchRouter
 from stapi_fastapi.routers.product_router import ProductRouter
 from stapi_fastapi.routers.route_names import (
     CONFORMANCE,
@@ -41,12 +78,24 @@ from stapi_fastapi.routers.route_names import (
     LIST_OPPORTUNITY_SEARCH_RECORDS,
     LIST_ORDER_STATUSES,
     LIST_ORDERS,
+    LIST_ORDERS_STATUSES,
     LIST_PRODUCTS,
     ROOT,
+    SEARCH_ORDERS,
+    SEARCH_ORDERS_STATUSES,
 )
+from stapi_fastapi.routers.search_cache import SearchCache
+from stapi_fastapi.routers.single_flight import SingleFlight, caller_key
+from stapi_fastapi.routers.trusted import build_model
 
 logger = logging.getLogger(__name__)
 
+# the most orders that can be requested by id at once
+MAX_ORDER_IDS = 1000
+# the most `GetOrder` calls made concurrently when the backend cannot look up orders
+# by id in one call
+MAX_CONCURRENT_ORDER_LOOKUPS = 32
+
 
 class RootRouter(APIRouter):
     def __init__(
@@ -56,10 +105,24 @@ class RootRouter(APIRouter):
         get_order_statuses: GetOrderStatuses,
         get_opportunity_search_records: GetOpportunitySearchRecords | None = None,
         get_opportunity_search_record: GetOpportunitySearchRecord | None = None,
+        get_order_version: GetOrderVersion | None = None,
+        stream_orders: StreamOrders | None = None,
+        get_orders_by_ids: GetOrdersByIds | None = None,
+        get_order_statuses_by_ids: GetOrderStatusesByIds | None = None,
+        get_order_statuses_after: GetOrderStatusesAfter | None = None,
         conformances: list[str] = [CORE],
         name: str = "root",
         openapi_endpoint_name: str = "openapi",
         docs_endpoint_name: str = "swagger_ui_html",
+        product_dispatch: bool = False,
+        direct_serialization: bool = False,
+        trusted_backend: bool = False,
+        validate_constraints: bool = False,
+        raw_body_validation: bool = False,
+        concurrency_limit: ConcurrencyLimit | None = None,
+        deadlines: Deadlines | None = None,
+        coalesce_requests: bool = False,
+        search_cache: SearchCache | None = None,
         *args,
         **kwargs,
     ) -> None:
@@ -76,12 +139,30 @@ class RootRouter(APIRouter):
         self._get_orders = get_orders
         self._get_order = get_order
         self._get_order_statuses = get_order_statuses
+        self._get_order_version = get_order_version
+        self.__stream_orders = stream_orders
+        self.__get_orders_by_ids = get_orders_by_ids
+        self.__get_order_statuses_by_ids = get_order_statuses_by_ids
+        self.__get_order_statuses_after = get_order_statuses_after
         self.__get_opportunity_search_records = get_opportunity_search_records
         self.__get_opportunity_search_record = get_opportunity_search_record
         self.conformances = conformances
         self.name = name
         self.openapi_endpoint_name = openapi_endpoint_name
         self.docs_endpoint_name = docs_endpoint_name
+        self.product_dispatch = product_dispatch
+        self.direct_serialization = direct_serialization
+        self.trusted_backend = trusted_backend
+        self.validate_constraints = validate_constraints
+        self.raw_body_validation = raw_body_validation
+        self.concurrency_limiter = (
+            ConcurrencyLimiter(concurrency_limit) if concurrency_limit else None
+        )
+        self.deadlines = deadlines
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.search_cache = search_cache
+        self.link_builder = LinkBuilder()
+        self.document_cache = DocumentCache()
         self.product_ids: list[str] = []
 
         # A dict is used to track the product routers so we can ensure
@@ -95,6 +176,7 @@ class RootRouter(APIRouter):
             self.get_root,
             methods=["GET"],
             name=f"{self.name}:{ROOT}",
+            response_model=RootResponse,
             tags=["Root"],
         )
 
@@ -103,6 +185,7 @@ class RootRouter(APIRouter):
             self.get_conformance,
             methods=["GET"],
             name=f"{self.name}:{CONFORMANCE}",
+            response_model=Conformance,
             tags=["Conformance"],
         )
 
@@ -111,6 +194,7 @@ class RootRouter(APIRouter):
             self.get_products,
             methods=["GET"],
             name=f"{self.name}:{LIST_PRODUCTS}",
+            response_model=ProductsCollection,
             tags=["Products"],
         )
 
@@ -119,15 +203,52 @@ class RootRouter(APIRouter):
             self.get_orders,
             methods=["GET"],
             name=f"{self.name}:{LIST_ORDERS}",
+            response_model=OrderCollection,
             response_class=GeoJSONResponse,
+            responses=(
+                {200: {"content": {TYPE_NDJSON: {}}}} if stream_orders else None
+            ),
             tags=["Orders"],
         )
 
+        self.add_api_route(
+            "/orders/search",
+            self.search_orders,
+            methods=["POST"],
+            name=f"{self.name}:{SEARCH_ORDERS}",
+            response_model=OrderCollection,
+            response_class=GeoJSONResponse,
+            summary="Get orders by their IDs",
+            tags=["Orders"],
+        )
+
+        if get_order_statuses_by_ids:
+            self.add_api_route(
+                "/orders/statuses",
+                self.get_orders_statuses,
+                methods=["GET"],
+                name=f"{self.name}:{LIST_ORDERS_STATUSES}",
+                response_model=OrderStatusesByIds,
+                summary="Get the statuses of many orders",
+                tags=["Orders"],
+            )
+
+            self.add_api_route(
+                "/orders/statuses",
+                self.search_orders_statuses,
+                methods=["POST"],
+                name=f"{self.name}:{SEARCH_ORDERS_STATUSES}",
+                response_model=OrderStatusesByIds,
+                summary="Get the statuses of many orders",
+                tags=["Orders"],
+            )
+
         self.add_api_route(
             "/orders/{order_id}",
             self.get_order,
             methods=["GET"],
             name=f"{self.name}:{GET_ORDER}",
+            response_model=Order,
             response_class=GeoJSONResponse,
             tags=["Orders"],
         )
@@ -137,6 +258,7 @@ class RootRouter(APIRouter):
             self.get_order_statuses,
             methods=["GET"],
             name=f"{self.name}:{LIST_ORDER_STATUSES}",
+            response_model=OrderStatuses,
             tags=["Orders"],
         )
 
@@ -146,6 +268,7 @@ class RootRouter(APIRouter):
                 self.get_opportunity_search_records,
                 methods=["GET"],
                 name=f"{self.name}:{LIST_OPPORTUNITY_SEARCH_RECORDS}",
+                response_model=OpportunitySearchRecords,
                 summary="List all Opportunity Search Records",
                 tags=["Opportunities"],
             )
@@ -155,39 +278,52 @@ class RootRouter(APIRouter):
                 self.get_opportunity_search_record,
                 methods=["GET"],
                 name=f"{self.name}:{GET_OPPORTUNITY_SEARCH_RECORD}",
+                response_model=OpportunitySearchRecord,
                 summary="Get an Opportunity Search Record by ID",
                 tags=["Opportunities"],
             )
 
-    def get_root(self, request: Request) -> RootResponse:
+        # With product dispatch, all products share one set of parameterized routes
+        # and are looked up by id instead of each mounting its own `ProductRouter`.
+        if product_dispatch:
+            self.include_router(
+                ProductDispatchRouter(self), prefix="/products/{product_id}"
+            )
+
+    def get_root(self, request: Request) -> Response:
+        return self.document_cache.response(
+            request, ROOT, lambda: self.build_root(request)
+        )
+
+    def build_root(self, request: Request) -> RootResponse:
         links = [
             Link(
-                href=str(request.url_for(f"{self.name}:{ROOT}")),
+                href=str(self.url_for(request, f"{self.name}:{ROOT}")),
                 rel="self",
                 type=TYPE_JSON,
             ),
             Link(
-                href=str(request.url_for(self.openapi_endpoint_name)),
+                href=str(self.url_for(request, self.openapi_endpoint_name)),
                 rel="service-description",
                 type=TYPE_JSON,
             ),
             Link(
-                href=str(request.url_for(self.docs_endpoint_name)),
+                href=str(self.url_for(request, self.docs_endpoint_name)),
                 rel="service-docs",
                 type="text/html",
             ),
             Link(
-                href=str(request.url_for(f"{self.name}:{CONFORMANCE}")),
+                href=str(self.url_for(request, f"{self.name}:{CONFORMANCE}")),
                 rel="conformance",
                 type=TYPE_JSON,
             ),
             Link(
-                href=str(request.url_for(f"{self.name}:{LIST_PRODUCTS}")),
+                href=str(self.url_for(request, f"{self.name}:{LIST_PRODUCTS}")),
                 rel="products",
                 type=TYPE_JSON,
             ),
             Link(
-                href=str(request.url_for(f"{self.name}:{LIST_ORDERS}")),
+                href=str(self.url_for(request, f"{self.name}:{LIST_ORDERS}")),
                 rel="orders",
                 type=TYPE_GEOJSON,
             ),
@@ -197,8 +333,8 @@ class RootRouter(APIRouter):
             links.append(
                 Link(
                     href=str(
-                        request.url_for(
-                            f"{self.name}:{LIST_OPPORTUNITY_SEARCH_RECORDS}"
+                        self.url_for(
+                            request, f"{self.name}:{LIST_OPPORTUNITY_SEARCH_RECORDS}"
                         )
                     ),
                     rel="opportunity-search-records",
@@ -212,11 +348,26 @@ class RootRouter(APIRouter):
             links=links,
         )
 
-    def get_conformance(self) -> Conformance:
+    def get_conformance(self, request: Request) -> Response:
+        return self.document_cache.response(
+            request, CONFORMANCE, self.build_conformance
+        )
+
+    def build_conformance(self) -> Conformance:
         return Conformance(conforms_to=self.conformances)
 
     def get_products(
         self, request: Request, next: str | None = None, limit: int = 10
+    ) -> Response:
+        return self.document_cache.response(
+            request,
+            # the pagination link echoes the full request URL
+            (LIST_PRODUCTS, request.url.query),
+            lambda: self.build_products(request, next, limit),
+        )
+
+    def build_products(
+        self, request: Request, next: str | None = None, limit: int = 10
     ) -> ProductsCollection:
         start = 0
         limit = min(limit, 100)
@@ -232,7 +383,7 @@ class RootRouter(APIRouter):
         ids = self.product_ids[start:end]
         links = [
             Link(
-                href=str(request.url_for(f"{self.name}:{LIST_PRODUCTS}")),
+                href=str(self.url_for(request, f"{self.name}:{LIST_PRODUCTS}")),
                 rel="self",
                 type=TYPE_JSON,
             ),
@@ -241,17 +392,30 @@ class RootRouter(APIRouter):
             links.append(self.pagination_link(request, self.product_ids[end], limit))
         return ProductsCollection(
             products=[
-                self.product_routers[product_id].get_product(request)
+                self.product_routers[product_id].build_product(request)
                 for product_id in ids
             ],
             links=links,
         )
 
     async def get_orders(
-        self, request: Request, next: str | None = None, limit: int = 10
-    ) -> OrderCollection:
+        self,
+        request: Request,
+        next: str | None = None,
+        limit: int = 10,
+        ids: str | None = None,
+    ) -> OrderCollection | Response:
+        if ids is not None:
+            return await self.get_orders_by_ids(request, ids.split(","))
+        if self.supports_order_streaming:
+            return await self.stream_orders(request, next, limit)
+        return await self.get_orders_page(request, next, limit)
+
+    async def get_orders_page(
+        self, request: Request, next: str | None, limit: int
+    ) -> OrderCollection | Response:
         links: list[Link] = []
-        match await self._get_orders(next, limit, request):
+        match await self.call_backend(request, self._get_orders(next, limit, request)):
             case Success((orders, maybe_pagination_token)):
                 for order in orders:
                     order.links.extend(self.order_links(order, request))
@@ -273,16 +437,172 @@ class RootRouter(APIRouter):
                 )
             case _:
                 raise AssertionError("Expected code to be unreachable")
-        return OrderCollection(features=orders, links=links)
+        return self.geojson_response(
+            build_model(
+                OrderCollection, self.trusted_backend, features=orders, links=links
+            )
+        )
+
+    async def search_orders(
+        self, order_ids: OrderIds, request: Request
+    ) -> OrderCollection | Response:
+        """
+        Get the orders with the IDs in the request body, for lists of IDs too long for
+        the query string of `GET /orders?ids=...`.
+        """
+        return await self.get_orders_by_ids(request, order_ids.ids)
+
+    async def get_orders_by_ids(
+        self, request: Request, order_ids: list[str]
+    ) -> OrderCollection | Response:
+        """
+        Get the orders with `order_ids` in the requested order, leaving out those that
+        are not found.
+        """
+        order_ids = distinct_order_ids(order_ids)
+        if self.supports_orders_by_ids:
+            result = await self.call_backend(
+                request, self._get_orders_by_ids(order_ids, request)
+            )
+        else:
+            result = await self.get_orders_concurrently(order_ids, request)
+        match result:
+            case Success(found):
+                orders_by_id = {order.id: order for order in found}
+                orders = [orders_by_id[id] for id in order_ids if id in orders_by_id]
+                for order in orders:
+                    order.links.extend(self.order_links(order, request))
+            case Failure(e):
+                logger.error(
+                    "An error occurred while retrieving orders by id: %s",
+                    traceback.format_exception(e),
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Error finding Orders",
+                )
+            case _:
+                raise AssertionError("Expected code to be unreachable")
+        return self.geojson_response(
+            build_model(OrderCollection, self.trusted_backend, features=orders)
+        )
+
+    async def get_orders_concurrently(
+        self, order_ids: list[str], request: Request
+    ) -> ResultE[list[Order]]:
+        """
+        Look up the orders with `GetOrder`, a bounded number at a time. Each lookup is
+        a backend call of its own, within the concurrency limit and the deadline of
+        the request.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ORDER_LOOKUPS)
+
+        async def get_order(order_id: str) -> ResultE[Maybe[Order]]:
+            async with semaphore:
+                return await self.call_backend(
+                    request,
+                    self._get_order(order_id, request),
+                    key=(GET_ORDER, order_id),
+                )
+
+        orders: list[Order] = []
+        for result in await gather_cancelling(map(get_order, order_ids)):
+            match result:
+                case Success(Some(order)):
+                    orders.append(order)
+                case Success(Maybe.empty):
+                    pass
+                case Failure(e):
+                    return Failure(e)
+        return Success(orders)
+
+    async def stream_orders(
+        self, request: Request, next: str | None, limit: int
+    ) -> StreamingResponse:
+        """
+        Stream the orders from the backend, with the next page in a `Link` header.
+        """
+        links: list[Link] = []
+        match await self.stream_backend(
+            request, self._stream_orders(next, limit, request)
+        ):
+            case Success((orders, maybe_pagination_token)):
+                match maybe_pagination_token:
+                    case Some(x):
+                        links.append(self.pagination_link(request, x, limit))
+                    case Maybe.empty:
+                        pass
+            case Failure(ValueError()):
+                raise NotFoundException(detail="Error finding pagination token")
+            case Failure(e):
+                logger.error(
+                    "An error occurred while streaming orders: %s",
+                    traceback.format_exception(e),
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Error finding Orders",
+                )
+            case _:
+                raise AssertionError("Expected code to be unreachable")
+
+        return self.stream_features(
+            request,
+            OrderCollection.model_construct(features=[], links=links),
+            self.with_order_links(orders, request),
+            {"Link": ", ".join(f'<{link.href}>; rel="{link.rel}"' for link in links)}
+            if links
+            else None,
+        )
+
+    async def with_order_links(
+        self, orders: AsyncIterator[Order], request: Request
+    ) -> AsyncIterator[Order]:
+        async for order in orders:
+            order.links.extend(self.order_links(order, request))
+            yield order
+
+    def stream_features(
+        self,
+        request: Request,
+        collection: BaseModel,
+        features: AsyncIterator[BaseModel],
+        headers: Mapping[str, str] | None = None,
+    ) -> StreamingResponse:
+        """
+        Stream `features` into the empty feature collection `collection` as they are
+        yielded or, if the client accepts it, as newline delimited JSON.
+        """
+        features = log_stream_errors(features)
+        if TYPE_NDJSON in request.headers.get("accept", ""):
+            return StreamingResponse(
+                ndjson_chunks(features), media_type=TYPE_NDJSON, headers=headers
+            )
+        return StreamingResponse(
+            feature_collection_chunks(collection, features),
+            media_type=TYPE_GEOJSON,
+            headers=headers,
+        )
 
-    async def get_order(self, order_id: str, request: Request) -> Order:
+    async def get_order(
+        self, order_id: str, request: Request, response: Response
+    ) -> Order | Response:
         """
         Get details for order with `order_id`.
         """
-        match await self._get_order(order_id, request):
+        version = await self.get_order_version(order_id, request)
+        if unchanged := check_not_modified(request, response, version):
+            return unchanged
+
+        match await self.call_backend(
+            request, self._get_order(order_id, request), key=(GET_ORDER, order_id)
+        ):
             case Success(Some(order)):
+                version = version or order.properties.status.timestamp.isoformat()
+                if unchanged := check_not_modified(request, response, version):
+                    return unchanged
                 order.links.extend(self.order_links(order, request))
-                return order
+                return self.geojson_response(order, response)
             case Success(Maybe.empty):
                 raise NotFoundException("Order not found")
             case Failure(e):
@@ -299,6 +619,34 @@ class RootRouter(APIRouter):
                 raise AssertionError("Expected code to be unreachable")
 
     async def get_order_statuses(
+        self,
+        order_id: str,
+        request: Request,
+        response: Response,
+        next: str | None = None,
+        limit: int = 10,
+        since: AwareDatetime | None = None,
+        after: str | None = None,
+    ) -> OrderStatuses | Response:
+        if since is not None or after is not None:
+            return self.json_response(
+                await self.build_new_order_statuses(
+                    order_id, request, since, after, limit
+                ),
+                response,
+            )
+
+        version = await self.get_order_version(order_id, request)
+        if unchanged := check_not_modified(request, response, version):
+            return unchanged
+
+        order_statuses = await self.build_order_statuses(order_id, request, next, limit)
+        version = version or statuses_version(order_statuses)
+        if unchanged := check_not_modified(request, response, version):
+            return unchanged
+        return self.json_response(order_statuses, response)
+
+    async def build_order_statuses(
         self,
         order_id: str,
         request: Request,
@@ -306,7 +654,11 @@ class RootRouter(APIRouter):
         limit: int = 10,
     ) -> OrderStatuses:
         links: list[Link] = []
-        match await self._get_order_statuses(order_id, next, limit, request):
+        match await self.call_backend(
+            request,
+            self._get_order_statuses(order_id, next, limit, request),
+            key=(LIST_ORDER_STATUSES, order_id, next, limit),
+        ):
             case Success(Some((statuses, maybe_pagination_token))):
                 links.append(self.order_statuses_link(request, order_id))
                 match maybe_pagination_token:
@@ -329,20 +681,265 @@ class RootRouter(APIRouter):
                 )
             case _:
                 raise AssertionError("Expected code to be unreachable")
-        return OrderStatuses(statuses=statuses, links=links)
+        return build_model(
+            OrderStatuses, self.trusted_backend, statuses=statuses, links=links
+        )
+
+    async def build_new_order_statuses(
+        self,
+        order_id: str,
+        request: Request,
+        since: datetime | None,
+        after: str | None,
+        limit: int,
+    ) -> OrderStatuses:
+        """
+        The statuses of an order newer than `since` or following the `after` cursor,
+        with the cursor to poll for the next ones.
+        """
+        if not self.supports_order_statuses_after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="`since` and `after` are not supported",
+            )
+        if since is not None and after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At most one of `since` and `after` can be given",
+            )
+
+        match await self.call_backend(
+            request,
+            self._get_order_statuses_after(order_id, since, after, limit, request),
+        ):
+            case Success(Some((statuses, cursor))):
+                pass
+            case Success(Maybe.empty):
+                raise NotFoundException("Order not found")
+            case Failure(ValueError()):
+                raise NotFoundException("Error finding cursor")
+            case Failure(e):
+                logger.error(
+                    "An error occurred while retrieving order statuses: %s",
+                    traceback.format_exception(e),
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Error finding Order Statuses",
+                )
+            case _:
+                raise AssertionError("Expected code to be unreachable")
+        return build_model(
+            OrderStatuses,
+            self.trusted_backend,
+            statuses=statuses,
+            links=[self.order_statuses_link(request, order_id)],
+            after=cursor,
+        )
+
+    async def get_orders_statuses(
+        self, request: Request, ids: str, since: AwareDatetime | None = None
+    ) -> OrderStatusesByIds | Response:
+        """
+        Get the latest status of each order in `ids`, or all their statuses newer
+        than `since`.
+        """
+        return await self.get_statuses_by_ids(request, ids.split(","), since)
+
+    async def search_orders_statuses(
+        self, statuses_request: OrderStatusesRequest, request: Request
+    ) -> OrderStatusesByIds | Response:
+        """
+        Like `GET /orders/statuses`, for lists of IDs too long for a query string.
+        """
+        return await self.get_statuses_by_ids(
+            request, statuses_request.ids, statuses_request.since
+        )
+
+    async def get_statuses_by_ids(
+        self, request: Request, order_ids: list[str], since: datetime | None
+    ) -> OrderStatusesByIds | Response:
+        order_ids = distinct_order_ids(order_ids)
+        match await self.call_backend(
+            request,
+            self._get_order_statuses_by_ids(order_ids, since, request),
+        ):
+            case Success(found):
+                statuses = {id: found[id] for id in order_ids if id in found}
+            case Failure(e):
+                logger.error(
+                    "An error occurred while retrieving statuses of orders: %s",
+                    traceback.format_exception(e),
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Error finding Order Statuses",
+                )
+            case _:
+                raise AssertionError("Expected code to be unreachable")
+        timestamps = (s.timestamp for order in statuses.values() for s in order)
+        return self.json_response(
+            build_model(
+                OrderStatusesByIds,
+                self.trusted_backend,
+                statuses=statuses,
+                next_since=max(timestamps, default=since),
+            )
+        )
+
+    async def get_order_version(self, order_id: str, request: Request) -> str | None:
+        """
+        Get the version token of the order with `order_id` from the backend, or
+        `None` if the backend does not provide version tokens.
+        """
+        if self._get_order_version is None:
+            return None
+
+        match await self.call_backend(
+            request,
+            self._get_order_version(order_id, request),
+            key=("get-order-version", order_id),
+        ):
+            case Success(Some(version)):
+                return version
+            case Success(Maybe.empty):
+                raise NotFoundException("Order not found")
+            case Failure(e):
+                logger.error(
+                    "An error occurred while retrieving version of order '%s': %s",
+                    order_id,
+                    traceback.format_exception(e),
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Error finding Order",
+                )
+            case _:
+                raise AssertionError("Expected code to be unreachable")
 
     def add_product(self, product: Product, *args, **kwargs) -> None:
-        # Give the include a prefix from the product router
         product_router = ProductRouter(product, self, *args, **kwargs)
-        self.include_router(product_router, prefix=f"/products/{product.id}")
+        if not self.product_dispatch:
+            # Give the include a prefix from the product router
+            self.include_router(product_router, prefix=f"/products/{product.id}")
+        if product.id not in self.product_routers:
+            self.product_ids.append(product.id)
         self.product_routers[product.id] = product_router
-        self.product_ids = [*self.product_routers.keys()]
+        self.document_cache.clear()
+
+    def url_for(self, request: Request, name: str, **path_params: str) -> URL:
+        """
+        Build the URL for the route with `name`, looked up in the link builder's
+        index of route names.
+        """
+        return self.link_builder.url_for(request, name, **path_params)
+
+    def geojson_response[T: BaseModel](
+        self,
+        content: T,
+        response: Response | None = None,
+        status_code: int = status.HTTP_200_OK,
+        trusted: bool | None = None,
+    ) -> T | Response:
+        """
+        Return `content` for FastAPI to validate and serialize as the route's response
+        model or, with direct serialization or a trusted backend, render it straight
+        to a GeoJSON response without validating it again.
+
+        Headers set on the `response` parameter of the endpoint are carried over.
+        `trusted` overrides the `trusted_backend` setting of this router.
+        """
+        return self.model_response(
+            GeoJSONModelResponse, content, response, status_code, trusted
+        )
+
+    def json_response[T: BaseModel](
+        self,
+        content: T,
+        response: Response | None = None,
+        status_code: int = status.HTTP_200_OK,
+        trusted: bool | None = None,
+    ) -> T | Response:
+        """
+        Like `geojson_response`, for plain JSON documents.
+        """
+        return self.model_response(
+            ModelJSONResponse, content, response, status_code, trusted
+        )
+
+    def model_response[T: BaseModel](
+        self,
+        response_class: type[ModelJSONResponse],
+        content: T,
+        response: Response | None,
+        status_code: int,
+        trusted: bool | None,
+    ) -> T | Response:
+        if trusted is None:
+            trusted = self.trusted_backend
+        if not (self.direct_serialization or trusted):
+            return content
+        return response_class(
+            content,
+            status_code=status_code,
+            headers=response.headers if response else None,
+        )
+
+    async def call_backend[T](
+        self,
+        request: Request,
+        call: Coroutine[Any, Any, T],
+        key: Hashable | None = None,
+    ) -> T:
+        """
+        Await a backend call within the concurrency limit of the root backend and the
+        deadline of the request. Calls with a `key` are coalesced with identical
+        concurrent calls when requests are coalesced.
+        """
+        timeout = self.deadlines.get(operation(request)) if self.deadlines else None
+        return await with_deadline(
+            request,
+            timeout,
+            self.coalesced(request, call, self.concurrency_limiter, key),
+        )
+
+    async def stream_backend[T](
+        self,
+        request: Request,
+        call: Coroutine[Any, Any, ResultE[tuple[AsyncIterator[T], Maybe[str]]]],
+    ) -> ResultE[tuple[AsyncIterator[T], Maybe[str]]]:
+        """
+        Await a backend streaming call like `call_backend`, holding its slot of the
+        concurrency limit until the stream is exhausted or closed. The iteration of
+        the stream is cancelled at the deadline of the request.
+        """
+        timeout = self.deadlines.get(operation(request)) if self.deadlines else None
+        return await with_stream_deadline(
+            request, timeout, limited_stream(self.concurrency_limiter, call)
+        )
+
+    def coalesced[T](
+        self,
+        request: Request,
+        call: Coroutine[Any, Any, T],
+        limiter: ConcurrencyLimiter | None,
+        key: Hashable | None,
+    ) -> Coroutine[Any, Any, T]:
+        """
+        The backend call within the limits of `limiter`, sharing the result of an
+        identical call in flight on behalf of the same caller, if any.
+        """
+        if key is None or self.single_flight is None:
+            return limited(limiter, call)
+        return self.single_flight.run((key, caller_key(request)), call, limiter)
 
     def generate_order_href(self, request: Request, order_id: str) -> URL:
-        return request.url_for(f"{self.name}:{GET_ORDER}", order_id=order_id)
+        return self.url_for(request, f"{self.name}:{GET_ORDER}", order_id=order_id)
 
     def generate_order_statuses_href(self, request: Request, order_id: str) -> URL:
-        return request.url_for(f"{self.name}:{LIST_ORDER_STATUSES}", order_id=order_id)
+        return self.url_for(
+            request, f"{self.name}:{LIST_ORDER_STATUSES}", order_id=order_id
+        )
 
     def order_links(self, order: Order, request: Request) -> list[Link]:
         return [
@@ -361,7 +958,8 @@ class RootRouter(APIRouter):
     def order_statuses_link(self, request: Request, order_id: str):
         return Link(
             href=str(
-                request.url_for(
+                self.url_for(
+                    request,
                     f"{self.name}:{LIST_ORDER_STATUSES}",
                     order_id=order_id,
                 )
@@ -381,9 +979,12 @@ class RootRouter(APIRouter):
 
     async def get_opportunity_search_records(
         self, request: Request, next: str | None = None, limit: int = 10
-    ) -> OpportunitySearchRecords:
+    ) -> OpportunitySearchRecords | Response:
         links: list[Link] = []
-        match await self._get_opportunity_search_records(next, limit, request):
+        match await self.call_backend(
+            request,
+            self._get_opportunity_search_records(next, limit, request),
+        ):
             case Success((records, maybe_pagination_token)):
                 for record in records:
                     record.links.append(
@@ -407,20 +1008,34 @@ class RootRouter(APIRouter):
                 )
             case _:
                 raise AssertionError("Expected code to be unreachable")
-        return OpportunitySearchRecords(search_records=records, links=links)
+        return self.json_response(
+            build_model(
+                OpportunitySearchRecords,
+                self.trusted_backend,
+                search_records=records,
+                links=links,
+            )
+        )
 
     async def get_opportunity_search_record(
-        self, search_record_id: str, request: Request
-    ) -> OpportunitySearchRecord:
+        self, search_record_id: str, request: Request, response: Response
+    ) -> OpportunitySearchRecord | Response:
         """
         Get the Opportunity Search Record with `search_record_id`.
         """
-        match await self._get_opportunity_search_record(search_record_id, request):
+        match await self.call_backend(
+            request,
+            self._get_opportunity_search_record(search_record_id, request),
+        ):
             case Success(Some(search_record)):
+                if unchanged := check_not_modified(
+                    request, response, search_record.status.timestamp.isoformat()
+                ):
+                    return unchanged
                 search_record.links.append(
                     self.opportunity_search_record_self_link(search_record, request)
                 )
-                return search_record
+                return self.json_response(search_record, response)
             case Success(Maybe.empty):
                 raise NotFoundException("Opportunity Search Record not found")
             case Failure(e):
@@ -439,7 +1054,8 @@ class RootRouter(APIRouter):
     def generate_opportunity_search_record_href(
         self, request: Request, search_record_id: str
     ) -> URL:
-        return request.url_for(
+        return self.url_for(
+            request,
             f"{self.name}:{GET_OPPORTUNITY_SEARCH_RECORD}",
             search_record_id=search_record_id,
         )
@@ -473,6 +1089,46 @@ class RootRouter(APIRouter):
             )
         return self.__get_opportunity_search_record
 
+    @property
+    def _stream_orders(self) -> StreamOrders:
+        if not self.__stream_orders:
+            raise AttributeError("Root router does not support streaming orders")
+        return self.__stream_orders
+
+    @property
+    def _get_orders_by_ids(self) -> GetOrdersByIds:
+        if not self.__get_orders_by_ids:
+            raise AttributeError("Root router does not support getting orders by ids")
+        return self.__get_orders_by_ids
+
+    @property
+    def _get_order_statuses_by_ids(self) -> GetOrderStatusesByIds:
+        if not self.__get_order_statuses_by_ids:
+            raise AttributeError(
+                "Root router does not support getting order statuses by ids"
+            )
+        return self.__get_order_statuses_by_ids
+
+    @property
+    def _get_order_statuses_after(self) -> GetOrderStatusesAfter:
+        if not self.__get_order_statuses_after:
+            raise AttributeError(
+                "Root router does not support getting order statuses after a cursor"
+            )
+        return self.__get_order_statuses_after
+
+    @property
+    def supports_orders_by_ids(self) -> bool:
+        return self.__get_orders_by_ids is not None
+
+    @property
+    def supports_order_statuses_after(self) -> bool:
+        return self.__get_order_statuses_after is not None
+
+    @property
+    def supports_order_streaming(self) -> bool:
+        return self.__stream_orders is not None
+
     @property
     def supports_async_opportunity_search(self) -> bool:
         return (
@@ -480,3 +1136,49 @@ class RootRouter(APIRouter):
             and self._get_opportunity_search_records is not None
             and self._get_opportunity_search_record is not None
         )
+
+
+def distinct_order_ids(order_ids: list[str]) -> list[str]:
+    """
+    The distinct, non-empty order IDs requested at once, in their requested order.
+    """
+    order_ids = list(dict.fromkeys(id for id in map(str.strip, order_ids) if id))
+    if len(order_ids) > MAX_ORDER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ORDER_IDS} orders can be requested at once",
+        )
+    return order_ids
+
+
+def statuses_version(order_statuses: OrderStatuses) -> str:
+    """
+    Version of a page of order statuses, taken from its latest status timestamp.
+    """
+    latest = max((s.timestamp for s in order_statuses.statuses), default=None)
+    next_link = next(
+        (link for link in order_statuses.links if link.rel == "next"), None
+    )
+    return "|".join(
+        (
+            latest.isoformat() if latest else "",
+            str(len(order_statuses.statuses)),
+            str(next_link.href) if next_link else "",
+        )
+    )
+
+
+async def log_stream_errors[T](items: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Log exceptions raised while streaming a response. The response has already
+    started, so they can only abort it.
+    """
+    try:
+        async for item in items:
+            yield item
+    except Exception as e:
+        logger.error(
+            "An error occurred while streaming a response: %s",
+            traceback.format_exception(e),
+        )
+        raise
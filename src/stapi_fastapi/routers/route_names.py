@@ -17,6 +17,9 @@ GET_OPPORTUNITY_COLLECTION = "get-opportunity-collection"
 
 # Order
 LIST_ORDERS = "list-orders"
+SEARCH_ORDERS = "search-orders"
 GET_ORDER = "get-order"
 LIST_ORDER_STATUSES = "list-order-statuses"
+LIST_ORDERS_STATUSES = "list-orders-statuses"
+SEARCH_ORDERS_STATUSES = "search-orders-statuses"
 CREATE_ORDER = "create-order"
@@ -0,0 +1,275 @@
+import asyncio
+import math
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from hashlib import sha256
+from importlib.util import find_spec
+from typing import Any, NamedTuple
+
+from geojson_pydantic.geometries import Polygon
+from geojson_pydantic.types import Position2D
+from pydantic import TypeAdapter
+from pygeofilter import ast
+from returns.maybe import Maybe, Nothing, Some
+from returns.result import Failure, ResultE, Success
+
+from stapi_fastapi.exceptions import PaginationTokenException
+from stapi_fastapi.filters.predicate import TEMPORAL_RELATIONS, to_bbox, to_shape
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.search_buckets import SearchBuckets
+from stapi_fastapi.routers.concurrency_limiter import gather_cancelling
+from stapi_fastapi.routers.search_cache import SearchCache, SearchCacheStats
+from stapi_fastapi.types.filter import canonical
+
+type Page = tuple[list[Opportunity], Maybe[str]]
+
+# the pagination tokens of pages of combined results carry their offset
+TOKEN_PREFIX = "cells:"
+# cached for cells with more results than `cell_limit`
+OVERFLOW = b"overflow"
+
+TIME_OVERLAPS = TEMPORAL_RELATIONS[ast.TimeOverlaps]
+# results are matched to searches by their exact geometries, which requires shapely
+SHAPELY = find_spec("shapely") is not None
+
+
+class Cell(NamedTuple):
+    x: int
+    y: int
+    bucket: int
+
+
+class StopCells(Exception):
+    """
+    Stops the searches of the cells of a search, with the result of the one that
+    failed, or `None` if a cell has more results than `cell_limit`.
+    """
+
+    def __init__(self, result: Failure[Exception] | None) -> None:
+        self.result = result
+
+
+class BucketedSearch:
+    """
+    Answers opportunity searches from results cached per grid cell and time bucket,
+    searching the backend only for the cells and buckets not cached yet. See
+    `SearchBuckets`.
+    """
+
+    def __init__(
+        self,
+        product_id: str,
+        buckets: SearchBuckets,
+        cache: SearchCache,
+        page_adapter: TypeAdapter[tuple[list[Opportunity], str | None]],
+        stats: SearchCacheStats,
+    ) -> None:
+        self.product_id = product_id
+        self.buckets = buckets
+        self.cache = cache
+        self.page_adapter = page_adapter
+        self.stats = stats
+
+    async def search(
+        self,
+        search: OpportunityPayload,
+        caller: tuple[str | None, str | None],
+        search_cell: Callable[[OpportunityPayload], Awaitable[ResultE[Page]]],
+    ) -> ResultE[Page] | None:
+        """
+        The page of results of `search`, combined from its cells, with the backend
+        searched for uncached cells with `search_cell`. Returns `None` if the search
+        is to be passed to the backend as is.
+        """
+        result = await self.combined(search, caller, search_cell)
+        if result is None and page_offset(search.next):
+            # the pages of combined results cannot be continued by the backend
+            return Failure(
+                PaginationTokenException(f"Invalid pagination token {search.next!r}")
+            )
+        return result
+
+    async def combined(
+        self,
+        search: OpportunityPayload,
+        caller: tuple[str | None, str | None],
+        search_cell: Callable[[OpportunityPayload], Awaitable[ResultE[Page]]],
+    ) -> ResultE[Page] | None:
+        offset = page_offset(search.next)
+        cells = self.cells(search)
+        if not SHAPELY or offset is None or cells is None:
+            return None
+        keys = {cell: self.key(search, caller, cell) for cell in cells}
+
+        cached = await self.cached(keys)
+        if cached is None:
+            return None
+        found, missing = cached
+        try:
+            results = await gather_cancelling(
+                self.search_cell(search, cell, keys[cell], search_cell)
+                for cell in missing
+            )
+        except StopCells as e:
+            return e.result
+        found.update(zip(missing, results))
+
+        features = matching(search, [o for cell in cells for o in found[cell]])
+        end = offset + search.limit
+        next = Some(f"{TOKEN_PREFIX}{end}") if end < len(features) else Nothing
+        return Success((features[offset:end], next))
+
+    async def search_cell(
+        self,
+        search: OpportunityPayload,
+        cell: Cell,
+        key: str,
+        search_cell: Callable[[OpportunityPayload], Awaitable[ResultE[Page]]],
+    ) -> list[Opportunity]:
+        """
+        Search the backend for a cell and cache its results. Raises `StopCells` if
+        the search fails or the cell has more than `cell_limit` results.
+        """
+        match await search_cell(self.cell_search(search, cell)):
+            case Success((features, Maybe.empty)):
+                page = self.page_adapter.dump_json((features, None))
+                await self.cache.set(key, page, self.buckets.ttl)
+                return features
+            case Success(_):
+                # later searches covering the cell go straight to the backend
+                await self.cache.set(key, OVERFLOW, self.buckets.ttl)
+                raise StopCells(None)
+            case Failure(_) as failure:
+                raise StopCells(failure)
+            case x:
+                raise AssertionError(f"Expected code to be unreachable {x}")
+
+    async def cached(
+        self, keys: dict[Cell, str]
+    ) -> tuple[dict[Cell, list[Opportunity]], list[Cell]] | None:
+        """
+        The cached results of the cells, and the cells not cached. `None` if a cell
+        is known to have more than `cell_limit` results.
+        """
+        found: dict[Cell, list[Opportunity]] = {}
+        missing: list[Cell] = []
+        cached = await asyncio.gather(*(self.cache.get(key) for key in keys.values()))
+        for cell, value in zip(keys, cached):
+            if value is None:
+                missing.append(cell)
+            elif value == OVERFLOW:
+                return None
+            else:
+                found[cell] = self.page_adapter.validate_json(value)[0]
+        self.stats.cell_hits += len(keys) - len(missing)
+        self.stats.cell_misses += len(missing)
+        return found, missing
+
+    def cells(self, search: OpportunityPayload) -> list[Cell] | None:
+        """
+        The cells and buckets covering the search, or `None` if there are more than
+        `max_cells` or its geometry is empty.
+        """
+        size = self.buckets.cell_size
+        box = to_bbox(search.geometry)
+        if box is None:
+            return None
+        min_x, min_y, max_x, max_y = box
+        xs = cell_range(min_x, max_x, size)
+        ys = cell_range(min_y, max_y, size)
+        start, end = search.datetime
+        buckets = cell_range(
+            start.timestamp(), end.timestamp(), self.buckets.time_bucket
+        )
+        if len(xs) * len(ys) * len(buckets) > self.buckets.max_cells:
+            return None
+        return [Cell(x, y, bucket) for x in xs for y in ys for bucket in buckets]
+
+    def cell_search(self, search: OpportunityPayload, cell: Cell) -> OpportunityPayload:
+        size, time_bucket = self.buckets.cell_size, self.buckets.time_bucket
+        min_x = max(cell.x * size, -180.0)
+        max_x = min((cell.x + 1) * size, 180.0)
+        min_y = max(cell.y * size, -90.0)
+        max_y = min((cell.y + 1) * size, 90.0)
+        ring = [
+            Position2D(min_x, min_y),
+            Position2D(max_x, min_y),
+            Position2D(max_x, max_y),
+            Position2D(min_x, max_y),
+        ]
+        return search.model_copy(
+            update={
+                "geometry": Polygon(type="Polygon", coordinates=[[*ring, ring[0]]]),
+                "datetime": (
+                    datetime.fromtimestamp(cell.bucket * time_bucket, UTC),
+                    datetime.fromtimestamp((cell.bucket + 1) * time_bucket, UTC),
+                ),
+                "next": None,
+                "limit": self.buckets.cell_limit,
+            }
+        )
+
+    def key(
+        self,
+        search: OpportunityPayload,
+        caller: tuple[str | None, str | None],
+        cell: Cell,
+    ) -> str:
+        """
+        The cache key of a cell, which depends on the search's filter, the caller and
+        the layout of the cells.
+        """
+        value = canonical(
+            [
+                search.model_dump(mode="json", include={"filter"}),
+                caller,
+                self.buckets.cell_size,
+                self.buckets.time_bucket,
+                *cell,
+            ]
+        )
+        return f"{self.product_id}:cell:{sha256(value.encode()).hexdigest()}"
+
+
+def cell_range(minimum: float, maximum: float, size: float) -> range:
+    """
+    The indices of the cells of `size` covering `minimum` to `maximum`, which do not
+    include the cell starting at `maximum` if it lies on a boundary.
+    """
+    first = math.floor(minimum / size)
+    return range(first, max(first, math.ceil(maximum / size) - 1) + 1)
+
+
+def page_offset(next: str | None) -> int | None:
+    """
+    The offset of the page of combined results given by the pagination token `next`,
+    or `None` if it is not such a token.
+    """
+    if next is None:
+        return 0
+    offset = next.removeprefix(TOKEN_PREFIX)
+    if offset == next or not offset.isdecimal():
+        return None
+    return int(offset)
+
+
+def matching(search: OpportunityPayload, found: list[Opportunity]) -> list[Opportunity]:
+    """
+    The distinct opportunities overlapping the search's datetime and intersecting its
+    geometry, in the order they were found. Requires shapely.
+    """
+    import shapely
+
+    area = to_shape(search.geometry)
+    shapely.prepare(area)
+    distinct: dict[Any, Opportunity] = {}
+    for opportunity in found:
+        interval = getattr(opportunity.properties, "datetime", search.datetime)
+        if not TIME_OVERLAPS(interval, search.datetime):
+            continue
+        footprint = to_shape(opportunity.geometry)
+        if footprint is not None and not shapely.intersects(area, footprint):
+            continue
+        key = opportunity.id or opportunity.model_dump_json()
+        distinct.setdefault(key, opportunity)
+    return list(distinct.values())
@@ -0,0 +1,120 @@
+import time
+from collections import OrderedDict
+from functools import cache
+from hashlib import sha256
+from typing import NamedTuple, Protocol
+
+from geojson_pydantic.geometries import Geometry
+from pydantic import TypeAdapter
+
+from stapi_fastapi.models.opportunity import (
+    Opportunity,
+    OpportunityPayload,
+    OpportunityProperties,
+)
+from stapi_fastapi.types.filter import canonical
+
+
+class SearchCache(Protocol):
+    """
+    Storage for the serialized results of synchronous opportunity searches, which can
+    be backed by e.g. a shared cache service.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        The value stored for `key`, or `None` if there is none or it has expired.
+        """
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Store `value` for `key` for `ttl` seconds.
+        """
+        ...
+
+
+class MemorySearchCacheMetrics(NamedTuple):
+    entries: int
+    size: int
+    evictions: int
+
+
+class MemorySearchCache:
+    """
+    An in-process `SearchCache` holding at most `max_size` bytes of results. The
+    least recently used results are evicted first when it is full.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._evictions = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires <= time.monotonic():
+            self.remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.remove(key)
+        if len(value) > self.max_size:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._size += len(value)
+        while self._size > self.max_size:
+            self.remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def metrics(self) -> MemorySearchCacheMetrics:
+        return MemorySearchCacheMetrics(
+            entries=len(self._entries), size=self._size, evictions=self._evictions
+        )
+
+
+class SearchCacheStats:
+    """
+    Hits and misses of a product's searches in the search cache, and of the cells of
+    its bucketed searches.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.cell_hits = 0
+        self.cell_misses = 0
+
+
+def search_cache_key(
+    product_id: str, search: OpportunityPayload, caller: tuple[str | None, str | None]
+) -> str:
+    """
+    The cache key of a search: its product, its canonical search body, the page
+    requested and the caller, as backends may return different results to different
+    callers.
+    """
+    page = canonical([search.search_body(), search.next, search.limit, caller])
+    return f"{product_id}:{sha256(page.encode()).hexdigest()}"
+
+
+@cache
+def search_page_adapter(
+    properties: type[OpportunityProperties],
+) -> TypeAdapter[tuple[list[Opportunity], str | None]]:
+    """
+    The adapter of a page of search results as stored in the search cache, built on
+    first use and shared by all products with the same opportunity properties.
+    """
+    return TypeAdapter(tuple[list[Opportunity[Geometry, properties]], str | None])  # type: ignore
@@ -0,0 +1,101 @@
+import asyncio
+from collections.abc import Coroutine, Hashable
+from copy import deepcopy
+from typing import Any
+
+from fastapi import Request
+from returns.maybe import Some
+from returns.result import Success
+
+from stapi_fastapi.routers.concurrency_limiter import ConcurrencyLimiter, limited
+
+
+class Flight:
+    def __init__(self) -> None:
+        self.task: asyncio.Task[Any]
+        self.followers = 0
+        self.waiters = 0
+        self.copies: list[Any] = []
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical backend calls: callers arriving while a call with
+    the same key is in flight await its result instead of calling the backend again.
+
+    Routers add links to the models returned by the backend, so each caller but the
+    first receives its own deep copy of the result. The backend call is cancelled
+    once every caller awaiting it has been cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, Flight] = {}
+
+    async def run[T](
+        self,
+        key: Hashable,
+        call: Coroutine[Any, Any, T],
+        limiter: ConcurrencyLimiter | None = None,
+    ) -> T:
+        """
+        Await the backend `call` within the limits of `limiter`, or the call in
+        flight for `key`, in which case `call` is closed without running.
+        """
+        flight = self._flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = self._flights[key] = Flight()
+            flight.task = asyncio.create_task(
+                self.fly(key, flight, limited(limiter, call))
+            )
+        else:
+            call.close()
+            flight.followers += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self.land(key, flight)
+                flight.task.cancel()
+            raise
+        return result if leader else flight.copies.pop()
+
+    async def fly[T](
+        self, key: Hashable, flight: Flight, call: Coroutine[Any, Any, T]
+    ) -> T:
+        try:
+            result = await call
+        finally:
+            # no caller can join between landing and copying the result
+            self.land(key, flight)
+        flight.copies = [copy_result(result) for _ in range(flight.followers)]
+        return result
+
+    def land(self, key: Hashable, flight: Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+def copy_result(value: Any) -> Any:
+    """
+    A deep copy of a backend result. `returns` containers are immutable and copy to
+    themselves, so the values they wrap are copied instead.
+    """
+    match value:
+        case Success(inner):
+            return Success(copy_result(inner))
+        case Some(inner):
+            return Some(copy_result(inner))
+        case _:
+            return deepcopy(value)
+
+
+def caller_key(request: Request) -> tuple[str | None, str | None]:
+    """
+    The credentials of the caller, so that only calls made on behalf of the same
+    caller are coalesced.
+    """
+    return request.headers.get("Authorization"), request.headers.get("Cookie")
@@ -0,0 +1,15 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def build_model[T: BaseModel](model: type[T], trusted: bool, /, **fields: Any) -> T:
+    """
+    Build `model` from `fields`.
+
+    With a trusted backend the fields are already validated models, so the model is
+    constructed without validating them again.
+    """
+    if trusted:
+        return model.model_construct(**fields)
+    return model(**fields)
@@ -1,40 +1,65 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Annotated, Any, Callable
 
 from pydantic import (
-    AfterValidator,
     AwareDatetime,
-    BeforeValidator,
+    ValidatorFunctionWrapHandler,
     WithJsonSchema,
     WrapSerializer,
+    WrapValidator,
 )
 
+# bounds of open-ended intervals, written as `..` or left empty
+OPEN_START = datetime.min.replace(tzinfo=UTC)
+OPEN_END = datetime.max.replace(tzinfo=UTC)
+OPEN = ("..", "")
 
-def validate_before(value: Any) -> tuple[datetime, datetime]:
-    if isinstance(value, str):
-        start, end = value.split("/", 1)
-        return (datetime.fromisoformat(start), datetime.fromisoformat(end))
-    return value
+type Interval = tuple[datetime, datetime]
 
 
-def validate_after(value: tuple[datetime, datetime]):
+def validate(value: Any, handler: ValidatorFunctionWrapHandler) -> Interval:
+    """
+    Parse interval strings with `datetime.fromisoformat`, which handles the common
+    RFC 3339 forms, and return them without validating the parsed datetimes again.
+    Other strings and values are validated by pydantic.
+    """
+    if isinstance(value, str):
+        start, separator, end = value.partition("/")
+        if not separator:
+            raise ValueError("expected an interval of two datetimes separated by '/'")
+        value = (parse_bound(start, OPEN_START), parse_bound(end, OPEN_END))
+        if not all(isinstance(bound, datetime) and bound.tzinfo for bound in value):
+            value = handler(value)
+    else:
+        value = handler(value)
     if value[1] < value[0]:
         raise ValueError("end before start")
     return value
 
 
+def parse_bound(value: str, open: datetime) -> datetime | str:
+    if value in OPEN:
+        return open
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # left to pydantic, which accepts more forms or reports the error
+        return value
+
+
 def serialize(
-    value: tuple[datetime, datetime],
-    serializer: Callable[[tuple[datetime, datetime]], tuple[str, str]],
+    value: Interval,
+    serializer: Callable[[Interval], tuple[str, str]],
 ) -> str:
     del serializer  # unused
-    return f"{value[0].isoformat()}/{value[1].isoformat()}"
+    start = ".." if value[0] == OPEN_START else value[0].isoformat()
+    end = ".." if value[1] == OPEN_END else value[1].isoformat()
+    return f"{start}/{end}"
 
 
 type DatetimeInterval = Annotated[
     tuple[AwareDatetime, AwareDatetime],
-    BeforeValidator(validate_before),
-    AfterValidator(validate_after),
+    WrapValidator(validate),
     WrapSerializer(serialize, return_type=str),
     WithJsonSchema({"type": "string"}, mode="serialization"),
 ]
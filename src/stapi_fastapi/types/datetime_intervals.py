@@ -0,0 +1,157 @@
+"""
+Bulk parsing of datetime intervals into NumPy arrays. Requires numpy.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import TypeAdapter
+
+from stapi_fastapi.types.datetime_interval import (
+    OPEN_END,
+    OPEN_START,
+    DatetimeInterval,
+)
+
+type Codes = npt.NDArray[np.uint8]
+type Datetimes = npt.NDArray[np.datetime64]
+type Mask = npt.NDArray[np.bool_]
+
+# width of `YYYY-MM-DDTHH:MM:SS.ffffff`, the longest local time parsed in bulk
+WIDTH = 26
+DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+SEPARATORS = {4: "-", 7: "-", 13: ":", 16: ":"}
+DATE_TIME_SEPARATORS = [ord(c) for c in "Tt _"]
+MICROSECONDS = 10 ** np.arange(5, -1, -1)
+
+datetime_interval_adapter: TypeAdapter[tuple[datetime, datetime]] = TypeAdapter(
+    DatetimeInterval
+)
+
+
+def parse_intervals(values: Sequence[str]) -> tuple[Datetimes, Datetimes]:
+    """
+    Parse datetime interval strings, as accepted by `DatetimeInterval`, into UTC
+    `datetime64[us]` arrays of their starts and ends. Open ends become the minimum and
+    maximum datetimes.
+
+    RFC 3339 datetimes with `Z` or numeric UTC offsets are parsed with vectorized
+    operations on a matrix of the strings' code points. Intervals in other forms are
+    validated one by one.
+    """
+    if len(values) == 0:
+        return np.empty(0, "datetime64[us]"), np.empty(0, "datetime64[us]")
+    intervals = np.asarray(values, dtype=np.str_)
+    # code points beyond ASCII become 255, which no datetime contains
+    codes = np.minimum(
+        intervals.view(np.uint32).reshape(len(intervals), -1), 255
+    ).astype(np.uint8)
+    slash = np.argmax(codes == ord("/"), axis=1)
+
+    start = np.empty(len(codes), dtype="datetime64[us]")
+    end = np.empty(len(codes), dtype="datetime64[us]")
+    valid = codes[np.arange(len(codes)), slash] == ord("/")
+    # intervals from one source are mostly formatted alike, so grouping them by the
+    # position of the slash leaves few groups whose bounds are plain slices
+    for position in np.unique(slash[valid]):
+        rows = np.flatnonzero(valid & (slash == position))
+        group = codes[rows]
+        start[rows], valid_start = parse_datetimes(group[:, :position], OPEN_START)
+        end[rows], valid_end = parse_datetimes(group[:, position + 1 :], OPEN_END)
+        valid[rows] = valid_start & valid_end
+
+    for row in np.flatnonzero(~valid):
+        start[row], end[row] = (
+            to_datetime64(value)
+            for value in datetime_interval_adapter.validate_python(values[int(row)])
+        )
+    if np.any(end < start):
+        raise ValueError("end before start")
+    return start, end
+
+
+def parse_datetimes(codes: Codes, open: datetime) -> tuple[Datetimes, Mask]:
+    """
+    Parse RFC 3339 datetimes given as rows of code points, padded with zeros, into
+    UTC `datetime64[us]`. Open bounds, `..` or empty, become `open`. Also returns the
+    mask of the rows that could be parsed.
+    """
+    if codes.shape[1] < WIDTH:
+        codes = np.pad(codes, ((0, 0), (0, WIDTH - codes.shape[1])))
+    lengths = np.count_nonzero(codes, axis=1)
+    is_open = (lengths == 0) | (
+        (lengths == 2) & (codes[:, 0] == ord(".")) & (codes[:, 1] == ord("."))
+    )
+
+    # the last six code points of each row, from the end, and the UTC offset
+    tail = codes[
+        np.arange(len(codes))[:, None],
+        np.maximum(lengths[:, None] - np.arange(1, 7), 0),
+    ]
+    is_utc = np.isin(tail[:, 0], [ord("Z"), ord("z")])
+    has_offset = (
+        np.isin(tail[:, 5], [ord("+"), ord("-")])
+        & (tail[:, 2] == ord(":"))
+        & np.all(tail[:, [0, 1, 3, 4]] - ord("0") <= 9, axis=1)
+    )
+    offset = number(tail, 4, 3) * 60 + number(tail, 1, 0)
+    offset = np.where(tail[:, 5] == ord("-"), -offset, offset)
+    offset = np.where(has_offset, offset, 0)
+    local_length = np.select([has_offset, is_utc], [lengths - 6, lengths - 1], 0)
+
+    # `YYYY-MM-DDTHH:MM:SS` with an optional fraction, checked column by column
+    codes = codes[:, :WIDTH]
+    is_digit = codes - ord("0") <= 9
+    columns = np.arange(WIDTH)
+    fraction = (columns >= 20) & (columns < local_length[:, None])
+    valid = (
+        (is_utc | has_offset)
+        & np.all(is_digit[:, DIGITS], axis=1)
+        & np.all([codes[:, i] == ord(c) for i, c in SEPARATORS.items()], axis=0)
+        & np.isin(codes[:, 10], DATE_TIME_SEPARATORS)
+        & ((local_length == 19) | ((local_length > 20) & (codes[:, 19] == ord("."))))
+        & ~np.any(fraction & ~is_digit, axis=1)
+        & (np.abs(offset) < 24 * 60)
+    )
+
+    year = number(codes, 0, 1, 2, 3)
+    month, day = number(codes, 5, 6), number(codes, 8, 9)
+    hour, minute, second = (
+        number(codes, 11, 12),
+        number(codes, 14, 15),
+        number(codes, 17, 18),
+    )
+    valid &= (month >= 1) & (month <= 12) & (day >= 1)
+    valid &= (hour < 24) & (minute < 60) & (second < 60)
+
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + np.where(valid, day - 1, 0)
+    valid &= days.astype("datetime64[M]") == months
+
+    microseconds = (
+        np.where(fraction[:, 20:], codes[:, 20:] - ord("0"), 0).astype(np.int64)
+        @ MICROSECONDS
+    )
+    parsed = (
+        days.astype("datetime64[us]")
+        + ((hour * 60 + minute - offset) * 60 + second) * 1_000_000
+        + microseconds
+    )
+    parsed[is_open] = np.datetime64(open.replace(tzinfo=None), "us")
+    return parsed, valid | is_open
+
+
+def number(codes: Codes, *columns: int) -> npt.NDArray[np.int64]:
+    """
+    The decimal numbers formed by the digits in `columns` of each row.
+    """
+    value = np.zeros(len(codes), dtype=np.int64)
+    for column in columns:
+        value = value * 10 + codes[:, column] - ord("0")
+    return value
+
+
+def to_datetime64(value: datetime) -> np.datetime64:
+    return np.datetime64(value.astimezone(UTC).replace(tzinfo=None), "us")
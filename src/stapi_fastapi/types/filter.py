@@ -1,19 +1,58 @@
-from typing import Annotated, Any
+import json
+from functools import lru_cache
+from typing import Any, Self
 
-from pydantic import BeforeValidator
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import CoreSchema, core_schema
+from pygeofilter.ast import AstType
 from pygeofilter.parsers import cql2_json
 
 
-def validate(v: dict[str, Any]) -> dict[str, Any]:
-    if v:
-        try:
-            cql2_json.parse({"filter": v})
-        except Exception as e:
-            raise ValueError("Filter is not valid cql2-json") from e
-    return v
+class CQL2FilterDict(dict[str, Any]):
+    """
+    A validated cql2-json filter, carrying the AST parsed from it by pygeofilter in
+    `ast` so backends do not need to parse it again.
 
+    The AST is shared between all equal filters and must not be modified.
+    """
 
-type CQL2Filter = Annotated[
-    dict,
-    BeforeValidator(validate),
-]
+    ast: AstType | None
+
+    @classmethod
+    def parse(cls, v: dict[str, Any]) -> Self:
+        parsed = cls(v)
+        parsed.ast = None
+        if v:
+            try:
+                parsed.ast = parse(canonical(v))
+            except Exception as e:
+                raise ValueError("Filter is not valid cql2-json") from e
+        return parsed
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        return core_schema.no_info_after_validator_function(
+            cls.parse, handler.generate_schema(dict[str, Any])
+        )
+
+
+def canonical(value: Any) -> str:
+    """
+    The canonical JSON of a filter or other JSON value, with sorted keys so it is
+    identical for all equal values regardless of the order of their properties.
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+@lru_cache(maxsize=1024)
+def parse(canonical: str) -> AstType:
+    """
+    Parse the canonical JSON of a cql2-json filter, caching the ASTs of the most
+    recently used filters.
+    """
+    return cql2_json.parse({"filter": json.loads(canonical)})
+
+
+type CQL2Filter = CQL2FilterDict
@@ -1,4 +1,7 @@
+from hashlib import blake2b
+from threading import Lock
 from typing import Annotated, Any
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
 from pydantic import (
     BaseModel,
@@ -6,6 +9,68 @@ from pydantic import (
     PlainValidator,
     WithJsonSchema,
 )
+from pydantic_core import to_json
+
+
+class RegisteredSchema:
+    __slots__ = ("id", "schema", "json", "__weakref__")
+
+    def __init__(self, id: str, schema: dict[str, Any], json: bytes) -> None:
+        self.id = id
+        self.schema = schema
+        self.json = json
+
+
+class SchemaRegistry:
+    """
+    Process-wide registry of the JSON schemas of `JsonSchemaModel` classes.
+
+    The schema of every model is generated and serialized once. Models with identical
+    schemas, e.g. the same constraints shared by many products, share one registered
+    schema whose `id` is derived from its content, so it can be referenced instead of
+    being repeated.
+
+    Registered schemas are shared and must not be modified. They are held by the
+    models they belong to, and dropped with the last of them.
+    """
+
+    def __init__(self) -> None:
+        self._models: WeakKeyDictionary[type[BaseModel], RegisteredSchema] = (
+            WeakKeyDictionary()
+        )
+        self._schemas: WeakValueDictionary[str, RegisteredSchema] = (
+            WeakValueDictionary()
+        )
+        self._lock = Lock()
+
+    def get(self, model: type[BaseModel]) -> RegisteredSchema:
+        registered = self._models.get(model)
+        if registered is None:
+            registered = self.register(model)
+        return registered
+
+    def register(self, model: type[BaseModel]) -> RegisteredSchema:
+        schema = model.model_json_schema()
+        json = to_json(schema)
+        id = blake2b(json, digest_size=16).hexdigest()
+        with self._lock:
+            registered = self._schemas.setdefault(
+                id, RegisteredSchema(id=id, schema=schema, json=json)
+            )
+            self._models[model] = registered
+        return registered
+
+    def schema(self, model: type[BaseModel]) -> dict[str, Any]:
+        return self.get(model).schema
+
+    def json(self, model: type[BaseModel]) -> bytes:
+        return self.get(model).json
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+
+schema_registry = SchemaRegistry()
 
 
 def validate(v: Any) -> Any:
@@ -15,7 +80,7 @@ def validate(v: Any) -> Any:
 
 
 def serialize(v: type[BaseModel]) -> dict[str, Any]:
-    return v.model_json_schema()
+    return schema_registry.schema(v)
 
 
 type JsonSchemaModel = Annotated[
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from uuid import uuid4
 
@@ -50,6 +51,32 @@ async def mock_get_orders(
         return Failure(e)
 
 
+async def mock_stream_orders(
+    next: str | None, limit: int, request: Request
+) -> ResultE[tuple[AsyncIterator[Order], Maybe[str]]]:
+    """
+    Stream orders from backend.  Handle pagination/limit if applicable
+    """
+    try:
+        start = 0
+        order_ids = [*request.state._orders_db._orders.keys()]
+
+        if next:
+            start = order_ids.index(next)
+        end = start + limit
+        orders_db = request.state._orders_db
+
+        async def orders() -> AsyncIterator[Order]:
+            for order_id in order_ids[start:end]:
+                yield orders_db.get_order(order_id)
+
+        if end > 0 and end < len(order_ids):
+            return Success((orders(), Some(orders_db._orders[order_ids[end]].id)))
+        return Success((orders(), Nothing))
+    except Exception as e:
+        return Failure(e)
+
+
 async def mock_get_order(order_id: str, request: Request) -> ResultE[Maybe[Order]]:
     """
     Show details for order with `order_id`.
@@ -62,6 +89,56 @@ async def mock_get_order(order_id: str, request: Request) -> ResultE[Maybe[Order
         return Failure(e)
 
 
+async def mock_get_orders_by_ids(
+    order_ids: list[str], request: Request
+) -> ResultE[list[Order]]:
+    try:
+        orders = (request.state._orders_db.get_order(id) for id in order_ids)
+        return Success([order for order in orders if order is not None])
+    except Exception as e:
+        return Failure(e)
+
+
+async def mock_get_order_statuses_after(
+    order_id: str,
+    since: datetime | None,
+    after: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[Maybe[tuple[list[OrderStatus], str]]]:
+    try:
+        statuses = request.state._orders_db.get_order_statuses(order_id)
+        if statuses is None:
+            return Success(Nothing)
+        # the cursor is the number of statuses already seen
+        if after is not None:
+            start = int(after)
+        else:
+            start = sum(1 for s in statuses if since and s.timestamp <= since)
+        new = statuses[start : start + limit]
+        return Success(Some((new, str(start + len(new)))))
+    except Exception as e:
+        return Failure(e)
+
+
+async def mock_get_order_statuses_by_ids(
+    order_ids: list[str], since: datetime | None, request: Request
+) -> ResultE[dict[str, list[OrderStatus]]]:
+    try:
+        found = {}
+        for id in order_ids:
+            statuses = request.state._orders_db.get_order_statuses(id)
+            if statuses is None:
+                continue
+            if since is None:
+                found[id] = statuses[-1:]
+            else:
+                found[id] = [s for s in statuses if s.timestamp > since]
+        return Success(found)
+    except Exception as e:
+        return Failure(e)
+
+
 async def mock_get_order_statuses(
     order_id: str, next: str | None, limit: int, request: Request
 ) -> ResultE[Maybe[tuple[list[OrderStatus], Maybe[str]]]]:
@@ -84,6 +161,18 @@ async def mock_get_order_statuses(
         return Failure(e)
 
 
+async def mock_get_order_version(
+    order_id: str, request: Request
+) -> ResultE[Maybe[str]]:
+    try:
+        statuses = request.state._orders_db.get_order_statuses(order_id)
+        if not statuses:
+            return Success(Nothing)
+        return Success(Some(statuses[-1].timestamp.isoformat()))
+    except Exception as e:
+        return Failure(e)
+
+
 async def mock_create_order(
     product_router: ProductRouter, payload: OrderPayload, request: Request
 ) -> ResultE[Order]:
@@ -137,7 +226,7 @@ async def mock_search_opportunities(
             start = int(next)
         end = start + limit
         opportunities = [
-            o.model_copy(update=search.model_dump())
+            o.model_copy(update={"geometry": search.geometry})
             for o in request.state._opportunities[start:end]
         ]
         if end > 0 and end < len(request.state._opportunities):
@@ -147,6 +236,32 @@ async def mock_search_opportunities(
         return Failure(e)
 
 
+async def mock_stream_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[AsyncIterator[Opportunity], Maybe[str]]]:
+    try:
+        start = 0
+        limit = min(limit, 100)
+        if next:
+            start = int(next)
+        end = start + limit
+        found = request.state._opportunities[start:end]
+
+        async def opportunities() -> AsyncIterator[Opportunity]:
+            for o in found:
+                yield o.model_copy(update={"geometry": search.geometry})
+
+        if end > 0 and end < len(request.state._opportunities):
+            return Success((opportunities(), Some(str(end))))
+        return Success((opportunities(), Nothing))
+    except Exception as e:
+        return Failure(e)
+
+
 async def mock_search_opportunities_async(
     product_router: ProductRouter,
     search: OpportunityPayload,
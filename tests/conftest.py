@@ -29,6 +29,7 @@ from .shared import (
     InMemoryOrderDB,
     create_mock_opportunity,
     find_link,
+    make_root_router,
     product_test_satellite_provider_sync_opportunity,
     product_test_spotlight_sync_opportunity,
 )
@@ -124,6 +125,45 @@ def stapi_client_async_opportunity(
         yield client
 
 
+@pytest.fixture
+def make_stapi_client(
+    base_url: str, mock_opportunities: list[Opportunity]
+) -> Callable[..., TestClient]:
+    """
+    Factory of test clients for the root router made by `make_root_router` with the
+    given arguments, or for a prebuilt `root_router`. `state` is added to the lifespan
+    state.
+    """
+
+    def make_stapi_client(
+        *products: Product,
+        root_router: RootRouter | None = None,
+        state: dict[str, Any] | None = None,
+        **options: Any,
+    ) -> TestClient:
+        @asynccontextmanager
+        async def lifespan(app: FastAPI) -> AsyncIterator[dict[str, Any]]:
+            yield {
+                "_orders_db": InMemoryOrderDB(),
+                "_opportunities": mock_opportunities,
+                **(state or {}),
+            }
+
+        app = FastAPI(lifespan=lifespan)
+        app.include_router(root_router or make_root_router(*products, **options))
+        return TestClient(app, base_url=base_url)
+
+    return make_stapi_client
+
+
+@pytest.fixture
+def stapi_client_product_dispatch(
+    mock_products: list[Product], make_stapi_client: Callable[..., TestClient]
+) -> Generator[TestClient, None, None]:
+    with make_stapi_client(*mock_products, product_dispatch=True) as client:
+        yield client
+
+
 @pytest.fixture(scope="session")
 def url_for(base_url: str) -> Iterator[Callable[[str], str]]:
     def with_trailing_slash(value: str) -> str:
@@ -13,6 +13,7 @@ from httpx import Response
 from pydantic import BaseModel, Field, model_validator
 from pytest import fail
 
+from stapi_fastapi.models.conformance import CORE
 from stapi_fastapi.models.opportunity import (
     Opportunity,
     OpportunityCollection,
@@ -29,10 +30,14 @@ from stapi_fastapi.models.product import (
     Provider,
     ProviderRole,
 )
+from stapi_fastapi.routers.root_router import RootRouter
 
 from .backends import (
     mock_create_order,
     mock_get_opportunity_collection,
+    mock_get_order,
+    mock_get_order_statuses,
+    mock_get_orders,
     mock_search_opportunities,
     mock_search_opportunities_async,
 )
@@ -207,6 +212,30 @@ product_test_satellite_provider_sync_opportunity = Product(
 )
 
 
+def make_root_router(
+    *products: Product,
+    product_options: dict[str, Any] | None = None,
+    **options: Any,
+) -> RootRouter:
+    """
+    A root router with the mock root backend and the given `RootRouter` options,
+    serving the given products, or the test spotlight product, added with
+    `product_options`.
+    """
+    root_router = RootRouter(
+        **{
+            "get_orders": mock_get_orders,
+            "get_order": mock_get_order,
+            "get_order_statuses": mock_get_order_statuses,
+            "conformances": [CORE],
+            **options,
+        }
+    )
+    for product in products or [product_test_spotlight_sync_opportunity]:
+        root_router.add_product(product, **(product_options or {}))
+    return root_router
+
+
 def create_mock_opportunity() -> Opportunity:
     now = datetime.now(timezone.utc)  # Use timezone-aware datetime
     start = now
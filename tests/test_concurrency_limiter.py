@@ -0,0 +1,180 @@
+import asyncio
+import gc
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Request, status
+from returns.maybe import Maybe, Nothing
+from returns.result import Failure, ResultE, Success
+
+from stapi_fastapi.models.concurrency_limit import ConcurrencyLimit
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.concurrency_limiter import (
+    ConcurrencyLimiter,
+    limited_stream,
+)
+from stapi_fastapi.routers.product_router import ProductRouter
+
+from .backends import mock_create_order
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    make_root_router,
+    provider,
+)
+
+
+async def hold(limiter: ConcurrencyLimiter, release: asyncio.Event) -> None:
+    async def call() -> None:
+        await release.wait()
+
+    await limiter.run(call())
+
+
+def test_limiter_queues_and_sheds() -> None:
+    limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=1))
+
+    async def main() -> None:
+        release = asyncio.Event()
+        first = asyncio.create_task(hold(limiter, release))
+        second = asyncio.create_task(hold(limiter, release))
+        await asyncio.sleep(0)
+        assert limiter.metrics().active == 1
+        assert limiter.metrics().queued == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await hold(limiter, release)
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert exc_info.value.headers == {"Retry-After": "1"}
+
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(main())
+
+    metrics = limiter.metrics()
+    assert (metrics.active, metrics.queued) == (0, 0)
+    assert (metrics.admitted, metrics.rejected) == (2, 1)
+    assert metrics.wait_time_max > 0
+
+
+async def numbers() -> AsyncIterator[int]:
+    yield 1
+    yield 2
+
+
+def test_stream_holds_slot_until_exhausted() -> None:
+    limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=0))
+
+    async def call() -> ResultE[tuple[AsyncIterator[int], Maybe[str]]]:
+        return Success((numbers(), Nothing))
+
+    async def main() -> list[int]:
+        items, _ = (await limited_stream(limiter, call())).unwrap()
+        assert limiter.metrics().active == 1
+        with pytest.raises(HTTPException) as exc_info:
+            await hold(limiter, asyncio.Event())
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        return [item async for item in items]
+
+    assert asyncio.run(main()) == [1, 2]
+    assert limiter.metrics().active == 0
+
+
+@pytest.mark.parametrize("fail", [False, True], ids=["never_iterated", "failure"])
+def test_stream_releases_slot_without_iterating(fail: bool) -> None:
+    limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=0))
+
+    async def call() -> ResultE[tuple[AsyncIterator[int], Maybe[str]]]:
+        if fail:
+            return Failure(RuntimeError("Backend failure"))
+        return Success((numbers(), Nothing))
+
+    async def main() -> None:
+        await limited_stream(limiter, call())
+        gc.collect()
+
+    asyncio.run(main())
+
+    assert limiter.metrics().active == 0
+    assert limiter.metrics().admitted == 1
+
+
+def test_limiter_queue_timeout() -> None:
+    limiter = ConcurrencyLimiter(
+        ConcurrencyLimit(max_concurrency=1, queue_timeout=0.01, retry_after=5)
+    )
+
+    async def main() -> None:
+        release = asyncio.Event()
+        first = asyncio.create_task(hold(limiter, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await hold(limiter, release)
+        assert exc_info.value.headers == {"Retry-After": "5"}
+
+        release.set()
+        await first
+
+    asyncio.run(main())
+
+    assert limiter.metrics().timed_out == 1
+    assert limiter.metrics().wait_time_total >= 0.01
+
+
+def test_product_limit(base_url: str, opportunity_search: dict[str, Any]) -> None:
+    release = asyncio.Event()
+
+    async def search_opportunities(
+        product_router: ProductRouter,
+        search: OpportunityPayload,
+        next: str | None,
+        limit: int,
+        request: Request,
+    ) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+        await release.wait()
+        return Success(([], Nothing))
+
+    product = Product(
+        id="test-spotlight",
+        title="Test Spotlight Product",
+        description="Test product for test spotlight",
+        license="CC-BY-4.0",
+        keywords=["test", "satellite"],
+        providers=[provider],
+        links=[],
+        create_order=mock_create_order,
+        search_opportunities=search_opportunities,
+        constraints=MyProductConstraints,
+        opportunity_properties=MyOpportunityProperties,
+        order_parameters=MyOrderParameters,
+        concurrency_limit=ConcurrencyLimit(max_concurrency=1, max_queue=0),
+    )
+    root_router = make_root_router(product)
+    app = FastAPI()
+    app.include_router(root_router)
+
+    async def main() -> list[httpx.Response]:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=base_url
+        ) as client:
+            url = "/products/test-spotlight/opportunities"
+            first = asyncio.create_task(client.post(url, json=opportunity_search))
+            limiter = root_router.product_routers[product.id].concurrency_limiter
+            assert limiter is not None
+            while limiter.metrics().active == 0:
+                await asyncio.sleep(0.001)
+            shed = await client.post(url, json=opportunity_search)
+            release.set()
+            return [await first, shed]
+
+    first, shed = asyncio.run(main())
+
+    assert first.status_code == status.HTTP_200_OK
+    assert shed.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert shed.headers["Retry-After"] == "1"
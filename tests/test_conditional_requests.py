@@ -0,0 +1,133 @@
+from collections.abc import Callable, Generator
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from returns.maybe import Maybe
+from returns.result import ResultE
+
+from stapi_fastapi.models.conformance import CORE, OPPORTUNITIES
+from stapi_fastapi.models.order import Order, OrderStatus, OrderStatusCode
+
+from .backends import (
+    mock_get_order,
+    mock_get_order_version,
+)
+from .shared import product_test_spotlight_async_opportunity
+
+ORDER_PAYLOAD = {
+    "geometry": {"type": "Point", "coordinates": [14.4, 56.5]},
+    "datetime": "2024-10-09T18:55:33Z/2024-10-12T18:55:33Z",
+    "order_parameters": {"s3_path": "s3://my-bucket"},
+}
+
+
+def assert_not_modified(client: TestClient, url: str) -> str:
+    res = client.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    etag = res.headers["ETag"]
+
+    res = client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == status.HTTP_304_NOT_MODIFIED
+    assert res.headers["ETag"] == etag
+    assert res.content == b""
+
+    return etag
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/",
+        "/conformance",
+        "/products",
+        "/products/test-spotlight",
+        "/products/test-spotlight/constraints",
+        "/products/test-spotlight/order-parameters",
+    ],
+)
+def test_static_documents(stapi_client: TestClient, url: str) -> None:
+    etag = assert_not_modified(stapi_client, url)
+
+    res = stapi_client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert res.status_code == status.HTTP_304_NOT_MODIFIED
+
+    res = stapi_client.get(url, headers={"If-None-Match": '"other"'})
+    assert res.status_code == status.HTTP_200_OK
+
+
+def test_order(stapi_client: TestClient) -> None:
+    order = stapi_client.post("/products/test-spotlight/orders", json=ORDER_PAYLOAD)
+    order_id = order.json()["id"]
+
+    assert_not_modified(stapi_client, f"/orders/{order_id}")
+
+
+def test_order_statuses(stapi_client: TestClient) -> None:
+    order = stapi_client.post("/products/test-spotlight/orders", json=ORDER_PAYLOAD)
+    order_id = order.json()["id"]
+    url = f"/orders/{order_id}/statuses"
+
+    etag = assert_not_modified(stapi_client, url)
+
+    stapi_client.app_state["_orders_db"].put_order_status(
+        order_id,
+        OrderStatus(timestamp=datetime.now(UTC), status_code=OrderStatusCode.accepted),
+    )
+    res = stapi_client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == status.HTTP_200_OK
+    assert res.headers["ETag"] != etag
+    assert len(res.json()["statuses"]) == 2
+
+
+@pytest.mark.mock_products([product_test_spotlight_async_opportunity])
+def test_opportunity_search_record(
+    stapi_client_async_opportunity: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    res = stapi_client_async_opportunity.post(
+        "/products/test-spotlight/opportunities", json=opportunity_search
+    )
+    search_record_id = res.json()["id"]
+
+    assert_not_modified(
+        stapi_client_async_opportunity, f"/searches/opportunities/{search_record_id}"
+    )
+
+
+@pytest.fixture
+def order_lookups() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def stapi_client_order_version(
+    order_lookups: list[str], make_stapi_client: Callable[..., TestClient]
+) -> Generator[TestClient, None, None]:
+    async def get_order(order_id: str, request: Request) -> ResultE[Maybe[Order]]:
+        order_lookups.append(order_id)
+        return await mock_get_order(order_id, request)
+
+    with make_stapi_client(
+        get_order=get_order,
+        get_order_version=mock_get_order_version,
+        conformances=[CORE, OPPORTUNITIES],
+    ) as client:
+        yield client
+
+
+def test_order_version_avoids_order_lookup(
+    stapi_client_order_version: TestClient, order_lookups: list[str]
+) -> None:
+    client = stapi_client_order_version
+    order = client.post("/products/test-spotlight/orders", json=ORDER_PAYLOAD)
+    order_id = order.json()["id"]
+
+    assert_not_modified(client, f"/orders/{order_id}")
+    assert order_lookups == [order_id]
+
+    assert_not_modified(client, f"/orders/{order_id}/statuses")
+
+    res = client.get("/orders/unknown", headers={"If-None-Match": "*"})
+    assert res.status_code == status.HTTP_404_NOT_FOUND
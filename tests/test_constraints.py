@@ -0,0 +1,215 @@
+from collections.abc import Callable, Iterator
+from typing import Any, Literal
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict, Field
+from returns.maybe import Maybe, Nothing
+from returns.result import ResultE, Success
+
+from stapi_fastapi.exceptions import ConstraintsException
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.constraints import ConstraintsValidator
+from stapi_fastapi.routers.product_router import ProductRouter
+from stapi_fastapi.types.filter import CQL2Filter
+
+from .backends import mock_create_order
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    provider,
+)
+
+searches: list[OpportunityPayload] = []
+
+
+class Window(BaseModel):
+    minimum: int
+    maximum: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class StrictConstraints(BaseModel):
+    off_nadir: int = Field(ge=0, le=45)
+    platform: Literal["platform_id"] = "platform_id"
+    window: Window | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class Search(BaseModel):
+    filter: CQL2Filter | None = None
+
+
+async def search_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    searches.append(search)
+    return Success(([], Nothing))
+
+
+product = Product(
+    id="test-spotlight",
+    title="Test Spotlight Product",
+    description="Test product for test spotlight",
+    license="CC-BY-4.0",
+    keywords=["test", "satellite"],
+    providers=[provider],
+    links=[],
+    create_order=mock_create_order,
+    search_opportunities=search_opportunities,
+    constraints=StrictConstraints,
+    opportunity_properties=MyOpportunityProperties,
+    order_parameters=MyOrderParameters,
+)
+
+
+@pytest.fixture
+def client(make_stapi_client: Callable[..., TestClient]) -> Iterator[TestClient]:
+    searches.clear()
+    with make_stapi_client(product, validate_constraints=True) as client:
+        yield client
+
+
+def off_nadir_filter(minimum: Any, maximum: Any) -> dict[str, Any]:
+    return {
+        "op": "and",
+        "args": [
+            {"op": ">", "args": [{"property": "off_nadir"}, minimum]},
+            {"op": "<", "args": [{"property": "off_nadir"}, maximum]},
+        ],
+    }
+
+
+def test_valid_search_reaches_backend(
+    client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    res = client.post("/products/test-spotlight/opportunities", json=opportunity_search)
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert len(searches) == 1
+
+
+@pytest.mark.parametrize(
+    "filter, loc",
+    [
+        (off_nadir_filter("low", 45), ["filter", "off_nadir"]),
+        (off_nadir_filter(0, [45]), ["filter", "off_nadir"]),
+        (off_nadir_filter(0, "45"), ["filter", "off_nadir"]),
+        (
+            {"op": "=", "args": [{"property": "window.minimum"}, "3"]},
+            ["filter", "window.minimum"],
+        ),
+        (
+            {"op": "=", "args": [{"property": "window.middle"}, 3]},
+            ["filter", "window.middle"],
+        ),
+        (
+            {"op": "in", "args": [{"property": "platform"}, ["platform_id", "other"]]},
+            ["filter", "platform"],
+        ),
+        ({"op": "=", "args": [{"property": "sensor"}, "x"]}, ["filter", "sensor"]),
+    ],
+)
+def test_invalid_search_rejected(
+    client: TestClient,
+    opportunity_search: dict[str, Any],
+    filter: dict[str, Any],
+    loc: list[str],
+) -> None:
+    opportunity_search["filter"] = filter
+
+    res = client.post("/products/test-spotlight/opportunities", json=opportunity_search)
+
+    assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert [error["loc"] for error in res.json()["detail"]] == [loc]
+    assert searches == []
+
+
+def test_invalid_order_rejected(
+    client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    payload = {
+        "geometry": opportunity_search["geometry"],
+        "datetime": opportunity_search["datetime"],
+        "filter": off_nadir_filter("low", 45),
+        "order_parameters": {"s3_path": "s3://my-bucket"},
+    }
+
+    res = client.post("/products/test-spotlight/orders", json=payload)
+
+    assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert res.json()["detail"][0]["type"] == "int_type"
+
+
+def test_nested_properties_validated(
+    client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["filter"] = {
+        "op": "<",
+        "args": [{"property": "window.minimum"}, 3],
+    }
+
+    res = client.post("/products/test-spotlight/opportunities", json=opportunity_search)
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert len(searches) == 1
+
+
+def test_range_constraints_not_checked(
+    client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["filter"] = off_nadir_filter(-10, 50)
+
+    res = client.post("/products/test-spotlight/opportunities", json=opportunity_search)
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert len(searches) == 1
+
+
+def test_validation_disabled(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    searches.clear()
+    opportunity_search["filter"] = off_nadir_filter("low", 45)
+
+    with make_stapi_client(product, validate_constraints=False) as client:
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_200_OK
+    assert len(searches) == 1
+
+
+def test_extra_properties_allowed_unless_forbidden() -> None:
+    class Constraints(BaseModel):
+        off_nadir: int
+
+    filter = Search.model_validate(
+        {"filter": {"op": "=", "args": [{"property": "sensor"}, "x"]}}
+    ).filter
+
+    ConstraintsValidator(Constraints).validate(filter)
+    with pytest.raises(ConstraintsException):
+        ConstraintsValidator(StrictConstraints).validate(filter)
+
+
+def test_property_comparisons_not_validated() -> None:
+    filter = Search.model_validate(
+        {
+            "filter": {
+                "op": "<",
+                "args": [{"property": "off_nadir"}, {"property": "platform"}],
+            }
+        }
+    ).filter
+
+    ConstraintsValidator(StrictConstraints).validate(filter)
@@ -4,7 +4,7 @@ from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, ValidationError
 from pyrfc3339.utils import format_timezone
-from pytest import mark, raises
+from pytest import importorskip, mark, raises
 
 from stapi_fastapi.types.datetime_interval import DatetimeInterval
 
@@ -72,3 +72,72 @@ def test_serialize(tz):
 
     obj = model.model_dump()
     assert obj["datetime"] == expected
+
+
+@mark.parametrize(
+    "value, expected",
+    (
+        ("../2024-01-30T12:00:00Z", "../2024-01-30T12:00:00+00:00"),
+        ("2024-01-29T12:00:00+01:00/", "2024-01-29T12:00:00+01:00/.."),
+        ("../..", "../.."),
+    ),
+)
+def test_open_ended(value: str, expected: str):
+    model = Model.model_validate_json(f'{{"datetime":"{value}"}}')
+
+    assert model.model_dump()["datetime"] == expected
+    assert Model.model_validate(model.model_dump()) == model
+
+
+INTERVALS = [
+    "2024-01-29T12:00:00Z/2024-01-30T12:00:00.5Z",
+    "2024-01-29 12:00:00.123456+01:00/2024-01-29t23:30:00-05:30",
+    "2024-02-29_00:00:00.1234567z/..",
+    "../2024-12-31T23:59:59+14:00",
+    # forms outside the vectorized fast path
+    "2024-01-29T12:00+01:00/2024-01-30T00:00:00+0000",
+]
+
+
+def test_parse_intervals():
+    np = importorskip("numpy")
+    from stapi_fastapi.types.datetime_intervals import parse_intervals
+
+    start, end = parse_intervals(INTERVALS * 3)
+
+    expected = [Model.model_validate({"datetime": value}) for value in INTERVALS * 3]
+    assert start.dtype == end.dtype == np.dtype("datetime64[us]")
+    assert [s.replace(tzinfo=UTC) for s in start.astype(datetime).tolist()] == [
+        model.datetime[0] for model in expected
+    ]
+    assert [e.replace(tzinfo=UTC) for e in end.astype(datetime).tolist()] == [
+        model.datetime[1] for model in expected
+    ]
+
+
+def test_parse_no_intervals():
+    np = importorskip("numpy")
+    from stapi_fastapi.types.datetime_intervals import parse_intervals
+
+    start, end = parse_intervals([])
+
+    assert start.shape == end.shape == (0,)
+    assert start.dtype == end.dtype == np.dtype("datetime64[us]")
+
+
+@mark.parametrize(
+    "value",
+    (
+        "2024-01-29T12:00:00Z",
+        "2024-01-29/2024-01-30",
+        "2024-02-30T00:00:00Z/..",
+        "2024-01-29T24:00:00Z/..",
+        "2024-01-30T00:00:00Z/2024-01-29T00:00:00Z",
+    ),
+)
+def test_parse_invalid_intervals(value: str):
+    importorskip("numpy")
+    from stapi_fastapi.types.datetime_intervals import parse_intervals
+
+    with raises(ValueError):
+        parse_intervals([INTERVALS[0], value])
@@ -0,0 +1,173 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from returns.maybe import Maybe, Nothing
+from returns.result import ResultE, Success
+
+from stapi_fastapi.models.deadlines import Deadlines
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.order import Order
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.deadline import remaining_time
+from stapi_fastapi.routers.product_router import ProductRouter
+
+from .backends import (
+    mock_create_order,
+    mock_get_order,
+)
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    provider,
+)
+
+budgets: list[float | None] = []
+cancelled: list[str] = []
+
+
+async def search_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    budgets.append(remaining_time(request))
+    try:
+        await asyncio.sleep(search.limit / 100)
+    except asyncio.CancelledError:
+        cancelled.append("search_opportunities")
+        raise
+    return Success(([], Nothing))
+
+
+async def slow_get_order(order_id: str, request: Request) -> ResultE[Maybe[Order]]:
+    await asyncio.sleep(1)
+    return await mock_get_order(order_id, request)
+
+
+async def stalled_stream_orders(
+    next: str | None, limit: int, request: Request
+) -> ResultE[tuple[AsyncIterator[Order], Maybe[str]]]:
+    async def orders() -> AsyncIterator[Order]:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("stream_orders")
+            raise
+        for order in request.state._orders_db._orders.values():
+            yield order
+
+    return Success((orders(), Nothing))
+
+
+def make_product(deadlines: Deadlines | None = None) -> Product:
+    return Product(
+        id="test-spotlight",
+        title="Test Spotlight Product",
+        description="Test product for test spotlight",
+        license="CC-BY-4.0",
+        keywords=["test", "satellite"],
+        providers=[provider],
+        links=[],
+        create_order=mock_create_order,
+        search_opportunities=search_opportunities,
+        constraints=MyProductConstraints,
+        opportunity_properties=MyOpportunityProperties,
+        order_parameters=MyOrderParameters,
+        deadlines=deadlines,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear() -> None:
+    budgets.clear()
+    cancelled.clear()
+
+
+@pytest.mark.parametrize("product_dispatch", [False, True])
+@pytest.mark.parametrize(
+    "deadlines, product_deadlines",
+    [
+        (Deadlines(operations={"search-opportunities": 0.05}), None),
+        (Deadlines(default=10), Deadlines(default=0.05)),
+    ],
+)
+def test_search_cancelled_at_deadline(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    deadlines: Deadlines,
+    product_deadlines: Deadlines | None,
+    product_dispatch: bool,
+) -> None:
+    opportunity_search["limit"] = 100
+
+    with make_stapi_client(
+        make_product(product_deadlines),
+        deadlines=deadlines,
+        product_dispatch=product_dispatch,
+    ) as client:
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+    assert cancelled == ["search_opportunities"]
+    assert budgets[0] is not None and 0 < budgets[0] <= 0.05
+
+
+def test_search_within_deadline(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["limit"] = 1
+
+    with make_stapi_client(make_product(), deadlines=Deadlines(default=10)) as client:
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_200_OK
+    assert budgets[0] is not None and 9 < budgets[0] <= 10
+
+
+def test_no_deadline(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["limit"] = 1
+
+    with make_stapi_client(make_product()) as client:
+        client.post("/products/test-spotlight/opportunities", json=opportunity_search)
+
+    assert budgets == [None]
+
+
+def test_root_backend_deadline(make_stapi_client: Callable[..., TestClient]) -> None:
+    deadlines = Deadlines(default=10, operations={"get-order": 0.05})
+
+    with make_stapi_client(
+        make_product(), deadlines=deadlines, get_order=slow_get_order
+    ) as client:
+        res = client.get("/orders/unknown")
+
+    assert res.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+
+def test_stream_cancelled_at_deadline(
+    make_stapi_client: Callable[..., TestClient],
+) -> None:
+    deadlines = Deadlines(operations={"list-orders": 0.05})
+
+    with make_stapi_client(
+        make_product(), deadlines=deadlines, stream_orders=stalled_stream_orders
+    ) as client:
+        # the response has started streaming, so it is aborted
+        with pytest.raises(Exception) as exc_info:
+            client.get("/orders")
+
+    assert exc_info.group_contains(TimeoutError)
+    assert cancelled == ["stream_orders"]
@@ -0,0 +1,75 @@
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from stapi_fastapi.constants import TYPE_GEOJSON
+from stapi_fastapi.models.order import Order, OrderCollection
+
+from .shared import (
+    create_mock_opportunity,
+    pagination_tester,
+    product_test_spotlight_sync_opportunity,
+)
+from .test_conditional_requests import ORDER_PAYLOAD
+
+
+@pytest.fixture
+def stapi_client_direct(
+    make_stapi_client: Callable[..., TestClient],
+) -> Generator[TestClient, None, None]:
+    with make_stapi_client(direct_serialization=True) as client:
+        yield client
+
+
+def test_orders(stapi_client_direct: TestClient) -> None:
+    res = stapi_client_direct.post(
+        "/products/test-spotlight/orders", json=ORDER_PAYLOAD
+    )
+    assert res.status_code == status.HTTP_201_CREATED
+    assert res.headers["Content-Type"] == TYPE_GEOJSON
+    order_id = res.json()["id"]
+    assert res.headers["Location"] == f"http://stapiserver/orders/{order_id}"
+
+    for url, model in (("/orders", OrderCollection), (f"/orders/{order_id}", Order)):
+        res = stapi_client_direct.get(url)
+        assert res.status_code == status.HTTP_200_OK
+        assert res.headers["Content-Type"] == TYPE_GEOJSON
+        body = res.json()
+        assert model.model_validate(body).model_dump(mode="json") == body
+
+
+@pytest.mark.mock_products([product_test_spotlight_sync_opportunity])
+def test_opportunities_match_validated_responses(
+    stapi_client: TestClient,
+    stapi_client_direct: TestClient,
+    opportunity_search: dict[str, Any],
+) -> None:
+    url = "/products/test-spotlight/opportunities"
+    validated = stapi_client.post(url, json=opportunity_search)
+    direct = stapi_client_direct.post(url, json=opportunity_search)
+
+    assert direct.status_code == status.HTTP_200_OK
+    assert direct.headers["Content-Type"] == TYPE_GEOJSON
+    assert direct.content == validated.content
+    assert direct.json()["features"][0]["properties"]["other_thing"] == "abcd1234"
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_opportunities_pagination(
+    limit: int, stapi_client_direct: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    opportunities = [create_mock_opportunity() for _ in range(3)]
+    stapi_client_direct.app_state["_opportunities"] = opportunities
+
+    pagination_tester(
+        stapi_client=stapi_client_direct,
+        url="/products/test-spotlight/opportunities",
+        method="POST",
+        limit=limit,
+        target="features",
+        expected_returns=[x.model_dump(mode="json") for x in opportunities],
+        body=opportunity_search,
+    )
@@ -0,0 +1,58 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from stapi_fastapi.routers.root_router import RootRouter
+
+from .shared import product_test_spotlight
+
+
+def root_router(client: TestClient) -> RootRouter:
+    route = next(r for r in client.app.routes if r.path == "/")  # type: ignore
+    return route.endpoint.__self__  # type: ignore
+
+
+def test_documents_are_cached(stapi_client: TestClient) -> None:
+    router = root_router(stapi_client)
+    builds = []
+    build_root = router.build_root
+    router.build_root = lambda request: builds.append(1) or build_root(request)  # type: ignore
+
+    first = stapi_client.get("/")
+    second = stapi_client.get("/")
+
+    assert first.status_code == status.HTTP_200_OK
+    assert first.headers["Content-Type"] == "application/json"
+    assert first.content == second.content
+    assert len(builds) == 1
+
+
+def test_documents_are_cached_per_base_url(stapi_client: TestClient) -> None:
+    res = stapi_client.get("/products/test-spotlight")
+    other = stapi_client.get(
+        "/products/test-spotlight", headers={"Host": "other.example.com"}
+    )
+
+    links = {link["rel"]: link["href"] for link in res.json()["links"]}
+    other_links = {link["rel"]: link["href"] for link in other.json()["links"]}
+    assert links["self"] == "http://stapiserver/products/test-spotlight"
+    assert other_links["self"] == "http://other.example.com/products/test-spotlight"
+
+
+def test_products_are_cached_per_page(stapi_client: TestClient) -> None:
+    first_page = stapi_client.get("/products", params={"limit": 1}).json()
+    all_products = stapi_client.get("/products", params={"limit": 10}).json()
+
+    assert len(first_page["products"]) == 1
+    assert len(all_products["products"]) == 2
+
+
+def test_add_product_clears_cache(stapi_client_product_dispatch: TestClient) -> None:
+    router = root_router(stapi_client_product_dispatch)
+    before = stapi_client_product_dispatch.get("/products").json()
+
+    product = product_test_spotlight.model_copy(update={"id": "test-new"})
+    router.add_product(product)
+    after = stapi_client_product_dispatch.get("/products").json()
+
+    assert len(after["products"]) == len(before["products"]) + 1
+    assert after["products"][-1]["id"] == "test-new"
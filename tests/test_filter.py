@@ -0,0 +1,73 @@
+import copy
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from pygeofilter import ast
+
+from stapi_fastapi.models.order import OrderSearchParameters
+from stapi_fastapi.types.filter import CQL2Filter, CQL2FilterDict, parse
+
+FILTER = {
+    "op": "and",
+    "args": [
+        {"op": ">", "args": [{"property": "off_nadir"}, 0]},
+        {"op": "<", "args": [{"property": "off_nadir"}, 45]},
+    ],
+}
+
+
+class Search(BaseModel):
+    filter: CQL2Filter | None = None
+
+
+def test_filter_carries_ast() -> None:
+    search = Search.model_validate({"filter": FILTER})
+
+    assert isinstance(search.filter, CQL2FilterDict)
+    assert search.filter == FILTER
+    assert search.filter.ast == ast.And(
+        ast.GreaterThan(ast.Attribute("off_nadir"), 0),
+        ast.LessThan(ast.Attribute("off_nadir"), 45),
+    )
+    assert search.model_dump(mode="json") == {"filter": FILTER}
+
+
+def test_parsed_once_per_filter() -> None:
+    parse.cache_clear()
+    reordered: dict[str, Any] = {"args": FILTER["args"], "op": FILTER["op"]}
+
+    first = Search.model_validate({"filter": FILTER}).filter
+    second = Search.model_validate({"filter": reordered}).filter
+
+    assert first is not None and second is not None
+    assert first.ast is second.ast
+    assert parse.cache_info().misses == 1
+
+
+def test_filter_survives_revalidation_and_copies() -> None:
+    filter = Search.model_validate({"filter": FILTER}).filter
+    parameters = OrderSearchParameters.model_validate(
+        {
+            "datetime": "2024-10-09T18:55:33Z/2024-10-12T18:55:33Z",
+            "geometry": {"type": "Point", "coordinates": [14.4, 56.5]},
+            "filter": filter,
+        }
+    )
+
+    assert parameters.filter is not None and filter is not None
+    assert parameters.filter.ast is filter.ast
+    assert copy.deepcopy(parameters).filter.ast == filter.ast  # type: ignore
+
+
+def test_empty_filter() -> None:
+    search = Search.model_validate({"filter": {}})
+
+    assert search.filter == {}
+    assert search.filter is not None and search.filter.ast is None
+
+
+@pytest.mark.parametrize("filter", [{"op": "bogus"}, {"foo": 1}, "off_nadir > 0"])
+def test_invalid_filter(filter: Any) -> None:
+    with pytest.raises(ValidationError):
+        Search.model_validate({"filter": filter})
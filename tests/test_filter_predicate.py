@@ -0,0 +1,243 @@
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from geojson_pydantic import Point, Polygon
+from geojson_pydantic.types import Position2D
+from pydantic import BaseModel
+
+from stapi_fastapi.filters import compile_predicate
+from stapi_fastapi.models.opportunity import Opportunity
+from stapi_fastapi.models.order import OrderStatus, OrderStatusCode
+from stapi_fastapi.types.filter import CQL2Filter
+
+from .shared import MyOpportunityProperties
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+POINT = Point(type="Point", coordinates=Position2D(longitude=14.4, latitude=56.5))
+
+INSIDE = {
+    "type": "Polygon",
+    "coordinates": [[[14, 56], [15, 56], [15, 57], [14, 57], [14, 56]]],
+}
+OUTSIDE = {
+    "type": "Polygon",
+    "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+}
+
+
+class Search(BaseModel):
+    filter: CQL2Filter
+
+
+def compile(filter: dict[str, Any]):
+    return compile_predicate(Search.model_validate({"filter": filter}).filter)
+
+
+def opportunity(minimum: int = 10, maximum: int = 20) -> Opportunity:
+    return Opportunity(
+        id="opp-1",
+        geometry=POINT,
+        properties=MyOpportunityProperties.model_validate(
+            {
+                "datetime": (START, START.replace(hour=1)),
+                "product_id": "test-spotlight",
+                "off_nadir": {"minimum": minimum, "maximum": maximum},
+                "vehicle_id": [1],
+                "platform": "platform_id",
+            }
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "filter, expected",
+    [
+        ({"op": "<", "args": [{"property": "off_nadir.minimum"}, 15]}, True),
+        ({"op": ">=", "args": [{"property": "off_nadir.maximum"}, 25]}, False),
+        ({"op": "=", "args": [{"property": "platform"}, "platform_id"]}, True),
+        ({"op": "=", "args": [{"property": "id"}, "opp-1"]}, True),
+        # values of types they cannot be compared with never match
+        ({"op": ">", "args": [{"property": "product_id"}, 3]}, False),
+        ({"op": "between", "args": [{"property": "platform"}, [1, 2]]}, False),
+        (
+            {
+                "op": "and",
+                "args": [
+                    {"op": ">", "args": [{"property": "off_nadir.minimum"}, 0]},
+                    {"op": "<", "args": [{"property": "off_nadir.maximum"}, 15]},
+                ],
+            },
+            False,
+        ),
+        (
+            {
+                "op": "or",
+                "args": [
+                    {"op": ">", "args": [{"property": "off_nadir.minimum"}, 50]},
+                    {"op": "<", "args": [{"property": "off_nadir.maximum"}, 25]},
+                ],
+            },
+            True,
+        ),
+        ({"op": "not", "args": [{"op": "isNull", "args": [{"property": "x"}]}]}, False),
+        ({"op": "between", "args": [{"property": "off_nadir.minimum"}, [5, 10]]}, True),
+        ({"op": "like", "args": [{"property": "platform"}, "plat%_.d"]}, True),
+        ({"op": "like", "args": [{"property": "platform"}, "plat"]}, False),
+        (
+            {"op": "in", "args": [{"property": "product_id"}, ["a", "test-spotlight"]]},
+            True,
+        ),
+        (
+            {"op": "=", "args": [{"lower": {"property": "platform"}}, "platform_id"]},
+            True,
+        ),
+        (
+            {
+                "op": "<",
+                "args": [
+                    {
+                        "op": "-",
+                        "args": [
+                            {"property": "off_nadir.maximum"},
+                            {"property": "off_nadir.minimum"},
+                        ],
+                    },
+                    20,
+                ],
+            },
+            True,
+        ),
+        ({"op": "<", "args": [{"property": "missing"}, 10]}, False),
+    ],
+)
+def test_scalar_operators(filter: dict[str, Any], expected: bool) -> None:
+    predicate = compile(filter)
+
+    assert predicate(opportunity()) is expected
+
+
+@pytest.mark.parametrize(
+    "op, interval, expected",
+    [
+        ("t_intersects", ["2025-01-01T00:30:00Z", "2025-01-02T00:00:00Z"], True),
+        ("t_intersects", ["2025-01-01T02:00:00Z", ".."], False),
+        ("t_during", ["2024-12-31T00:00:00Z", "2025-01-02T00:00:00Z"], True),
+        ("t_before", ["2025-01-01T02:00:00Z", "P1D"], True),
+        ("t_after", ["..", "2024-12-31T00:00:00Z"], True),
+        ("t_contains", ["2025-01-01T00:15:00Z", "2025-01-01T00:30:00Z"], True),
+    ],
+)
+def test_temporal_operators(op: str, interval: list[str], expected: bool) -> None:
+    predicate = compile(
+        {"op": op, "args": [{"property": "datetime"}, {"interval": interval}]}
+    )
+
+    assert predicate(opportunity()) is expected
+    assert predicate(opportunity().properties) is expected
+
+
+def test_temporal_operators_with_timestamps() -> None:
+    predicate = compile(
+        {
+            "op": "t_before",
+            "args": [{"property": "created"}, {"timestamp": "2025-01-02T00:00:00Z"}],
+        }
+    )
+
+    assert predicate({"created": START})
+    assert predicate({"created": "2025-01-01T00:00:00+00:00"})
+    assert not predicate({"created": START.replace(year=2026)})
+    assert not predicate({})
+
+
+@pytest.mark.parametrize("created", ["garbage", "garbage/..", ["garbage", None]])
+def test_temporal_operators_with_malformed_datetimes(created: Any) -> None:
+    predicate = compile(
+        {
+            "op": "t_before",
+            "args": [{"property": "created"}, {"timestamp": "2025-01-02T00:00:00Z"}],
+        }
+    )
+
+    assert not predicate({"created": created})
+
+
+@pytest.mark.parametrize(
+    "op, geometry, expected",
+    [
+        ("s_intersects", INSIDE, True),
+        ("s_intersects", OUTSIDE, False),
+        ("s_within", INSIDE, True),
+        ("s_disjoint", OUTSIDE, True),
+        ("s_contains", INSIDE, False),
+    ],
+)
+def test_spatial_operators(op: str, geometry: dict[str, Any], expected: bool) -> None:
+    predicate = compile({"op": op, "args": [{"property": "geometry"}, geometry]})
+
+    assert predicate(opportunity()) is expected
+
+
+def test_spatial_operators_are_exact() -> None:
+    # the point lies within the bounding box of the polygon, but outside of it
+    l_shape = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [10, 0], [10, 2], [2, 2], [2, 10], [0, 10], [0, 0]]],
+    }
+    point = {"geometry": {"type": "Point", "coordinates": [5, 5]}}
+
+    assert not compile(
+        {"op": "s_contains", "args": [l_shape, {"property": "geometry"}]}
+    )(point)
+    assert not compile(
+        {"op": "s_intersects", "args": [{"property": "geometry"}, l_shape]}
+    )(point)
+    assert compile({"op": "s_disjoint", "args": [{"property": "geometry"}, l_shape]})(
+        point
+    )
+
+
+def test_spatial_operators_between_properties() -> None:
+    predicate = compile(
+        {"op": "s_within", "args": [{"property": "geometry"}, {"property": "aoi"}]}
+    )
+    aoi = Polygon.model_validate(INSIDE)
+
+    assert predicate({"geometry": POINT, "properties": {"aoi": aoi}})
+    assert not predicate({"geometry": POINT, "properties": {"aoi": OUTSIDE}})
+    assert not predicate({"geometry": POINT, "properties": {}})
+
+
+def test_order_properties() -> None:
+    predicate = compile(
+        {
+            "op": "in",
+            "args": [{"property": "status.status_code"}, ["accepted", "completed"]],
+        }
+    )
+    status = OrderStatus(timestamp=START, status_code=OrderStatusCode.accepted)
+
+    assert predicate({"properties": {"status": status}})
+    assert not predicate({"properties": {"status": {"status_code": "received"}}})
+
+
+def test_compiled_once() -> None:
+    filter = {"op": "<", "args": [{"property": "off_nadir.minimum"}, 15]}
+
+    assert compile(filter) is compile(dict(reversed(filter.items())))
+    assert compile_predicate(None)(opportunity())
+    assert compile({})(opportunity())
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        {"op": "s_touches", "args": [{"property": "geometry"}, INSIDE]},
+        {"function": {"name": "unknown", "arguments": [{"property": "platform"}]}},
+        {"op": "a_contains", "args": [{"property": "vehicle_id"}, [1]]},
+    ],
+)
+def test_unsupported_operations(filter: dict[str, Any]) -> None:
+    with pytest.raises(ValueError, match="Unsupported"):
+        compile(filter)
@@ -0,0 +1,290 @@
+import json
+import sqlite3
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from stapi_fastapi.filters import (
+    GENERIC,
+    POSTGIS,
+    Dialect,
+    compile_predicate,
+    to_sql,
+)
+from stapi_fastapi.filters.sql import Column
+from stapi_fastapi.types.filter import CQL2Filter
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+COLUMNS: dict[str, Column] = {
+    "id": "id",
+    "off_nadir.minimum": "off_nadir_min",
+    "off_nadir.maximum": "off_nadir_max",
+    "platform": "platform",
+    "datetime": ("start", "end"),
+    "geometry": "geometry",
+}
+
+
+class Search(BaseModel):
+    filter: CQL2Filter | None = None
+
+
+def parse(filter: dict[str, Any] | None) -> CQL2Filter | None:
+    return Search.model_validate({"filter": filter}).filter
+
+
+def records() -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"opp-{i}",
+            "geometry": {"type": "Point", "coordinates": [i, i]},
+            "properties": {
+                "datetime": (
+                    START + timedelta(hours=i),
+                    START + timedelta(hours=i + 1),
+                ),
+                "off_nadir": {"minimum": i * 10, "maximum": i * 10 + 5},
+                "platform": "Platform_id" if i % 2 else "platform_id",
+            },
+        }
+        for i in range(5)
+    ]
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(":memory:")
+    # like in standard SQL, rather than case-insensitive for ASCII
+    connection.execute("PRAGMA case_sensitive_like = ON")
+    connection.execute(
+        """
+        CREATE TABLE opportunities (
+            id TEXT, off_nadir_min REAL, off_nadir_max REAL, platform TEXT,
+            start TEXT, "end" TEXT
+        )
+        """
+    )
+    for record in records():
+        properties = record["properties"]
+        connection.execute(
+            "INSERT INTO opportunities VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                record["id"],
+                properties["off_nadir"]["minimum"],
+                properties["off_nadir"]["maximum"],
+                properties["platform"],
+                properties["datetime"][0].isoformat(),
+                properties["datetime"][1].isoformat(),
+            ),
+        )
+    yield connection
+    connection.close()
+
+
+def select(connection: sqlite3.Connection, filter: dict[str, Any] | None) -> list[str]:
+    columns: dict[str, Column] = {**COLUMNS, "datetime": ("start", '"end"')}
+    where, params = to_sql(parse(filter), columns)
+    rows = connection.execute(
+        f"SELECT id FROM opportunities WHERE {where} ORDER BY id", params
+    )
+    return [id for (id,) in rows]
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        None,
+        {"op": "<", "args": [{"property": "off_nadir.minimum"}, 25]},
+        {
+            "op": "and",
+            "args": [
+                {
+                    "op": "between",
+                    "args": [{"property": "off_nadir.maximum"}, [10, 30]],
+                },
+                {"op": "<>", "args": [{"property": "id"}, "opp-2"]},
+            ],
+        },
+        {
+            "op": "or",
+            "args": [
+                {"op": "in", "args": [{"property": "id"}, ["opp-0", "opp-4"]]},
+                {
+                    "op": "not",
+                    "args": [
+                        {"op": ">", "args": [{"property": "off_nadir.minimum"}, 15]}
+                    ],
+                },
+            ],
+        },
+        {"op": "like", "args": [{"property": "platform"}, "platform%"]},
+        {"op": "=", "args": [{"lower": {"property": "platform"}}, "platform_id"]},
+        {
+            "op": ">",
+            "args": [
+                {
+                    "op": "-",
+                    "args": [
+                        {"property": "off_nadir.maximum"},
+                        {"property": "off_nadir.minimum"},
+                    ],
+                },
+                4,
+            ],
+        },
+        {
+            "op": "t_intersects",
+            "args": [
+                {"property": "datetime"},
+                {"interval": ["2025-01-01T01:30:00Z", "2025-01-01T03:00:00Z"]},
+            ],
+        },
+        {
+            "op": "t_before",
+            "args": [
+                {"property": "datetime"},
+                {"interval": ["2025-01-01T03:00:00Z", ".."]},
+            ],
+        },
+    ],
+)
+def test_matches_predicate(
+    connection: sqlite3.Connection, filter: dict[str, Any] | None
+) -> None:
+    predicate = compile_predicate(parse(filter))
+    expected = [record["id"] for record in records() if predicate(record)]
+
+    assert select(connection, filter) == expected
+
+
+def test_like_escapes_sql_wildcards(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "UPDATE opportunities SET platform = '100%_sure' WHERE id = 'opp-1'"
+    )
+    connection.execute(
+        "UPDATE opportunities SET platform = '100 unsure' WHERE id = 'opp-2'"
+    )
+
+    assert select(
+        connection, {"op": "like", "args": [{"property": "platform"}, "100\\%_.ure"]}
+    ) == ["opp-1"]
+
+
+def casei(arg: Any) -> dict[str, Any]:
+    return {"function": {"name": "casei", "arguments": [arg]}}
+
+
+CASEI_PLATFORM = casei({"property": "platform"})
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        {"op": "=", "args": [CASEI_PLATFORM, casei("PLATFORM_ID")]},
+        {"op": "=", "args": [CASEI_PLATFORM, "PLATFORM_ID"]},
+        {"op": "=", "args": ["Platform_ID", CASEI_PLATFORM]},
+        {"op": "in", "args": [CASEI_PLATFORM, ["PLATFORM_ID", "other"]]},
+        {
+            "op": "like",
+            "args": [CASEI_PLATFORM, casei("PLATFORM%")],
+        },
+        {"op": "like", "args": [CASEI_PLATFORM, "Platform_%"]},
+    ],
+)
+def test_casei(connection: sqlite3.Connection, filter: dict[str, Any]) -> None:
+    predicate = compile_predicate(parse(filter))
+    ids = [record["id"] for record in records()]
+
+    assert [record["id"] for record in records() if predicate(record)] == ids
+    assert select(connection, filter) == ids
+
+
+def test_parameters() -> None:
+    filter = parse(
+        {
+            "op": "and",
+            "args": [
+                {"op": "=", "args": [{"property": "platform"}, "x'; DROP TABLE x; --"]},
+                {"op": "isNull", "args": [{"property": 'quoted"name'}]},
+                {
+                    "op": "t_after",
+                    "args": [
+                        {"property": "created"},
+                        {"timestamp": "2025-01-01T00:00:00Z"},
+                    ],
+                },
+            ],
+        }
+    )
+
+    sql, params = to_sql(filter, dialect=Dialect(placeholder="${}", datetime=str))
+
+    assert sql == '(("platform" = $1 AND "quoted""name" IS NULL) AND "created" > $2)'
+    assert params == ["x'; DROP TABLE x; --", "2025-01-01 00:00:00+00:00"]
+
+    sql, params = to_sql(filter, dialect=GENERIC)
+
+    assert "%s" in sql and params[1] == START
+
+
+def test_spatial_functions() -> None:
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]]],
+    }
+    point = {"type": "Point", "coordinates": [0, 0]}
+    filter = parse(
+        {
+            "op": "or",
+            "args": [
+                {"op": "s_within", "args": [{"property": "geometry"}, polygon]},
+                {
+                    "op": "s_intersects",
+                    "args": [{"property": "geometry"}, point],
+                },
+            ],
+        }
+    )
+
+    sql, params = to_sql(filter, COLUMNS, POSTGIS)
+
+    assert sql == (
+        "(ST_Within(geometry, ST_GeomFromGeoJSON(%s))"
+        " OR ST_Intersects(geometry, ST_GeomFromGeoJSON(%s)))"
+    )
+    assert [json.loads(param) for param in params] == [polygon, point]
+
+
+@pytest.mark.parametrize(
+    "filter, message",
+    [
+        ({"op": "=", "args": [{"property": "unknown"}, 1]}, "Unknown property"),
+        (
+            {
+                "op": "s_intersects",
+                "args": [
+                    {"property": "geometry"},
+                    {"type": "Point", "coordinates": [0, 0]},
+                ],
+            },
+            "spatial functions",
+        ),
+        (
+            {
+                "op": "s_touches",
+                "args": [
+                    {"property": "geometry"},
+                    {"type": "Point", "coordinates": [0, 0]},
+                ],
+            },
+            "Unsupported",
+        ),
+    ],
+)
+def test_errors(filter: dict[str, Any], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        to_sql(parse(filter), COLUMNS)
@@ -0,0 +1,267 @@
+import json
+import math
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from geojson_pydantic import Polygon
+from returns.maybe import Maybe, Nothing
+from returns.result import ResultE, Success
+
+from stapi_fastapi.models.geometry_limits import (
+    GeometryLimits,
+    count_rings,
+    count_vertices,
+    douglas_peucker,
+    simplify,
+)
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.product_router import ProductRouter
+
+from .backends import mock_create_order
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    provider,
+)
+
+searches: list[OpportunityPayload] = []
+
+
+async def search_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    searches.append(search)
+    return Success(([], Nothing))
+
+
+def make_product(limits: GeometryLimits) -> Product:
+    return Product(
+        id="test-spotlight",
+        title="Test Spotlight Product",
+        description="Test product for test spotlight",
+        license="CC-BY-4.0",
+        keywords=["test", "satellite"],
+        providers=[provider],
+        links=[],
+        create_order=mock_create_order,
+        search_opportunities=search_opportunities,
+        constraints=MyProductConstraints,
+        opportunity_properties=MyOpportunityProperties,
+        order_parameters=MyOrderParameters,
+        geometry_limits=limits,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_searches() -> Iterator[None]:
+    searches.clear()
+    yield
+
+
+def circle(vertices: int, radius: float = 1.0) -> list[list[float]]:
+    """
+    A closed ring approximating a circle with `vertices` distinct positions.
+    """
+    ring = [
+        [
+            radius * math.cos(2 * math.pi * i / vertices),
+            radius * math.sin(2 * math.pi * i / vertices),
+        ]
+        for i in range(vertices)
+    ]
+    return [*ring, ring[0]]
+
+
+def polygon(*rings: list[list[float]]) -> dict[str, Any]:
+    return {"type": "Polygon", "coordinates": list(rings)}
+
+
+def test_counts() -> None:
+    geometry = Polygon.model_validate(polygon(circle(8), circle(4, 0.5)))
+
+    assert count_vertices(geometry) == 14
+    assert count_rings(geometry) == 2
+
+
+@pytest.mark.parametrize("simplifier", [simplify, douglas_peucker])
+def test_simplify_keeps_shape_within_tolerance(simplifier: Any) -> None:
+    geometry = Polygon.model_validate(polygon(circle(1000)))
+
+    simplified = simplifier(geometry, 0.01)
+
+    assert isinstance(simplified, Polygon)
+    ring = simplified.coordinates[0]
+    assert 4 <= len(ring) < 100
+    assert ring[0] == ring[-1]
+    # every kept vertex lies on the original circle
+    assert all(abs(math.hypot(p[0], p[1]) - 1) < 1e-9 for p in ring)
+
+
+def test_simplify_drops_collapsed_holes() -> None:
+    geometry = Polygon.model_validate(polygon(circle(100), circle(100, 0.001)))
+
+    simplified = douglas_peucker(geometry, 0.01)
+
+    assert count_rings(simplified) == 1
+
+
+def test_simplify_preserves_topology() -> None:
+    shapely = pytest.importorskip("shapely")
+    geometry = Polygon.model_validate(polygon(circle(100), circle(100, 0.001)))
+
+    simplified = simplify(geometry, 0.01)
+
+    assert count_rings(simplified) == 2
+    assert shapely.is_valid(shapely.geometry.shape(simplified))
+
+
+def test_simplified_geometry_reaches_backend_and_links(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["geometry"] = polygon(circle(1000))
+    limits = GeometryLimits(max_vertices=100, simplify_tolerance=0.01)
+
+    with make_stapi_client(make_product(limits)) as client:
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    geometry = searches[0].geometry
+    assert count_vertices(geometry) <= 100
+    order_link = next(
+        link for link in res.json()["links"] if link["rel"] == "create-order"
+    )
+    assert order_link["body"]["geometry"] == geometry.model_dump(mode="json")
+
+
+def test_geometry_under_limit_not_simplified(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["geometry"] = polygon(circle(50))
+    limits = GeometryLimits(max_vertices=100, simplify_tolerance=0.01)
+
+    with make_stapi_client(make_product(limits)) as client:
+        client.post("/products/test-spotlight/opportunities", json=opportunity_search)
+
+    assert count_vertices(searches[0].geometry) == 51
+
+
+@pytest.mark.parametrize(
+    "limits, geometry",
+    [
+        (GeometryLimits(max_vertices=100), polygon(circle(1000))),
+        (
+            GeometryLimits(max_vertices=100, simplify_tolerance=1e-6),
+            polygon(circle(1000)),
+        ),
+        (GeometryLimits(max_rings=1), polygon(circle(8), circle(4, 0.5))),
+        (
+            GeometryLimits(
+                max_vertices=100, simplify_tolerance=0.01, max_input_vertices=500
+            ),
+            polygon(circle(1000)),
+        ),
+    ],
+)
+@pytest.mark.parametrize("product_dispatch", [False, True])
+def test_complex_geometry_rejected(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    limits: GeometryLimits,
+    geometry: dict[str, Any],
+    product_dispatch: bool,
+) -> None:
+    opportunity_search["geometry"] = geometry
+
+    with make_stapi_client(
+        make_product(limits), product_dispatch=product_dispatch
+    ) as client:
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert res.json()["detail"][0]["loc"] == ["body", "geometry"]
+    assert searches == []
+
+
+@pytest.mark.parametrize("raw_body_validation", [False, True])
+def test_large_body_rejected(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    raw_body_validation: bool,
+) -> None:
+    opportunity_search["geometry"] = polygon(circle(1000))
+    limits = GeometryLimits(max_bytes=10_000)
+
+    with make_stapi_client(
+        make_product(limits), raw_body_validation=raw_body_validation
+    ) as client:
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert searches == []
+
+
+@pytest.mark.parametrize("product_dispatch", [False, True])
+@pytest.mark.parametrize("raw_body_validation", [False, True])
+@pytest.mark.parametrize("path", ["opportunities", "orders"])
+def test_large_chunked_body_rejected(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    raw_body_validation: bool,
+    product_dispatch: bool,
+    path: str,
+) -> None:
+    opportunity_search["geometry"] = polygon(circle(1000))
+    body = json.dumps(opportunity_search).encode()
+    limits = GeometryLimits(max_bytes=10_000)
+
+    def chunks() -> Iterator[bytes]:
+        for start in range(0, len(body), 1000):
+            yield body[start : start + 1000]
+
+    with make_stapi_client(
+        make_product(limits),
+        raw_body_validation=raw_body_validation,
+        product_dispatch=product_dispatch,
+    ) as client:
+        res = client.post(
+            f"/products/test-spotlight/{path}",
+            content=chunks(),
+            headers={"Content-Type": "application/json"},
+        )
+
+    assert res.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert searches == []
+
+
+def test_order_geometry_simplified(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    payload = {
+        "geometry": polygon(circle(1000)),
+        "datetime": opportunity_search["datetime"],
+        "filter": opportunity_search["filter"],
+        "order_parameters": {"s3_path": "s3://my-bucket"},
+    }
+    limits = GeometryLimits(max_vertices=100, simplify_tolerance=0.01)
+
+    with make_stapi_client(make_product(limits)) as client:
+        res = client.post("/products/test-spotlight/orders", json=payload)
+
+    assert res.status_code == status.HTTP_201_CREATED, res.text
+    geometry = res.json()["properties"]["search_parameters"]["geometry"]
+    assert len(geometry["coordinates"][0]) <= 100
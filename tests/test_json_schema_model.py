@@ -0,0 +1,84 @@
+import gc
+import json
+from typing import Any
+
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from stapi_fastapi.types.json_schema_model import JsonSchemaModel, SchemaRegistry
+
+
+class Schemas(BaseModel):
+    model: JsonSchemaModel
+
+
+def test_schema_generated_once() -> None:
+    calls = []
+
+    class Constraints(BaseModel):
+        off_nadir: int
+
+        @classmethod
+        def model_json_schema(cls, *args, **kwargs) -> dict[str, Any]:
+            calls.append(cls)
+            return super().model_json_schema(*args, **kwargs)
+
+    registry = SchemaRegistry()
+    first = registry.get(Constraints)
+    second = registry.get(Constraints)
+
+    assert first is second
+    assert len(calls) == 1
+    assert json.loads(first.json) == first.schema
+    assert "off_nadir" in first.schema["properties"]
+
+
+def test_identical_schemas_are_shared() -> None:
+    def make_model() -> type[BaseModel]:
+        class Constraints(BaseModel):
+            off_nadir: int
+
+        return Constraints
+
+    class Other(BaseModel):
+        look_angle: int
+
+    registry = SchemaRegistry()
+    first = registry.get(make_model())
+    second = registry.get(make_model())
+    other = registry.get(Other)
+
+    assert first is second
+    assert first.id != other.id
+    assert len(registry) == 2
+
+
+def test_json_schema_model_serialization() -> None:
+    class Constraints(BaseModel):
+        off_nadir: int
+
+    assert Schemas(model=Constraints).model_dump()["model"] == (
+        Constraints.model_json_schema()
+    )
+
+
+def test_products_sharing_constraints_share_etag(stapi_client: TestClient) -> None:
+    spotlight = stapi_client.get("/products/test-spotlight/constraints")
+    provider = stapi_client.get("/products/test-satellite-provider/constraints")
+
+    assert spotlight.content == provider.content
+    assert spotlight.headers["ETag"] == provider.headers["ETag"]
+
+
+def test_schemas_dropped_with_their_models() -> None:
+    class Constraints(BaseModel):
+        off_nadir: int
+
+    registry = SchemaRegistry()
+    registry.get(Constraints)
+    assert len(registry) == 1
+
+    del Constraints
+    gc.collect()
+
+    assert len(registry) == 0
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.routing import NoMatchFound
+
+from stapi_fastapi.routers.link_builder import LinkBuilder
+
+
+@pytest.fixture
+def link_builder() -> LinkBuilder:
+    return LinkBuilder()
+
+
+@pytest.fixture
+def app(link_builder: LinkBuilder) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}", name="get-item")
+    def get_item(item_id: str, request: Request) -> dict[str, str]:
+        return {
+            "indexed": str(link_builder.url_for(request, "get-item", item_id=item_id)),
+            "url_for": str(request.url_for("get-item", item_id=item_id)),
+        }
+
+    @app.get("/names", name="names")
+    def names(request: Request) -> list[str]:
+        return list(link_builder.index(request))
+
+    @app.get("/missing", name="missing")
+    def missing(request: Request) -> None:
+        link_builder.url_for(request, "unknown")
+
+    return app
+
+
+def test_matches_url_for(app: FastAPI, link_builder: LinkBuilder) -> None:
+    with TestClient(app, base_url="http://stapiserver", root_path="/api") as client:
+        body = client.get("/items/abc").json()
+
+    assert body["indexed"] == body["url_for"]
+    assert body["indexed"] == "http://stapiserver/api/items/abc"
+
+
+def test_unknown_name_falls_back_to_url_for(app: FastAPI) -> None:
+    with TestClient(app) as client:
+        with pytest.raises(NoMatchFound):
+            client.get("/missing")
+
+
+def test_index_follows_route_changes(app: FastAPI) -> None:
+    with TestClient(app) as client:
+        assert "get-other" not in client.get("/names").json()
+
+        app.add_api_route("/other", lambda: None, name="get-other")
+        assert "get-other" in client.get("/names").json()
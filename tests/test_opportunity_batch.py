@@ -0,0 +1,355 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from geojson_pydantic import Point
+from geojson_pydantic.types import Position2D
+from returns.maybe import Maybe, Nothing, Some
+from returns.result import Failure, ResultE, Success
+
+from stapi_fastapi.exceptions import PaginationTokenException
+from stapi_fastapi.filters import compile_predicate
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.product_router import ProductRouter
+
+from .backends import mock_create_order
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    provider,
+)
+
+np = pytest.importorskip("numpy")
+
+from stapi_fastapi.models.opportunity import OpportunityBatch  # noqa: E402
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+POINT = Point(type="Point", coordinates=Position2D(longitude=14.4, latitude=56.5))
+
+
+def make_batch(size: int = 5) -> OpportunityBatch:
+    starts = np.datetime64("2025-01-01T00:00") + np.arange(size) * np.timedelta64(
+        1, "h"
+    )
+    return OpportunityBatch(
+        product_id="test-spotlight",
+        start=starts,
+        end=starts + np.timedelta64(30, "m"),
+        geometry=POINT,
+        columns={
+            "off_nadir.minimum": np.arange(size) % 5 * 10,
+            "off_nadir.maximum": np.arange(size) % 5 * 10 + 5,
+            "vehicle_id": np.ones((size, 1), dtype=int),
+            "platform": np.full(size, "platform_id"),
+        },
+        ids=[f"opp-{i}" for i in range(size)],
+    )
+
+
+def polygon(x1: float, y1: float, x2: float, y2: float) -> dict[str, Any]:
+    return {
+        "type": "Polygon",
+        "coordinates": [[[x1, y1], [x2, y1], [x2, y2], [x1, y2], [x1, y1]]],
+    }
+
+
+def ids(batch: OpportunityBatch) -> list[str]:
+    return [o.id for o in batch.to_opportunities(MyOpportunityProperties)]  # type: ignore
+
+
+def test_to_opportunities() -> None:
+    opportunity = (
+        make_batch().take(slice(1, 2)).to_opportunities(MyOpportunityProperties)[0]
+    )
+
+    assert opportunity.id == "opp-1"
+    assert opportunity.geometry == POINT
+    assert isinstance(opportunity.properties, MyOpportunityProperties)
+    assert opportunity.properties.model_dump(mode="json") == {
+        "datetime": "2025-01-01T01:00:00+00:00/2025-01-01T01:30:00+00:00",
+        "product_id": "test-spotlight",
+        "off_nadir": {"minimum": 10, "maximum": 15},
+        "vehicle_id": [1],
+        "platform": "platform_id",
+    }
+
+
+def test_filter_sort_page() -> None:
+    batch = make_batch()
+    batch = batch.filter(batch["off_nadir.maximum"] < 40).sort(
+        "off_nadir.minimum", descending=True
+    )
+    assert ids(batch) == ["opp-3", "opp-2", "opp-1", "opp-0"]
+
+    page, next = batch.page(None, 3)
+    assert ids(page) == ["opp-3", "opp-2", "opp-1"]
+    assert next == Some("3")
+
+    page, next = batch.page("3", 3)
+    assert ids(page) == ["opp-0"]
+    assert next == Nothing
+
+
+@pytest.mark.parametrize("next", ["x", "-1", "4", "1.5"])
+def test_page_invalid_token(next: str) -> None:
+    with pytest.raises(PaginationTokenException, match="Invalid pagination token"):
+        make_batch(4).page(next, 3)
+
+
+def test_sort_is_stable() -> None:
+    batch = make_batch()
+    batch.columns["rank"] = np.array([1, 0, 1, 0, 1])
+
+    assert ids(batch.sort("rank")) == ["opp-1", "opp-3", "opp-0", "opp-2", "opp-4"]
+    assert ids(batch.sort("rank", descending=True)) == [
+        "opp-0",
+        "opp-2",
+        "opp-4",
+        "opp-1",
+        "opp-3",
+    ]
+
+
+def test_overlapping() -> None:
+    batch = make_batch()
+    mask = batch.overlapping(
+        (START + timedelta(minutes=45), START + timedelta(hours=2))
+    )
+
+    assert ids(batch.filter(mask)) == ["opp-1", "opp-2"]
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        {"op": "<", "args": [{"property": "off_nadir.minimum"}, 25]},
+        {
+            "op": "and",
+            "args": [
+                {
+                    "op": "between",
+                    "args": [{"property": "off_nadir.maximum"}, [10, 30]],
+                },
+                {
+                    "op": "not",
+                    "args": [{"op": "=", "args": [{"property": "id"}, "opp-2"]}],
+                },
+            ],
+        },
+        {"op": "in", "args": [{"property": "id"}, ["opp-0", "opp-4", "opp-9"]]},
+        {"op": "like", "args": [{"property": "platform"}, "platform%"]},
+        {"op": "isNull", "args": [{"property": "missing"}]},
+        {"op": ">", "args": [{"property": "missing"}, 1]},
+        {"op": ">", "args": [{"property": "platform"}, 1]},
+        {"op": "between", "args": [{"property": "platform"}, [1, 2]]},
+        {
+            "op": "t_intersects",
+            "args": [
+                {"property": "datetime"},
+                {"interval": ["2025-01-01T00:45:00Z", "2025-01-01T02:00:00Z"]},
+            ],
+        },
+        {
+            "op": "s_intersects",
+            "args": [{"property": "geometry"}, polygon(14, 56, 15, 57)],
+        },
+        {
+            "op": "s_disjoint",
+            "args": [{"property": "geometry"}, polygon(0, 0, 1, 1)],
+        },
+    ],
+)
+def test_matching(filter: dict[str, Any]) -> None:
+    batch = make_batch()
+    opportunities = batch.to_opportunities(MyOpportunityProperties)
+    parsed = OpportunityPayload.model_validate(
+        {
+            "datetime": "2025-01-01T00:00:00Z/2025-01-02T00:00:00Z",
+            "geometry": POINT,
+            "filter": filter,
+        },
+        strict=False,
+    ).filter
+    predicate = compile_predicate(parsed)
+
+    mask = batch.matching(parsed)
+
+    assert mask.dtype == np.bool_
+    assert mask.tolist() == [predicate(o) for o in opportunities]
+
+
+def test_spatial_operators_are_exact() -> None:
+    # the point lies within the bounding box of the polygon, but outside of it
+    l_shape = {
+        "type": "Polygon",
+        "coordinates": [
+            [
+                [14, 56],
+                [15, 56],
+                [15, 56.2],
+                [14.2, 56.2],
+                [14.2, 57],
+                [14, 57],
+                [14, 56],
+            ]
+        ],
+    }
+    filter = OpportunityPayload.model_validate(
+        {
+            "datetime": "2025-01-01T00:00:00Z/2025-01-02T00:00:00Z",
+            "geometry": POINT,
+            "filter": {
+                "op": "s_intersects",
+                "args": [{"property": "geometry"}, l_shape],
+            },
+        },
+        strict=False,
+    ).filter
+
+    assert not make_batch().matching(filter).any()
+
+
+def test_datetimes() -> None:
+    batch = OpportunityBatch(
+        product_id="test-spotlight",
+        start=[START.astimezone(tz=None)],
+        end=[START + timedelta(hours=1)],
+        geometry=[POINT],
+    )
+    assert batch.start[0] == np.datetime64("2025-01-01T00:00")
+
+    with pytest.raises(ValueError, match="timezone aware"):
+        OpportunityBatch(
+            product_id="test-spotlight",
+            start=[datetime(2025, 1, 1)],
+            end=[datetime(2025, 1, 2)],
+            geometry=POINT,
+        )
+
+    with pytest.raises(ValueError, match="end before start"):
+        OpportunityBatch(
+            product_id="test-spotlight",
+            start=[START],
+            end=[START - timedelta(hours=1)],
+            geometry=POINT,
+        )
+
+
+def test_column_lengths() -> None:
+    with pytest.raises(ValueError, match="'platform' has 1 values, expected 2"):
+        OpportunityBatch(
+            product_id="test-spotlight",
+            start=[START, START],
+            end=[START, START],
+            geometry=POINT,
+            columns={"platform": ["platform_id"]},
+        )
+
+
+async def search_batch(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    batch = make_batch(1000)
+    batch = batch.filter(batch.overlapping(search.datetime))
+    try:
+        page, next_token = batch.sort("start").page(next, limit)
+    except PaginationTokenException as e:
+        return Failure(e)
+    return Success(
+        (
+            page.to_opportunities(product_router.product.opportunity_properties),
+            next_token,
+        )
+    )
+
+
+async def search_failing(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    return Failure(ValueError("Unexpected backend error"))
+
+
+product_test_spotlight_batch_opportunity = Product(
+    id="test-spotlight",
+    title="Test Spotlight Product",
+    description="Test product for test spotlight",
+    license="CC-BY-4.0",
+    keywords=["test", "satellite"],
+    providers=[provider],
+    links=[],
+    create_order=mock_create_order,
+    search_opportunities=search_batch,
+    constraints=MyProductConstraints,
+    opportunity_properties=MyOpportunityProperties,
+    order_parameters=MyOrderParameters,
+)
+
+
+@pytest.mark.mock_products([product_test_spotlight_batch_opportunity])
+def test_search_opportunities(
+    stapi_client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["datetime"] = "2025-01-02T00:00:00Z/2025-01-03T00:00:00Z"
+    opportunity_search["limit"] = 30
+    res = stapi_client.post(
+        "/products/test-spotlight/opportunities", json=opportunity_search
+    )
+
+    assert res.status_code == status.HTTP_200_OK
+    body = res.json()
+    assert [feature["id"] for feature in body["features"]] == [
+        f"opp-{i}" for i in range(24, 49)
+    ]
+
+
+@pytest.mark.mock_products([product_test_spotlight_batch_opportunity])
+def test_search_opportunities_invalid_token(
+    stapi_client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["next"] = "-1"
+    res = stapi_client.post(
+        "/products/test-spotlight/opportunities", json=opportunity_search
+    )
+
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.mock_products(
+    [
+        Product(
+            id="test-spotlight",
+            title="Test Spotlight Product",
+            description="Test product for test spotlight",
+            license="CC-BY-4.0",
+            keywords=["test", "satellite"],
+            providers=[provider],
+            links=[],
+            create_order=mock_create_order,
+            search_opportunities=search_failing,
+            constraints=MyProductConstraints,
+            opportunity_properties=MyOpportunityProperties,
+            order_parameters=MyOrderParameters,
+        )
+    ]
+)
+def test_search_opportunities_value_error(
+    stapi_client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    res = stapi_client.post(
+        "/products/test-spotlight/opportunities", json=opportunity_search
+    )
+
+    # only pagination token failures respond 404
+    assert res.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
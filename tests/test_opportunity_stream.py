@@ -0,0 +1,137 @@
+import json
+from typing import Any
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from stapi_fastapi.constants import TYPE_GEOJSON, TYPE_NDJSON
+from stapi_fastapi.models.opportunity import Opportunity
+from stapi_fastapi.models.product import Product
+
+from .backends import (
+    mock_create_order,
+    mock_search_opportunities,
+    mock_stream_opportunities,
+)
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    create_mock_opportunity,
+    pagination_tester,
+    product_test_spotlight_sync_opportunity,
+    provider,
+)
+
+product_test_spotlight_stream_opportunity = Product(
+    id="test-spotlight-stream",
+    title="Test Spotlight Product",
+    description="Test product for test spotlight",
+    license="CC-BY-4.0",
+    keywords=["test", "satellite"],
+    providers=[provider],
+    links=[],
+    create_order=mock_create_order,
+    stream_opportunities=mock_stream_opportunities,
+    constraints=MyProductConstraints,
+    opportunity_properties=MyOpportunityProperties,
+    order_parameters=MyOrderParameters,
+)
+
+products = [
+    product_test_spotlight_sync_opportunity,
+    product_test_spotlight_stream_opportunity,
+]
+
+
+@pytest.fixture
+def mock_opportunities() -> list[Opportunity]:
+    return [create_mock_opportunity() for _ in range(3)]
+
+
+@pytest.mark.mock_products(products)
+def test_stream_matches_search(
+    stapi_client: TestClient, opportunity_search: dict[str, Any]
+) -> None:
+    search = stapi_client.post(
+        "/products/test-spotlight/opportunities", json=opportunity_search
+    )
+    stream = stapi_client.post(
+        "/products/test-spotlight-stream/opportunities", json=opportunity_search
+    )
+
+    assert stream.status_code == status.HTTP_200_OK
+    assert stream.headers["Content-Type"] == TYPE_GEOJSON
+    body = stream.json()
+    expected = search.json()
+    assert body["features"] == expected["features"]
+    assert [link["rel"] for link in body["links"]] == ["create-order"]
+
+
+@pytest.mark.mock_products(products)
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_stream_pagination(
+    limit: int,
+    stapi_client: TestClient,
+    opportunity_search: dict[str, Any],
+    mock_opportunities: list[Opportunity],
+) -> None:
+    pagination_tester(
+        stapi_client=stapi_client,
+        url="/products/test-spotlight-stream/opportunities",
+        method="POST",
+        limit=limit,
+        target="features",
+        expected_returns=[x.model_dump(mode="json") for x in mock_opportunities],
+        body=opportunity_search,
+    )
+
+
+@pytest.mark.mock_products(products)
+def test_stream_ndjson(
+    stapi_client: TestClient,
+    opportunity_search: dict[str, Any],
+    mock_opportunities: list[Opportunity],
+) -> None:
+    res = stapi_client.post(
+        "/products/test-spotlight-stream/opportunities",
+        json=opportunity_search,
+        headers={"Accept": TYPE_NDJSON},
+    )
+
+    assert res.status_code == status.HTTP_200_OK
+    assert res.headers["Content-Type"] == TYPE_NDJSON
+    assert [json.loads(line) for line in res.text.splitlines()] == [
+        x.model_dump(mode="json") for x in mock_opportunities
+    ]
+
+
+def test_search_and_stream_are_exclusive() -> None:
+    with pytest.raises(ValueError):
+        Product(
+            id="test-spotlight",
+            license="CC-BY-4.0",
+            create_order=mock_create_order,
+            search_opportunities=mock_search_opportunities,
+            stream_opportunities=mock_stream_opportunities,
+            constraints=MyProductConstraints,
+            opportunity_properties=MyOpportunityProperties,
+            order_parameters=MyOrderParameters,
+        )
+
+
+@pytest.mark.mock_products(products)
+def test_stream_product_dispatch(
+    stapi_client_product_dispatch: TestClient,
+    opportunity_search: dict[str, Any],
+    mock_opportunities: list[Opportunity],
+) -> None:
+    res = stapi_client_product_dispatch.post(
+        "/products/test-spotlight-stream/opportunities", json=opportunity_search
+    )
+
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json()["features"] == [
+        x.model_dump(mode="json") for x in mock_opportunities
+    ]
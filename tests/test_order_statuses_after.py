@@ -0,0 +1,110 @@
+from collections.abc import Callable, Iterator
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from stapi_fastapi.models.order import OrderStatusCode
+
+from .backends import mock_get_order_statuses_after
+from .shared import InMemoryOrderDB
+from .test_order_statuses_by_ids import accept, create_order
+
+
+@pytest.fixture
+def orders_db() -> InMemoryOrderDB:
+    return InMemoryOrderDB()
+
+
+@pytest.fixture
+def client(
+    make_stapi_client: Callable[..., TestClient], orders_db: InMemoryOrderDB
+) -> Iterator[TestClient]:
+    with make_stapi_client(
+        state={"_orders_db": orders_db},
+        get_order_statuses_after=mock_get_order_statuses_after,
+    ) as client:
+        yield client
+
+
+def status_codes(res) -> list[str]:
+    return [s["status_code"] for s in res.json()["statuses"]]
+
+
+def test_poll_with_cursor(client: TestClient, orders_db: InMemoryOrderDB) -> None:
+    order_id = create_order(client)
+    url = f"/orders/{order_id}/statuses"
+
+    res = client.get(url, params={"after": "0"})
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert status_codes(res) == [OrderStatusCode.received]
+    after = res.json()["after"]
+
+    res = client.get(url, params={"after": after})
+
+    assert status_codes(res) == []
+    assert res.json()["after"] == after
+
+    accept(orders_db, order_id)
+    res = client.get(url, params={"after": after})
+
+    assert status_codes(res) == [OrderStatusCode.accepted]
+    assert res.json()["after"] != after
+
+
+def test_poll_since(client: TestClient, orders_db: InMemoryOrderDB) -> None:
+    order_id = create_order(client)
+    since = orders_db.get_order_statuses(order_id)[-1].timestamp  # type: ignore[index]
+    accept(orders_db, order_id)
+
+    res = client.get(
+        f"/orders/{order_id}/statuses", params={"since": since.isoformat()}
+    )
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert status_codes(res) == [OrderStatusCode.accepted]
+    assert res.json()["after"] == "2"
+
+
+def test_full_history_has_no_cursor(client: TestClient) -> None:
+    order_id = create_order(client)
+
+    res = client.get(f"/orders/{order_id}/statuses")
+
+    assert status_codes(res) == [OrderStatusCode.received]
+    assert "after" not in res.json()
+
+
+@pytest.mark.parametrize(
+    "params, status_code",
+    [
+        ({"after": "invalid"}, status.HTTP_404_NOT_FOUND),
+        (
+            {"after": "0", "since": "2025-01-01T00:00:00Z"},
+            status.HTTP_400_BAD_REQUEST,
+        ),
+    ],
+)
+def test_invalid_request(
+    client: TestClient, params: dict[str, str], status_code: int
+) -> None:
+    order_id = create_order(client)
+
+    res = client.get(f"/orders/{order_id}/statuses", params=params)
+
+    assert res.status_code == status_code
+
+
+def test_unknown_order(client: TestClient) -> None:
+    res = client.get("/orders/unknown/statuses", params={"after": "0"})
+
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_not_supported(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client() as client:
+        order_id = create_order(client)
+        res = client.get(f"/orders/{order_id}/statuses", params={"after": "0"})
+
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,106 @@
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from returns.result import Failure, ResultE
+
+from stapi_fastapi.models.order import OrderStatus, OrderStatusCode
+
+from .backends import mock_get_order_statuses_by_ids
+from .shared import InMemoryOrderDB
+from .test_conditional_requests import ORDER_PAYLOAD
+
+
+async def failing_get_order_statuses_by_ids(
+    order_ids: list[str], since: datetime | None, request: Request
+) -> ResultE[dict[str, list[OrderStatus]]]:
+    return Failure(Exception("backend unavailable"))
+
+
+@pytest.fixture
+def orders_db() -> InMemoryOrderDB:
+    return InMemoryOrderDB()
+
+
+@pytest.fixture
+def client(
+    make_stapi_client: Callable[..., TestClient], orders_db: InMemoryOrderDB
+) -> Iterator[TestClient]:
+    with make_stapi_client(
+        state={"_orders_db": orders_db},
+        get_order_statuses_by_ids=mock_get_order_statuses_by_ids,
+    ) as client:
+        yield client
+
+
+def create_order(client: TestClient) -> str:
+    res = client.post("/products/test-spotlight/orders", json=ORDER_PAYLOAD)
+    assert res.status_code == status.HTTP_201_CREATED
+    return res.json()["id"]
+
+
+def accept(orders_db: InMemoryOrderDB, order_id: str) -> OrderStatus:
+    order_status = OrderStatus(
+        timestamp=datetime.now(timezone.utc) + timedelta(seconds=1),
+        status_code=OrderStatusCode.accepted,
+    )
+    orders_db.put_order_status(order_id, order_status)
+    return order_status
+
+
+def test_latest_statuses(client: TestClient, orders_db: InMemoryOrderDB) -> None:
+    first, second = create_order(client), create_order(client)
+    accepted = accept(orders_db, second)
+
+    res = client.get("/orders/statuses", params={"ids": f"{second},unknown,{first}"})
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    statuses = res.json()["statuses"]
+    assert list(statuses) == [second, first]
+    assert [s["status_code"] for s in statuses[first]] == ["received"]
+    assert [s["status_code"] for s in statuses[second]] == ["accepted"]
+    assert datetime.fromisoformat(res.json()["next_since"]) == accepted.timestamp
+
+
+def test_statuses_since(client: TestClient, orders_db: InMemoryOrderDB) -> None:
+    first, second = create_order(client), create_order(client)
+    since = orders_db.get_order_statuses(second)[-1].timestamp  # type: ignore[index]
+    accepted = accept(orders_db, first)
+
+    res = client.post(
+        "/orders/statuses", json={"ids": [first, second], "since": since.isoformat()}
+    )
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert res.json()["statuses"] == {
+        first: [accepted.model_dump(mode="json")],
+        second: [],
+    }
+    next_since = res.json()["next_since"]
+
+    res = client.post(
+        "/orders/statuses", json={"ids": [first, second], "since": next_since}
+    )
+
+    assert res.json() == {
+        "statuses": {first: [], second: []},
+        "next_since": next_since,
+    }
+
+
+def test_not_supported(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client() as client:
+        res = client.get("/orders/statuses", params={"ids": "a"})
+
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_backend_failure(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client(
+        get_order_statuses_by_ids=failing_get_order_statuses_by_ids
+    ) as client:
+        res = client.get("/orders/statuses", params={"ids": "a,b"})
+
+    assert res.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,75 @@
+import json
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from stapi_fastapi.constants import TYPE_GEOJSON, TYPE_NDJSON
+
+from .backends import mock_stream_orders
+from .shared import pagination_tester
+from .test_conditional_requests import ORDER_PAYLOAD
+
+
+@pytest.fixture
+def stapi_client_stream_orders(
+    make_stapi_client: Callable[..., TestClient],
+) -> Generator[TestClient, None, None]:
+    with make_stapi_client(stream_orders=mock_stream_orders) as client:
+        yield client
+
+
+@pytest.fixture
+def orders(stapi_client_stream_orders: TestClient) -> list[dict[str, Any]]:
+    orders = []
+    for _ in range(3):
+        res = stapi_client_stream_orders.post(
+            "/products/test-spotlight/orders", json=ORDER_PAYLOAD
+        )
+        assert res.status_code == status.HTTP_201_CREATED
+        orders.append(res.json())
+    return orders
+
+
+def test_empty_orders(stapi_client_stream_orders: TestClient) -> None:
+    res = stapi_client_stream_orders.get("/orders")
+    assert res.status_code == status.HTTP_200_OK
+    assert res.headers["Content-Type"] == TYPE_GEOJSON
+    assert res.json() == {"type": "FeatureCollection", "features": [], "links": []}
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_orders_pagination(
+    limit: int, orders: list[dict[str, Any]], stapi_client_stream_orders: TestClient
+) -> None:
+    pagination_tester(
+        stapi_client=stapi_client_stream_orders,
+        url="/orders",
+        method="GET",
+        limit=limit,
+        target="features",
+        expected_returns=orders,
+    )
+
+
+def test_orders_ndjson(
+    orders: list[dict[str, Any]], stapi_client_stream_orders: TestClient
+) -> None:
+    res = stapi_client_stream_orders.get(
+        "/orders", params={"limit": 2}, headers={"Accept": TYPE_NDJSON}
+    )
+    assert res.status_code == status.HTTP_200_OK
+    assert res.headers["Content-Type"] == TYPE_NDJSON
+    assert [json.loads(line) for line in res.text.splitlines()] == orders[:2]
+
+    next_url = res.links["next"]["url"]
+    res = stapi_client_stream_orders.get(next_url, headers={"Accept": TYPE_NDJSON})
+    assert [json.loads(line) for line in res.text.splitlines()] == orders[2:]
+    assert "Link" not in res.headers
+
+
+def test_token_not_found(stapi_client_stream_orders: TestClient) -> None:
+    res = stapi_client_stream_orders.get("/orders", params={"next": "a_token"})
+    assert res.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,119 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from returns.maybe import Maybe
+from returns.result import Failure, ResultE
+
+from stapi_fastapi.models.concurrency_limit import ConcurrencyLimit
+from stapi_fastapi.models.order import Order
+from stapi_fastapi.routers.root_router import MAX_ORDER_IDS
+
+from .backends import (
+    mock_get_order,
+    mock_get_orders_by_ids,
+)
+from .test_conditional_requests import ORDER_PAYLOAD
+
+get_order_calls: list[str] = []
+
+
+async def get_order(order_id: str, request: Request) -> ResultE[Maybe[Order]]:
+    get_order_calls.append(order_id)
+    return await mock_get_order(order_id, request)
+
+
+async def failing_get_order(order_id: str, request: Request) -> ResultE[Maybe[Order]]:
+    return Failure(Exception("backend unavailable"))
+
+
+@pytest.fixture(autouse=True)
+def clear_get_order_calls() -> None:
+    get_order_calls.clear()
+
+
+def create_orders(client: TestClient, count: int) -> list[dict[str, Any]]:
+    orders = []
+    for _ in range(count):
+        res = client.post("/products/test-spotlight/orders", json=ORDER_PAYLOAD)
+        assert res.status_code == status.HTTP_201_CREATED
+        orders.append(res.json())
+    return orders
+
+
+@pytest.mark.parametrize("by_ids", [False, True])
+def test_get_orders_by_ids(
+    make_stapi_client: Callable[..., TestClient], by_ids: bool
+) -> None:
+    with make_stapi_client(
+        get_order=get_order,
+        get_orders_by_ids=mock_get_orders_by_ids if by_ids else None,
+    ) as client:
+        orders = create_orders(client, 3)
+        ids = [orders[2]["id"], "unknown", orders[0]["id"], orders[2]["id"]]
+
+        res = client.get("/orders", params={"ids": ",".join(ids)})
+
+        assert res.status_code == status.HTTP_200_OK, res.text
+        assert res.json()["features"] == [orders[2], orders[0]]
+        # the backend is called once per distinct id without `get_orders_by_ids`
+        assert sorted(get_order_calls) == ([] if by_ids else sorted(set(ids)))
+
+
+def test_lookups_within_concurrency_limit(
+    make_stapi_client: Callable[..., TestClient],
+) -> None:
+    active: list[str] = []
+    max_active = 0
+
+    async def slow_get_order(order_id: str, request: Request) -> ResultE[Maybe[Order]]:
+        nonlocal max_active
+        active.append(order_id)
+        max_active = max(max_active, len(active))
+        await asyncio.sleep(0.01)
+        active.remove(order_id)
+        return await mock_get_order(order_id, request)
+
+    with make_stapi_client(
+        get_order=slow_get_order,
+        concurrency_limit=ConcurrencyLimit(max_concurrency=2),
+    ) as client:
+        orders = create_orders(client, 5)
+
+        res = client.get("/orders", params={"ids": ",".join(o["id"] for o in orders)})
+
+        assert res.status_code == status.HTTP_200_OK, res.text
+        assert res.json()["features"] == orders
+        assert max_active == 2
+
+
+def test_search_orders(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client(
+        get_order=get_order, get_orders_by_ids=mock_get_orders_by_ids
+    ) as client:
+        orders = create_orders(client, 2)
+
+        res = client.post("/orders/search", json={"ids": [orders[1]["id"]]})
+
+        assert res.status_code == status.HTTP_200_OK, res.text
+        assert res.json()["features"] == [orders[1]]
+
+
+def test_too_many_ids(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client(get_order=get_order) as client:
+        res = client.post(
+            "/orders/search", json={"ids": [str(i) for i in range(MAX_ORDER_IDS + 1)]}
+        )
+
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert get_order_calls == []
+
+
+def test_backend_failure(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client(get_order=failing_get_order) as client:
+        res = client.get("/orders", params={"ids": "a,b"})
+
+        assert res.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,182 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from stapi_fastapi.models.opportunity import OpportunityCollection
+
+from .shared import find_link, product_test_spotlight
+
+
+def test_single_set_of_product_routes(
+    stapi_client_product_dispatch: TestClient,
+) -> None:
+    paths = [
+        route.path  # type: ignore
+        for route in stapi_client_product_dispatch.app.routes  # type: ignore
+        if route.path.startswith("/products/")  # type: ignore
+    ]
+    assert sorted(paths) == [
+        "/products/{product_id}",
+        "/products/{product_id}/constraints",
+        "/products/{product_id}/opportunities",
+        "/products/{product_id}/order-parameters",
+        "/products/{product_id}/orders",
+    ]
+
+
+@pytest.mark.parametrize("product_id", ["test-spotlight", "test-satellite-provider"])
+def test_product_links(
+    product_id: str, stapi_client_product_dispatch: TestClient, assert_link
+) -> None:
+    res = stapi_client_product_dispatch.get(f"/products/{product_id}")
+    assert res.status_code == status.HTTP_200_OK
+
+    body = res.json()
+    assert body["id"] == product_id
+
+    url = f"GET /products/{product_id}"
+    assert_link(url, body, "self", f"/products/{product_id}")
+    assert_link(url, body, "constraints", f"/products/{product_id}/constraints")
+    assert_link(
+        url, body, "order-parameters", f"/products/{product_id}/order-parameters"
+    )
+    assert_link(url, body, "opportunities", f"/products/{product_id}/opportunities")
+    assert_link(
+        url, body, "create-order", f"/products/{product_id}/orders", method="POST"
+    )
+
+
+def test_products_listing(stapi_client_product_dispatch: TestClient) -> None:
+    res = stapi_client_product_dispatch.get("/products")
+    assert res.status_code == status.HTTP_200_OK
+    assert [p["id"] for p in res.json()["products"]] == [
+        "test-spotlight",
+        "test-satellite-provider",
+    ]
+
+
+def test_product_schemas(stapi_client_product_dispatch: TestClient) -> None:
+    res = stapi_client_product_dispatch.get("/products/test-spotlight/constraints")
+    assert res.status_code == status.HTTP_200_OK
+    assert "off_nadir" in res.json()["properties"]
+
+    res = stapi_client_product_dispatch.get("/products/test-spotlight/order-parameters")
+    assert res.status_code == status.HTTP_200_OK
+    assert "s3_path" in res.json()["properties"]
+
+
+def test_unknown_product(stapi_client_product_dispatch: TestClient) -> None:
+    res = stapi_client_product_dispatch.get("/products/unknown")
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+    assert res.json() == {"detail": "Not Found"}
+
+    res = stapi_client_product_dispatch.post("/products/unknown/orders", json={})
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+    assert res.json() == {"detail": "Not Found"}
+
+
+def test_order_payloads_documented(stapi_client_product_dispatch: TestClient) -> None:
+    openapi = stapi_client_product_dispatch.get("/openapi.json").json()
+
+    body = openapi["paths"]["/products/{product_id}/orders"]["post"]["requestBody"]
+    schema = body["content"]["application/json"]["schema"]
+    schemas = openapi["components"]["schemas"]
+    # the products' order payload models, of which there is one here
+    models = [
+        schemas[option["$ref"].removeprefix("#/components/schemas/")]
+        for option in schema.get("anyOf", [schema])
+    ]
+    assert models
+    for model in models:
+        parameters = model["properties"]["order_parameters"]["$ref"]
+        assert "s3_path" in schemas[parameters.split("/")[-1]]["properties"]
+
+
+def test_create_order(stapi_client_product_dispatch: TestClient) -> None:
+    payload = {
+        "geometry": {"type": "Point", "coordinates": [14.4, 56.5]},
+        "datetime": "2024-10-09T18:55:33Z/2024-10-12T18:55:33Z",
+        "order_parameters": {"s3_path": "s3://my-bucket"},
+    }
+    res = stapi_client_product_dispatch.post(
+        "/products/test-spotlight/orders", json=payload
+    )
+    assert res.status_code == status.HTTP_201_CREATED, res.text
+    assert res.headers["Content-Type"] == "application/geo+json"
+
+    order = res.json()
+    assert order["properties"]["product_id"] == "test-spotlight"
+    link = find_link(order["links"], "self")
+    assert link
+    assert res.headers["Location"] == link["href"]
+
+
+def test_create_order_validates_product_order_parameters(
+    stapi_client_product_dispatch: TestClient,
+) -> None:
+    payload = {
+        "geometry": {"type": "Point", "coordinates": [14.4, 56.5]},
+        "datetime": "2024-10-09T18:55:33Z/2024-10-12T18:55:33Z",
+        "order_parameters": {"unknown": "value"},
+    }
+    res = stapi_client_product_dispatch.post(
+        "/products/test-spotlight/orders", json=payload
+    )
+    assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert res.json()["detail"][0]["loc"] == ["body", "order_parameters", "unknown"]
+
+
+def test_search_opportunities(
+    stapi_client_product_dispatch: TestClient,
+    opportunity_search: dict[str, Any],
+    assert_link,
+) -> None:
+    url = "/products/test-spotlight/opportunities"
+    res = stapi_client_product_dispatch.post(url, json=opportunity_search)
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert res.headers["Content-Type"] == "application/geo+json"
+
+    body = res.json()
+    assert len(body["features"]) == 1
+    assert body["features"][0]["properties"]["other_thing"] == "abcd1234"
+    OpportunityCollection(**body)
+
+    assert_link(
+        f"POST {url}",
+        body,
+        "create-order",
+        "/products/test-spotlight/orders",
+        method="POST",
+    )
+
+
+@pytest.mark.mock_products([product_test_spotlight])
+def test_search_opportunities_not_supported(
+    stapi_client_product_dispatch: TestClient,
+    opportunity_search: dict[str, Any],
+) -> None:
+    res = stapi_client_product_dispatch.post(
+        "/products/test-spotlight/opportunities", json=opportunity_search
+    )
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "options", [{"direct_serialization": True}, {"trusted_backend": True}]
+)
+def test_search_opportunities_serialized_once(
+    stapi_client_product_dispatch: TestClient,
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    options: dict[str, Any],
+) -> None:
+    url = "/products/test-spotlight/opportunities"
+    validated = stapi_client_product_dispatch.post(url, json=opportunity_search)
+    with make_stapi_client(product_dispatch=True, **options) as client:
+        direct = client.post(url, json=opportunity_search)
+
+    assert direct.status_code == status.HTTP_200_OK
+    assert direct.content == validated.content
@@ -0,0 +1,120 @@
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def order_payload(opportunity_search: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "geometry": opportunity_search["geometry"],
+        "datetime": opportunity_search["datetime"],
+        "filter": opportunity_search["filter"],
+        "order_parameters": {"s3_path": "s3://my-bucket"},
+    }
+
+
+@pytest.mark.parametrize("product_dispatch", [False, True])
+def test_search_matches_parsed_body(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    product_dispatch: bool,
+) -> None:
+    url = "/products/test-spotlight/opportunities"
+    # both clients share the opportunities
+    with (
+        make_stapi_client(product_dispatch=product_dispatch) as parsed,
+        make_stapi_client(
+            raw_body_validation=True, product_dispatch=product_dispatch
+        ) as raw,
+    ):
+        expected = parsed.post(url, json=opportunity_search)
+        res = raw.post(url, json=opportunity_search)
+
+    assert res.status_code == status.HTTP_200_OK, res.text
+    assert res.json() == expected.json()
+
+
+@pytest.mark.parametrize("product_dispatch", [False, True])
+def test_create_order(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    product_dispatch: bool,
+) -> None:
+    with make_stapi_client(
+        raw_body_validation=True, product_dispatch=product_dispatch
+    ) as client:
+        res = client.post(
+            "/products/test-spotlight/orders", json=order_payload(opportunity_search)
+        )
+
+        assert res.status_code == status.HTTP_201_CREATED, res.text
+        search_parameters = res.json()["properties"]["search_parameters"]
+        assert search_parameters["filter"] == opportunity_search["filter"]
+
+
+@pytest.mark.parametrize("product_dispatch", [False, True])
+def test_invalid_bodies(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    product_dispatch: bool,
+) -> None:
+    with make_stapi_client(
+        raw_body_validation=True, product_dispatch=product_dispatch
+    ) as client:
+        payload = order_payload(opportunity_search)
+        payload["order_parameters"] = {"s3_path": 1}
+        del opportunity_search["geometry"]
+
+        res = client.post("/products/test-spotlight/orders", json=payload)
+        assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert res.json()["detail"][0]["loc"] == ["body", "order_parameters", "s3_path"]
+
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+        assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert res.json()["detail"][0]["loc"] == ["body", "geometry"]
+
+        res = client.post("/products/test-spotlight/opportunities", content=b"{")
+        assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert res.json()["detail"][0]["type"] == "json_invalid"
+        assert "url" not in res.json()["detail"][0]
+
+
+def refs(schema: Any) -> Iterator[str]:
+    if isinstance(schema, dict):
+        for key, value in schema.items():
+            if key == "$ref":
+                yield value
+            else:
+                yield from refs(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            yield from refs(value)
+
+
+@pytest.mark.parametrize("product_dispatch", [False, True])
+def test_request_bodies_documented(
+    make_stapi_client: Callable[..., TestClient], product_dispatch: bool
+) -> None:
+    with make_stapi_client(
+        raw_body_validation=True, product_dispatch=product_dispatch
+    ) as client:
+        openapi = client.get("/openapi.json").json()
+        prefix = (
+            "/products/{product_id}" if product_dispatch else "/products/test-spotlight"
+        )
+
+        for path in [f"{prefix}/opportunities", f"{prefix}/orders"]:
+            body = openapi["paths"][path]["post"]["requestBody"]
+            assert body["required"]
+            schema = body["content"]["application/json"]["schema"]
+            name = schema["$ref"].removeprefix("#/components/schemas/")
+            properties = openapi["components"]["schemas"][name]["properties"]
+            assert {"datetime", "geometry"} <= set(properties)
+
+        for ref in refs(openapi):
+            name = ref.removeprefix("#/components/schemas/")
+            assert name in openapi["components"]["schemas"], ref
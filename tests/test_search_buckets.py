@@ -0,0 +1,264 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from geojson_pydantic import Point
+from geojson_pydantic.types import Position2D
+from pygeofilter import ast
+from returns.maybe import Maybe, Nothing, Some
+from returns.result import ResultE, Success
+
+from stapi_fastapi.filters.predicate import BBOX_RELATIONS, to_bbox
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.models.search_buckets import SearchBuckets
+from stapi_fastapi.routers import search_buckets as search_buckets_module
+from stapi_fastapi.routers.product_router import ProductRouter
+from stapi_fastapi.routers.root_router import RootRouter
+from stapi_fastapi.routers.search_buckets import cell_range
+from stapi_fastapi.routers.search_cache import MemorySearchCache
+
+from .backends import mock_create_order
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    OffNadirRange,
+    make_root_router,
+    provider,
+)
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+END = datetime(2025, 1, 2, tzinfo=UTC)
+INTERSECTS = BBOX_RELATIONS[ast.GeometryIntersects]
+
+searches: list[OpportunityPayload] = []
+
+
+def create_opportunity(
+    longitude: float, latitude: float, start: datetime = START
+) -> Opportunity:
+    return Opportunity(
+        id=f"{longitude},{latitude}",
+        type="Feature",
+        geometry=Point(
+            type="Point",
+            coordinates=Position2D(longitude=longitude, latitude=latitude),
+        ),
+        properties=MyOpportunityProperties(
+            product_id="test-spotlight",
+            datetime=(start, END),
+            off_nadir=OffNadirRange(minimum=20, maximum=22),
+            vehicle_id=[1],
+            platform="platform_id",
+        ),
+    )
+
+
+opportunities = [
+    create_opportunity(0.5, 0.5),
+    create_opportunity(1.5, 0.5),
+    create_opportunity(2.5, 0.5),
+]
+
+
+async def search_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    searches.append(search)
+    box = to_bbox(search.geometry)
+    found = [o for o in opportunities if INTERSECTS(to_bbox(o.geometry), box)]
+    if len(found) > limit:
+        return Success((found[:limit], Some(str(limit))))
+    return Success((found, Nothing))
+
+
+def make_router(search_buckets: SearchBuckets) -> RootRouter:
+    product = Product(
+        id="test-spotlight",
+        title="Test Spotlight Product",
+        description="Test product for test spotlight",
+        license="CC-BY-4.0",
+        keywords=["test", "satellite"],
+        providers=[provider],
+        links=[],
+        create_order=mock_create_order,
+        search_opportunities=search_opportunities,
+        constraints=MyProductConstraints,
+        opportunity_properties=MyOpportunityProperties,
+        order_parameters=MyOrderParameters,
+        search_buckets=search_buckets,
+    )
+    return make_root_router(product, search_cache=MemorySearchCache())
+
+
+def box_search(min_x: float, max_x: float) -> dict[str, Any]:
+    return {
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [[min_x, 0.2], [max_x, 0.2], [max_x, 0.8], [min_x, 0.8], [min_x, 0.2]]
+            ],
+        },
+        "datetime": f"{START.isoformat()}/{END.isoformat()}",
+        "limit": 10,
+    }
+
+
+def feature_ids(response: Any) -> list[str]:
+    return [feature["id"] for feature in response.json()["features"]]
+
+
+@pytest.fixture(autouse=True)
+def clear_searches() -> None:
+    searches.clear()
+
+
+def test_overlapping_search_only_searches_uncached_cells(
+    make_stapi_client: Callable[..., TestClient],
+) -> None:
+    root_router = make_router(SearchBuckets(ttl=60))
+
+    with make_stapi_client(root_router=root_router) as client:
+        url = "/products/test-spotlight/opportunities"
+        first = client.post(url, json=box_search(0.2, 1.8))
+        cells_searched = len(searches)
+        second = client.post(url, json=box_search(1.2, 2.8))
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert feature_ids(first) == ["0.5,0.5", "1.5,0.5"]
+    assert feature_ids(second) == ["1.5,0.5", "2.5,0.5"]
+    assert cells_searched == 2
+    # only the cell from longitude 2 to 3 is searched for the second search
+    assert len(searches) == 3
+    assert to_bbox(searches[2].geometry) == (2.0, 0.0, 3.0, 1.0)
+    assert searches[2].datetime == (START, END)
+    stats = root_router.product_routers["test-spotlight"].search_cache_stats
+    assert (stats.cell_hits, stats.cell_misses) == (1, 3)
+
+
+@pytest.mark.parametrize(
+    "search_buckets",
+    [
+        SearchBuckets(ttl=60, max_cells=1),
+        SearchBuckets(ttl=60, cell_size=3.0, cell_limit=1),
+    ],
+    ids=["max_cells", "cell_limit"],
+)
+def test_falls_back_to_search(
+    make_stapi_client: Callable[..., TestClient], search_buckets: SearchBuckets
+) -> None:
+    with make_stapi_client(root_router=make_router(search_buckets)) as client:
+        response = client.post(
+            "/products/test-spotlight/opportunities",
+            json=box_search(0.2, 2.8),
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert feature_ids(response) == ["0.5,0.5", "1.5,0.5", "2.5,0.5"]
+    assert to_bbox(searches[-1].geometry) == (0.2, 0.2, 2.8, 0.8)
+
+
+def test_combined_results_paged(make_stapi_client: Callable[..., TestClient]) -> None:
+    with make_stapi_client(root_router=make_router(SearchBuckets(ttl=60))) as client:
+        url = "/products/test-spotlight/opportunities"
+        search = {**box_search(0.2, 2.8), "limit": 2}
+        first = client.post(url, json=search)
+        cells_searched = len(searches)
+        next = first.json()["links"][-1]["body"]["next"]
+        second = client.post(url, json={**search, "next": next})
+        pages_searched = len(searches)
+        invalid = client.post(url, json={**search, "next": "cells:x"})
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert feature_ids(first) == ["0.5,0.5", "1.5,0.5"]
+    assert feature_ids(second) == ["2.5,0.5"]
+    assert "next" not in second.json()["links"][-1].get("body", {})
+    # the second page is served from the cached cells
+    assert cells_searched == pages_searched == 3
+    # tokens not issued for combined results are passed to the backend
+    assert invalid.status_code == status.HTTP_200_OK
+    assert searches[-1].next == "cells:x"
+
+
+def test_overflowing_cell_cached(make_stapi_client: Callable[..., TestClient]) -> None:
+    search_buckets = SearchBuckets(ttl=60, cell_size=3.0, cell_limit=1)
+    with make_stapi_client(root_router=make_router(search_buckets)) as client:
+        url = "/products/test-spotlight/opportunities"
+        client.post(url, json=box_search(0.2, 2.8))
+        searched = len(searches)
+        response = client.post(url, json=box_search(0.2, 1.8))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert feature_ids(response) == ["0.5,0.5", "1.5,0.5"]
+    # the overflowing cell is not searched again
+    assert len(searches) == searched + 1
+    assert to_bbox(searches[-1].geometry) == (0.2, 0.2, 1.8, 0.8)
+
+
+def test_combined_results_match_search_geometry(
+    make_stapi_client: Callable[..., TestClient],
+) -> None:
+    # a triangle whose bounding box covers all opportunities, but not its geometry
+    triangle = [[0.2, 0.2], [2.8, 0.2], [0.2, 1.0], [0.2, 0.2]]
+    with make_stapi_client(root_router=make_router(SearchBuckets(ttl=60))) as client:
+        response = client.post(
+            "/products/test-spotlight/opportunities",
+            json={
+                **box_search(0.2, 2.8),
+                "geometry": {"type": "Polygon", "coordinates": [triangle]},
+            },
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert feature_ids(response) == ["0.5,0.5", "1.5,0.5"]
+    assert len(searches) == 3
+
+
+def test_combined_results_keep_backend_order(
+    make_stapi_client: Callable[..., TestClient], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    later = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    monkeypatch.setattr(
+        __name__ + ".opportunities",
+        [create_opportunity(1.2, 0.5, later), create_opportunity(1.8, 0.5)],
+    )
+    with make_stapi_client(root_router=make_router(SearchBuckets(ttl=60))) as client:
+        response = client.post(
+            "/products/test-spotlight/opportunities",
+            json=box_search(0.2, 1.9),
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert feature_ids(response) == ["1.2,0.5", "1.8,0.5"]
+
+
+def test_searches_backend_without_shapely(
+    make_stapi_client: Callable[..., TestClient], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(search_buckets_module, "SHAPELY", False)
+    with make_stapi_client(root_router=make_router(SearchBuckets(ttl=60))) as client:
+        response = client.post(
+            "/products/test-spotlight/opportunities",
+            json=box_search(0.2, 2.8),
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert feature_ids(response) == ["0.5,0.5", "1.5,0.5", "2.5,0.5"]
+    assert len(searches) == 1
+    assert to_bbox(searches[0].geometry) == (0.2, 0.2, 2.8, 0.8)
+
+
+@pytest.mark.parametrize(
+    "minimum, maximum, expected",
+    [(0.2, 1.8, range(0, 2)), (-0.5, 0.5, range(-1, 1)), (1.0, 2.0, range(1, 2))],
+)
+def test_cell_range(minimum: float, maximum: float, expected: range) -> None:
+    assert cell_range(minimum, maximum, 1.0) == expected
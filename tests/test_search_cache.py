@@ -0,0 +1,173 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from returns.maybe import Maybe
+from returns.result import ResultE
+
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.product_router import ProductRouter
+from stapi_fastapi.routers.root_router import RootRouter
+from stapi_fastapi.routers.search_cache import MemorySearchCache
+
+from .backends import (
+    mock_create_order,
+    mock_search_opportunities,
+)
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    create_mock_opportunity,
+    make_root_router,
+    provider,
+)
+
+searches: list[OpportunityPayload] = []
+
+
+async def search_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    searches.append(search)
+    return await mock_search_opportunities(product_router, search, next, limit, request)
+
+
+def make_router(
+    search_cache: MemorySearchCache | None, search_cache_ttl: float | None = 60
+) -> RootRouter:
+    product = Product(
+        id="test-spotlight",
+        title="Test Spotlight Product",
+        description="Test product for test spotlight",
+        license="CC-BY-4.0",
+        keywords=["test", "satellite"],
+        providers=[provider],
+        links=[],
+        create_order=mock_create_order,
+        search_opportunities=search_opportunities,
+        constraints=MyProductConstraints,
+        opportunity_properties=MyOpportunityProperties,
+        order_parameters=MyOrderParameters,
+        search_cache_ttl=search_cache_ttl,
+    )
+    return make_root_router(product, search_cache=search_cache)
+
+
+@pytest.fixture(autouse=True)
+def clear_searches() -> None:
+    searches.clear()
+
+
+def test_repeated_search_served_from_cache(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+) -> None:
+    cache = MemorySearchCache()
+    root_router = make_router(cache)
+
+    with make_stapi_client(root_router=root_router) as client:
+        url = "/products/test-spotlight/opportunities"
+        first = client.post(url, json=opportunity_search)
+        # the same search with its properties in another order
+        second = client.post(url, json=dict(reversed(opportunity_search.items())))
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.json() == second.json()
+    assert len(searches) == 1
+    stats = root_router.product_routers["test-spotlight"].search_cache_stats
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert cache.metrics().entries == 1
+
+
+def test_callers_cached_separately(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+) -> None:
+    root_router = make_router(MemorySearchCache())
+
+    with make_stapi_client(root_router=root_router) as client:
+        url = "/products/test-spotlight/opportunities"
+        for authorization in ["Bearer a", "Bearer b", "Bearer a"]:
+            client.post(
+                url,
+                json=opportunity_search,
+                headers={"Authorization": authorization},
+            )
+
+    assert len(searches) == 2
+
+
+def test_pages_cached_separately(
+    make_stapi_client: Callable[..., TestClient], opportunity_search: dict[str, Any]
+) -> None:
+    opportunity_search["limit"] = 1
+    opportunities = [create_mock_opportunity() for _ in range(3)]
+    root_router = make_router(MemorySearchCache())
+
+    with make_stapi_client(
+        root_router=root_router, state={"_opportunities": opportunities}
+    ) as client:
+        url = "/products/test-spotlight/opportunities"
+        first = client.post(url, json=opportunity_search)
+        next_body = next(
+            link["body"] for link in first.json()["links"] if link["rel"] == "next"
+        )
+        second = client.post(url, json=next_body)
+        third = client.post(url, json=next_body)
+
+    assert first.json()["features"] != second.json()["features"]
+    assert second.json() == third.json()
+    assert len(searches) == 2
+
+
+@pytest.mark.parametrize(
+    "cache, ttl", [(None, 60), (MemorySearchCache(), None)], ids=["router", "product"]
+)
+def test_cache_disabled(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    cache: MemorySearchCache | None,
+    ttl: float | None,
+) -> None:
+    root_router = make_router(cache, ttl)
+
+    with make_stapi_client(root_router=root_router) as client:
+        for _ in range(2):
+            client.post(
+                "/products/test-spotlight/opportunities", json=opportunity_search
+            )
+
+    assert len(searches) == 2
+
+
+def test_memory_cache_expiry_and_eviction() -> None:
+    cache = MemorySearchCache(max_size=10)
+
+    async def main() -> None:
+        await cache.set("a", b"aaaa", 60)
+        await cache.set("b", b"bbbb", 60)
+        assert await cache.get("a") == b"aaaa"
+        # evicts "b", the least recently used
+        await cache.set("c", b"cccc", 60)
+        assert await cache.get("b") is None
+        assert await cache.get("c") == b"cccc"
+
+        await cache.set("d", b"dd", 0.01)
+        await asyncio.sleep(0.02)
+        assert await cache.get("d") is None
+
+        await cache.set("e", b"too large to cache", 60)
+        assert await cache.get("e") is None
+
+    asyncio.run(main())
+
+    assert cache.metrics() == (2, 8, 1)
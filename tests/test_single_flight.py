@@ -0,0 +1,170 @@
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, status
+from returns.maybe import Maybe, Nothing, Some
+from returns.result import ResultE, Success
+
+from stapi_fastapi.models.opportunity import Opportunity, OpportunityPayload
+from stapi_fastapi.models.product import Product
+from stapi_fastapi.routers.product_router import ProductRouter
+from stapi_fastapi.routers.single_flight import SingleFlight, copy_result
+
+from .backends import mock_create_order
+from .shared import (
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    make_root_router,
+    provider,
+)
+
+searches: list[OpportunityPayload] = []
+
+
+async def search_opportunities(
+    product_router: ProductRouter,
+    search: OpportunityPayload,
+    next: str | None,
+    limit: int,
+    request: Request,
+) -> ResultE[tuple[list[Opportunity], Maybe[str]]]:
+    searches.append(search)
+    await asyncio.sleep(0.05)
+    return Success(([], Nothing))
+
+
+def make_app(coalesce_requests: bool) -> FastAPI:
+    root_router = make_root_router(
+        Product(
+            id="test-spotlight",
+            title="Test Spotlight Product",
+            description="Test product for test spotlight",
+            license="CC-BY-4.0",
+            keywords=["test", "satellite"],
+            providers=[provider],
+            links=[],
+            create_order=mock_create_order,
+            search_opportunities=search_opportunities,
+            constraints=MyProductConstraints,
+            opportunity_properties=MyOpportunityProperties,
+            order_parameters=MyOrderParameters,
+        ),
+        coalesce_requests=coalesce_requests,
+    )
+    app = FastAPI()
+    app.include_router(root_router)
+    return app
+
+
+def post_searches(
+    app: FastAPI, base_url: str, requests: list[dict[str, Any]]
+) -> list[httpx.Response]:
+    async def main() -> list[httpx.Response]:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=base_url
+        ) as client:
+            return await asyncio.gather(
+                *(
+                    client.post("/products/test-spotlight/opportunities", **request)
+                    for request in requests
+                )
+            )
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def clear_searches() -> None:
+    searches.clear()
+
+
+@pytest.mark.parametrize("coalesce_requests, calls", [(False, 3), (True, 1)])
+def test_identical_searches_coalesced(
+    base_url: str,
+    opportunity_search: dict[str, Any],
+    coalesce_requests: bool,
+    calls: int,
+) -> None:
+    app = make_app(coalesce_requests)
+
+    responses = post_searches(app, base_url, [{"json": opportunity_search}] * 3)
+
+    assert [res.status_code for res in responses] == [status.HTTP_200_OK] * 3
+    assert len({res.text for res in responses}) == 1
+    assert len(searches) == calls
+
+
+def test_different_searches_and_callers_not_coalesced(
+    base_url: str, opportunity_search: dict[str, Any]
+) -> None:
+    app = make_app(True)
+    other_search = {**opportunity_search, "limit": 5}
+
+    post_searches(
+        app,
+        base_url,
+        [
+            {"json": opportunity_search},
+            {"json": other_search},
+            {"json": opportunity_search, "headers": {"Authorization": "Bearer a"}},
+        ],
+    )
+
+    assert len(searches) == 3
+
+
+def test_followers_get_copies() -> None:
+    single_flight = SingleFlight()
+    calls: list[str] = []
+
+    async def call() -> ResultE[Maybe[list[str]]]:
+        calls.append("call")
+        await asyncio.sleep(0)
+        return Success(Some(["value"]))
+
+    async def main() -> list[ResultE[Maybe[list[str]]]]:
+        return await asyncio.gather(*(single_flight.run("key", call()) for _ in "ab"))
+
+    first, second = asyncio.run(main())
+
+    assert calls == ["call"]
+    assert first == second
+    assert first.unwrap().unwrap() is not second.unwrap().unwrap()
+
+
+def test_call_cancelled_with_last_caller() -> None:
+    single_flight = SingleFlight()
+    cancelled: list[bool] = []
+
+    async def call() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main() -> None:
+        waiters = [asyncio.create_task(single_flight.run("key", call())) for _ in "ab"]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled == []
+        waiters[1].cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+    assert cancelled == [True]
+
+
+def test_copy_result() -> None:
+    value = Success(Some(([{"a": 1}], Nothing)))
+
+    copied = copy_result(value)
+
+    assert copied == value
+    assert copied.unwrap().unwrap()[0] is not value.unwrap().unwrap()[0]
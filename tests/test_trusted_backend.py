@@ -0,0 +1,131 @@
+from collections.abc import Callable
+from typing import Any, Self
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from pydantic import model_validator
+
+from stapi_fastapi.constants import TYPE_GEOJSON
+from stapi_fastapi.models.opportunity import Opportunity
+from stapi_fastapi.models.product import Product
+
+from .backends import (
+    mock_create_order,
+    mock_search_opportunities,
+)
+from .shared import (
+    InMemoryOrderDB,
+    MyOpportunityProperties,
+    MyOrderParameters,
+    MyProductConstraints,
+    create_mock_opportunity,
+    provider,
+)
+
+validations: list[object] = []
+
+
+class CountingOpportunityProperties(MyOpportunityProperties):
+    @model_validator(mode="after")
+    def count(self) -> Self:
+        validations.append(self)
+        return self
+
+
+product = Product(
+    id="test-spotlight",
+    title="Test Spotlight Product",
+    description="Test product for test spotlight",
+    license="CC-BY-4.0",
+    keywords=["test", "satellite"],
+    providers=[provider],
+    links=[],
+    create_order=mock_create_order,
+    search_opportunities=mock_search_opportunities,
+    search_opportunities_async=None,
+    get_opportunity_collection=None,
+    constraints=MyProductConstraints,
+    opportunity_properties=CountingOpportunityProperties,
+    order_parameters=MyOrderParameters,
+)
+
+
+def create_opportunity() -> Opportunity:
+    opportunity = create_mock_opportunity()
+    return opportunity.model_copy(
+        update={
+            "properties": CountingOpportunityProperties.model_validate(
+                opportunity.model_dump()["properties"]
+            )
+        }
+    )
+
+
+@pytest.fixture
+def mock_opportunities() -> list[Opportunity]:
+    return [create_opportunity() for _ in range(3)]
+
+
+@pytest.mark.parametrize(
+    "trusted_backend, product_trusted_backend, validated",
+    [
+        (False, None, True),
+        (True, None, False),
+        (True, False, True),
+        (False, True, False),
+    ],
+)
+def test_opportunities_validated_once(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+    trusted_backend: bool,
+    product_trusted_backend: bool | None,
+    validated: bool,
+) -> None:
+    with make_stapi_client(
+        product,
+        product_options={"trusted_backend": product_trusted_backend},
+        trusted_backend=trusted_backend,
+    ) as client:
+        validations.clear()
+        res = client.post(
+            "/products/test-spotlight/opportunities", json=opportunity_search
+        )
+
+    assert res.status_code == status.HTTP_200_OK
+    assert res.headers["Content-Type"] == TYPE_GEOJSON
+    assert len(res.json()["features"]) == 3
+    assert bool(validations) is validated
+
+
+def test_trusted_responses_match_validated_responses(
+    make_stapi_client: Callable[..., TestClient],
+    opportunity_search: dict[str, Any],
+) -> None:
+    # both clients share the opportunities and orders
+    state = {"_orders_db": InMemoryOrderDB()}
+    url = "/products/test-spotlight/opportunities"
+    order_payload = opportunity_search | {
+        "order_parameters": {"s3_path": "s3://my-bucket"}
+    }
+
+    with (
+        make_stapi_client(product, state=state, trusted_backend=False) as validated,
+        make_stapi_client(product, state=state, trusted_backend=True) as trusted,
+    ):
+        assert (
+            trusted.post(url, json=opportunity_search).content
+            == validated.post(url, json=opportunity_search).content
+        )
+
+        res = trusted.post("/products/test-spotlight/orders", json=order_payload)
+        assert res.status_code == status.HTTP_201_CREATED
+        order_id = res.json()["id"]
+
+        for url in (
+            "/orders",
+            f"/orders/{order_id}",
+            f"/orders/{order_id}/statuses",
+        ):
+            assert trusted.get(url).json() == validated.get(url).json()